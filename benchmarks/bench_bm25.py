@@ -0,0 +1,99 @@
+# benchmarks/bench_bm25.py
+#
+# Latência de consultas BM25 sobre o corpus de exemplo (data/output) replicado
+# até N documentos. Uso (a partir da raiz do repositório):
+#   python benchmarks/bench_bm25.py --docs 10000
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.bm25_index import BM25Index
+from src.serializer import load_document, output_paths
+
+CONSULTAS = [
+    "pré-requisitos de compiladores",
+    "disciplinas optativas",
+    "horário de álgebra linear",
+    "carga horária do estágio supervisionado",
+    "trabalho de conclusão de curso",
+    "sala do laboratório de redes",
+    "ementa de banco de dados",
+    "professor de sistemas operacionais",
+]
+
+
+def replicar_corpus(output_dir: str, n_docs: int, max_chars: int):
+    """Gera n_docs documentos a partir dos content_chunks de exemplo, cada um com uma janela diferente do texto."""
+    textos = []
+    for path in output_paths(output_dir):
+        documento = load_document(path)
+        textos.extend(c["texto"] for c in documento.get("content_chunks", []) if isinstance(c, dict) and c.get("texto"))
+    if not textos:
+        raise SystemExit(f"Nenhum content_chunk encontrado em '{output_dir}'.")
+    for i in range(n_docs):
+        texto = textos[i % len(textos)]
+        inicio = (i * 997) % max(len(texto) - max_chars, 1)
+        yield {"metadata": {"doc_id": f"bench_{i:06d}"}, "content_chunks": [{"texto": texto[inicio:inicio + max_chars]}]}
+
+
+def percentil(valores, p):
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, int(round(p / 100 * (len(valores) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latência de consultas BM25 sobre o corpus de exemplo replicado.")
+    parser.add_argument('--docs', type=int, default=10000)
+    parser.add_argument('--max-chars', type=int, default=3000, help="tamanho do texto de cada documento replicado")
+    parser.add_argument('--lote', type=int, default=250, help="documentos por segmento (simula execuções do pipeline)")
+    parser.add_argument('--repeticoes', type=int, default=50)
+    parser.add_argument('--output-dir', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'output'))
+    args = parser.parse_args()
+
+    index_dir = tempfile.mkdtemp(prefix="bench_bm25_")
+    try:
+        indice = BM25Index(index_dir)
+        inicio = time.perf_counter()
+        lote = []
+        for documento in replicar_corpus(args.output_dir, args.docs, args.max_chars):
+            lote.append(documento)
+            if len(lote) == args.lote:
+                indice.add_documents(lote)
+                lote = []
+        if lote:
+            indice.add_documents(lote)
+        indice.wait_for_merges()
+        tempo_indexacao = time.perf_counter() - inicio
+
+        latencias = []
+        for _ in range(args.repeticoes):
+            for consulta in CONSULTAS:
+                t = time.perf_counter()
+                indice.search(consulta, k=10)
+                latencias.append((time.perf_counter() - t) * 1000)
+
+        print(json.dumps({
+            "documentos": args.docs,
+            "segmentos": indice.stats()["segmentos"],
+            "passagens": indice.stats()["passagens"],
+            "indexacao_s": round(tempo_indexacao, 2),
+            "consultas": len(latencias),
+            "latencia_ms": {
+                "p50": round(percentil(latencias, 50), 3),
+                "p95": round(percentil(latencias, 95), 3),
+                "max": round(max(latencias), 3),
+            },
+        }, ensure_ascii=False, indent=2))
+    finally:
+        shutil.rmtree(index_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
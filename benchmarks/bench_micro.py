@@ -0,0 +1,259 @@
+# benchmarks/bench_micro.py
+#
+# Micro-benchmarks das funções puramente Python do pipeline (texto e tabelas,
+# sem Camelot), com baseline salvo em JSON e relatório de diferenças. As
+# entradas vêm do próprio repositório, então roda offline:
+#   - texto bruto das páginas de data/input (PyMuPDF)
+#   - tabelas brutas do Camelot, células e salas_info dos horários, fixadas em
+#     benchmarks/fixtures/micro.json (não lidas de data/output: a saída muda com
+#     a política de tabelas brutas e a cada execução do pipeline, e o baseline
+#     perderia o sentido)
+# Uso (a partir da raiz do repositório):
+#   python benchmarks/bench_micro.py                        # compara com o baseline
+#   python benchmarks/bench_micro.py --salvar-baseline      # grava/atualiza o baseline
+#   python benchmarks/bench_micro.py --filtro ementario --relatorio /tmp/micro.json
+#   python benchmarks/bench_micro.py --gerar-fixture --output-dir <saídas com raw_table_list>
+#       # refaz a fixture (e então o baseline, pois as entradas mudam)
+# Sai com código 1 se alguma função ficou mais lenta que a tolerância.
+
+import argparse
+import glob
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import timeit
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, RAIZ)
+
+import fitz  # PyMuPDF
+import pandas as pd
+
+from src.text_normalization import normalize_text
+from src.structure_detector import detect_structure
+from src.deduplicator import deduplicate_chunks
+from src.metadata_enricher import enrich_with_metadata
+from src.horario_parser import parse_cell_content, get_default_room
+from src.ppc_parser import _clean_string, _parse_ementario, classify_table
+from src.table_enhancer import enhance_table
+from src.serializer import load_document, output_paths
+
+BASELINE_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines', 'micro.json')
+FIXTURE_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'micro.json')
+
+
+# --- Entradas ---
+
+def gerar_fixture(output_dir: str, fixture_path: str) -> None:
+    """Grava em `fixture_path` as tabelas brutas (raw_table_list), células e salas_info das saídas em `output_dir`."""
+    tabelas, celulas, salas_info = [], [], []
+    for path in output_paths(output_dir):
+        documento = load_document(path)
+        for pagina in documento.get("page_specific_data", []):
+            for registros in pagina.get("raw_table_list") or []:
+                if isinstance(registros, list): # Formato de registros ("unparsed-only"); o compacto de "all" é ignorado
+                    tabelas.append({"pagina": pagina.get("page"), "registros": registros})
+        for horario in documento.get("metadata", {}).get("schedules", []):
+            salas_info.append(horario.get("salas_info"))
+            for linha in horario.get("horario") or []:
+                for aula in linha.values():
+                    if isinstance(aula, dict) and aula.get("disciplina"):
+                        partes = [aula["disciplina"]]
+                        if aula.get("professor"):
+                            partes.append(f"({aula['professor']})")
+                        if aula.get("sala"):
+                            partes.append(aula["sala"])
+                        celulas.append("\n".join(partes)) # quebras de linha como nas células do Camelot
+    if not tabelas:
+        raise SystemExit(f"Nenhuma tabela bruta (raw_table_list) em '{output_dir}': a fixture ficaria vazia.")
+    os.makedirs(os.path.dirname(os.path.abspath(fixture_path)), exist_ok=True)
+    with open(fixture_path, 'w', encoding='utf-8') as f:
+        json.dump({"gerado_em": time.strftime("%Y-%m-%dT%H:%M:%S"), "origem": sorted(map(os.path.basename, output_paths(output_dir))),
+                   "tabelas": tabelas, "celulas": celulas, "salas_info": salas_info}, f, ensure_ascii=False)
+    print(f"Fixture com {len(tabelas)} tabelas, {len(celulas)} células e {len(salas_info)} salas_info salva em '{fixture_path}'.")
+
+def carregar_entradas(input_dir: str, fixture_path: str):
+    """Monta as entradas de todos os casos a partir de data/input e da fixture."""
+    textos = []
+    for path in sorted(glob.glob(os.path.join(input_dir, '*.pdf'))):
+        with fitz.open(path) as doc:
+            textos.append("".join(page.get_text("text") + "\n\n" for page in doc))
+    texto = "".join(textos)
+
+    with open(os.path.join(RAIZ, 'data', 'acronyms.json'), 'r', encoding='utf-8') as f:
+        acronyms = json.load(f)
+    with open(fixture_path, 'r', encoding='utf-8') as f:
+        fixture = json.load(f)
+
+    tabelas = [] # (página, DataFrame) como o Camelot devolve (colunas 0..n-1, células str)
+    for tabela in fixture["tabelas"]:
+        df = pd.DataFrame(tabela["registros"])
+        df.columns = range(len(df.columns))
+        tabelas.append((tabela["pagina"], df))
+    celulas, salas_info = fixture["celulas"], fixture["salas_info"]
+
+    ementarios = [df for pagina, df in tabelas if classify_table(df, pagina)[0] == "ppc_ementario"]
+    valores = [v for _, df in tabelas for v in df.to_numpy().ravel()]
+    return {"texto": texto, "acronyms": acronyms, "tabelas": tabelas, "ementarios": ementarios,
+            "valores": valores, "celulas": celulas, "salas_info": salas_info}
+
+
+def montar_casos(e):
+    """Cada caso é (nome, função sem argumentos, itens processados por chamada)."""
+    normalizado = normalize_text(e["texto"], acronyms=e["acronyms"])
+    # normalize_text junta tudo em uma linha, então detect_structure sobre o texto normalizado gera um
+    # único chunk; o texto bruto (com as quebras de linha) gera os chunks usados em dedup/enrich.
+    chunks = detect_structure(e["texto"])
+    unicos = deduplicate_chunks(chunks)
+    metadata = {"doc_id": "PPCBCC2019", "nome_doc": "PPCBCC2019.pdf"}
+    tabelas = [df for _, df in e["tabelas"]]
+
+    def enhance_todas():
+        for df in tabelas:
+            try:
+                enhance_table(df)
+            except Exception:
+                pass # tabelas do PPC sem o layout de calendário: conta o custo até a falha
+
+    return [
+        ("normalize_text", lambda: normalize_text(e["texto"]), 1),
+        ("normalize_text_siglas", lambda: normalize_text(e["texto"], acronyms=e["acronyms"]), 1),
+        ("detect_structure", lambda: detect_structure(normalizado), 1),
+        ("detect_structure_linhas", lambda: detect_structure(e["texto"]), 1),
+        ("deduplicate_chunks", lambda: deduplicate_chunks(chunks), len(chunks)),
+        ("enrich_with_metadata", lambda: enrich_with_metadata(unicos, metadata), len(unicos)),
+        ("parse_cell_content", lambda: [parse_cell_content(c) for c in e["celulas"]], len(e["celulas"])),
+        ("get_default_room", lambda: [get_default_room(s) for s in e["salas_info"]], len(e["salas_info"])),
+        ("_clean_string", lambda: [_clean_string(v) for v in e["valores"]], len(e["valores"])),
+        ("_parse_ementario", lambda: [_parse_ementario(df) for df in e["ementarios"]], len(e["ementarios"])),
+        ("classify_table", lambda: [classify_table(df, p) for p, df in e["tabelas"]], len(e["tabelas"])),
+        ("enhance_table", enhance_todas, len(tabelas)),
+    ]
+
+
+# --- Medição ---
+
+def medir(funcao, repeticoes: int, tempo_minimo: float):
+    """Tempo por chamada (µs): melhor e mediana entre `repeticoes` rodadas de pelo menos `tempo_minimo` s."""
+    timer = timeit.Timer(funcao)
+    numero = 1
+    while True:
+        if timer.timeit(numero) >= tempo_minimo:
+            break
+        numero *= 2
+    rodadas = [t / numero * 1e6 for t in timer.repeat(repeat=repeticoes, number=numero)]
+    return {"melhor_us": round(min(rodadas), 3), "mediana_us": round(statistics.median(rodadas), 3),
+            "chamadas_por_rodada": numero}
+
+
+def ambiente():
+    return {"python": platform.python_version(), "plataforma": platform.platform(),
+            "processador": platform.processor() or platform.machine(), "pandas": pd.__version__}
+
+
+# --- Comparação ---
+
+def comparar(atual, baseline, tolerancia: float):
+    """
+    Compara o melhor tempo de cada caso com o baseline. Status:
+    "mais_lento" / "mais_rapido" (fora da tolerância), "ok", "novo" (sem baseline)
+    ou "removido" (só no baseline).
+    """
+    base = baseline.get("resultados", {}) if baseline else {}
+    linhas = []
+    for nome in list(atual) + [n for n in base if n not in atual]:
+        if nome not in atual:
+            linhas.append({"caso": nome, "status": "removido", "baseline_us": base[nome]["melhor_us"]})
+            continue
+        agora = atual[nome]["melhor_us"]
+        if nome not in base:
+            linhas.append({"caso": nome, "status": "novo", "atual_us": agora})
+            continue
+        antes = base[nome]["melhor_us"]
+        razao = agora / antes if antes else float('inf')
+        if razao > 1 + tolerancia:
+            status = "mais_lento"
+        elif razao < 1 - tolerancia:
+            status = "mais_rapido"
+        else:
+            status = "ok"
+        linhas.append({"caso": nome, "status": status, "baseline_us": antes, "atual_us": agora,
+                       "variacao_pct": round((razao - 1) * 100, 1)})
+    return linhas
+
+def imprimir_relatorio(linhas, baseline, atual, tolerancia: float) -> None:
+    if baseline and baseline.get("ambiente") != ambiente():
+        print(f"Alerta: baseline gravado em outro ambiente ({baseline.get('ambiente')}); "
+              "as diferenças podem refletir a máquina e não o código.")
+    base = baseline.get("resultados", {}) if baseline else {}
+    outras_entradas = [n for n in atual if n in base and base[n].get("itens") != atual[n]["itens"]]
+    if outras_entradas:
+        print(f"Alerta: itens por chamada diferentes do baseline em {outras_entradas} (fixture mudou?); "
+              "regrave o baseline com --salvar-baseline.")
+    print(f"{'caso':<24} {'baseline (µs)':>14} {'atual (µs)':>14} {'variação':>9}  status (tolerância ±{tolerancia:.0%})")
+    for l in linhas:
+        antes = f"{l['baseline_us']:.1f}" if "baseline_us" in l else "-"
+        agora = f"{l['atual_us']:.1f}" if "atual_us" in l else "-"
+        variacao = f"{l['variacao_pct']:+.1f}%" if "variacao_pct" in l else "-"
+        print(f"{l['caso']:<24} {antes:>14} {agora:>14} {variacao:>9}  {l['status']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks das funções de texto e tabela, comparados com um baseline JSON.")
+    parser.add_argument('--baseline', default=BASELINE_PADRAO)
+    parser.add_argument('--salvar-baseline', action='store_true', help="Grava os tempos atuais como novo baseline")
+    parser.add_argument('--tolerancia', type=float, default=0.2, help="Variação aceita (fração), padrão 0.2 = ±20%%")
+    parser.add_argument('--repeticoes', type=int, default=5)
+    parser.add_argument('--tempo-minimo', type=float, default=0.2, help="Duração mínima (s) de cada rodada")
+    parser.add_argument('--filtro', default=None, help="Roda só os casos cujo nome contém este texto")
+    parser.add_argument('--relatorio', default=None, help="Também grava o relatório de diferenças neste arquivo JSON")
+    parser.add_argument('--input-dir', default=os.path.join(RAIZ, 'data', 'input'))
+    parser.add_argument('--fixture', default=FIXTURE_PADRAO)
+    parser.add_argument('--gerar-fixture', action='store_true', help="Refaz a fixture a partir de --output-dir e sai")
+    parser.add_argument('--output-dir', default=os.path.join(RAIZ, 'data', 'output'), help="Só usado com --gerar-fixture")
+    args = parser.parse_args()
+
+    if args.gerar_fixture:
+        gerar_fixture(args.output_dir, args.fixture)
+        return
+
+    entradas = carregar_entradas(args.input_dir, args.fixture)
+    atual = {}
+    for nome, funcao, itens in montar_casos(entradas):
+        if args.filtro and args.filtro not in nome:
+            continue
+        atual[nome] = {**medir(funcao, args.repeticoes, args.tempo_minimo), "itens": itens}
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    if args.salvar_baseline:
+        resultados = dict(baseline.get("resultados", {})) if baseline and args.filtro else {}
+        resultados.update(atual)
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({"gerado_em": time.strftime("%Y-%m-%dT%H:%M:%S"), "ambiente": ambiente(),
+                       "resultados": resultados}, f, ensure_ascii=False, indent=2)
+        print(f"Baseline com {len(resultados)} casos salvo em '{args.baseline}'.")
+        return
+
+    if args.filtro and baseline:
+        baseline = {**baseline, "resultados": {n: r for n, r in baseline["resultados"].items() if args.filtro in n}}
+    linhas = comparar(atual, baseline, args.tolerancia)
+    imprimir_relatorio(linhas, baseline, atual, args.tolerancia)
+    if args.relatorio:
+        with open(args.relatorio, 'w', encoding='utf-8') as f:
+            json.dump({"ambiente": ambiente(), "tolerancia": args.tolerancia,
+                       "baseline_gerado_em": baseline.get("gerado_em") if baseline else None,
+                       "casos": linhas, "medicoes": atual}, f, ensure_ascii=False, indent=2)
+    if any(l["status"] == "mais_lento" for l in linhas):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
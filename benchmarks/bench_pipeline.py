@@ -0,0 +1,166 @@
+# benchmarks/bench_pipeline.py
+#
+# Vazão e memória do pipeline completo (src/pipeline.process_document) em
+# documentos sintéticos de 10, 100 e 1000 páginas (benchmarks/synthetic_corpus.py).
+# Cada documento é processado em um subprocesso novo, para que o pico de RSS
+# de um tamanho não contamine o seguinte. Uso (a partir da raiz do repositório):
+#   python benchmarks/bench_pipeline.py --paginas 10 100 1000 --tipos horario ppc regulamento
+#   python benchmarks/bench_pipeline.py --paginas 10 --memoria   # + tracemalloc por etapa
+#   python benchmarks/bench_pipeline.py --paginas 100 --sem-roteamento   # tipo do documento em todas as páginas
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_corpus import GERADORES
+
+
+def _validacao(documento, tipo):
+    """Contagens do que foi extraído, para confirmar que o corpus continua sendo reconhecido pelos parsers."""
+    paginas = documento["page_specific_data"]
+    resultado = {"content_chunks": len(documento["content_chunks"]),
+                 "paginas_com_erro": sum(1 for p in paginas if "error" in p)}
+    if tipo == "horario":
+        resultado["horarios"] = len(documento["metadata"].get("schedules", []))
+    elif tipo == "ppc":
+        tabelas = {}
+        for p in paginas:
+            for tabela in (p.get("summary") or "").partition("Tipos detectados: ")[2].split(", "):
+                if tabela:
+                    tabelas[tabela] = tabelas.get(tabela, 0) + 1
+        resultado["tabelas"] = tabelas
+    else:
+        resultado["tabelas"] = sum(1 for p in paginas if p.get("tables") and p["tables"][0])
+    return resultado
+
+
+def medir_documento(pdf_path, tipo, memoria=False, verbose=False, timeout_tabelas=None, roteamento=True):
+    """Processa um PDF e devolve duração, páginas/s, memória e o resumo por etapa do Profiler."""
+    from src.instrumentation import PROFILER
+    from src.memory import rss_mb, peak_rss_mb
+    from src.pipeline import process_document
+    from src.table_worker import IsolatedTableExtractor
+
+    with open(os.path.join(RAIZ, 'data', 'acronyms.json'), 'r', encoding='utf-8') as f:
+        acronyms = json.load(f)
+    images_dir = tempfile.mkdtemp(prefix="bench_pipeline_img_")
+    PROFILER.enabled = True
+    PROFILER.reset()
+    if memoria:
+        PROFILER.enable_memory()
+
+    doc_id = os.path.basename(pdf_path).replace('.pdf', '')
+    rss_inicio = rss_mb()
+    saida = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    extrator = IsolatedTableExtractor(timeout_s=timeout_tabelas) if timeout_tabelas else None
+    try:
+        with saida, PROFILER.document(doc_id):
+            inicio = time.perf_counter()
+            documento, pdf_type = process_document(pdf_path, images_dir, acronyms=acronyms, table_extractor=extrator,
+                                                   route_pages=roteamento)
+            duracao = time.perf_counter() - inicio
+    finally:
+        shutil.rmtree(images_dir, ignore_errors=True)
+        if extrator is not None:
+            extrator.close()
+
+    relatorio = PROFILER.report()
+    paginas = relatorio["documentos"][doc_id]["paginas"]
+    resultado = {
+        "arquivo": os.path.basename(pdf_path),
+        "tipo_detectado": pdf_type,
+        "paginas": paginas,
+        "duracao_s": round(duracao, 3),
+        "paginas_por_s": round(paginas / duracao, 3) if duracao else None,
+        "rss_inicio_mb": round(rss_inicio, 1),
+        "rss_fim_mb": round(rss_mb(), 1),
+        "pico_rss_mb": round(peak_rss_mb(), 1),
+        "etapas": {nome: {k: resumo[k] for k in ("chamadas", "total_s", "p50_ms", "p95_ms")}
+                   for nome, resumo in relatorio["etapas"].items()},
+        "validacao": _validacao(documento, tipo) if documento is not None else None,
+    }
+    if roteamento and documento is not None:
+        rotas = {}
+        for p in documento["page_specific_data"]:
+            rotas[p.get("rota")] = rotas.get(p.get("rota"), 0) + 1
+        resultado["rotas"] = rotas
+    if "memoria" in relatorio:
+        resultado["memoria"] = relatorio["memoria"]
+    if extrator is not None:
+        resultado["extracao_tabelas"] = extrator.report()
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vazão (páginas/s) e memória do pipeline em PDFs sintéticos.")
+    parser.add_argument('--paginas', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--tipos', nargs='+', choices=list(GERADORES), default=list(GERADORES))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--memoria', action='store_true', help="Ativa o tracemalloc (bem mais lento)")
+    parser.add_argument('--verbose', action='store_true', help="Mostra as mensagens do pipeline")
+    parser.add_argument('--timeout-tabelas', type=float, default=None,
+                        help="Extrai as tabelas em worker isolado com este limite (s) por página")
+    parser.add_argument('--sem-roteamento', action='store_true',
+                        help="Desliga o roteamento por página (src/page_router.py)")
+    parser.add_argument('--corpus-dir', default=None, help="Reaproveita/guarda os PDFs gerados nesta pasta")
+    parser.add_argument('--saida', default=None, help="Também grava os resultados neste arquivo JSON")
+    # Uso interno: processa um único PDF no processo atual
+    parser.add_argument('--pdf', default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--tipo', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.pdf:
+        print(json.dumps(medir_documento(args.pdf, args.tipo, args.memoria, args.verbose, args.timeout_tabelas,
+                                         not args.sem_roteamento), ensure_ascii=False))
+        return
+
+    corpus_dir = args.corpus_dir or tempfile.mkdtemp(prefix="bench_pipeline_")
+    os.makedirs(corpus_dir, exist_ok=True)
+    resultados = []
+    try:
+        for n_paginas in args.paginas:
+            for tipo in args.tipos:
+                pdf_path = os.path.join(corpus_dir, f"sintetico_{tipo}_{n_paginas}p.pdf")
+                inicio = time.perf_counter()
+                if not os.path.exists(pdf_path):
+                    GERADORES[tipo](pdf_path, n_paginas, args.seed)
+                geracao = time.perf_counter() - inicio
+
+                comando = [sys.executable, os.path.abspath(__file__), '--pdf', pdf_path, '--tipo', tipo]
+                comando += ['--memoria'] if args.memoria else []
+                comando += ['--verbose'] if args.verbose else []
+                comando += ['--timeout-tabelas', str(args.timeout_tabelas)] if args.timeout_tabelas else []
+                comando += ['--sem-roteamento'] if args.sem_roteamento else []
+                processo = subprocess.run(comando, stdout=subprocess.PIPE, text=True)
+                if processo.returncode != 0:
+                    print(f"Alerta: Falha ao medir '{pdf_path}' (código {processo.returncode}).", file=sys.stderr)
+                    continue
+                resultado = json.loads(processo.stdout.strip().splitlines()[-1])
+                resultado["tipo"] = tipo
+                resultado["geracao_s"] = round(geracao, 3)
+                resultados.append(resultado)
+                print(f"{tipo} {n_paginas}p: {resultado['paginas_por_s']} páginas/s, "
+                      f"pico RSS {resultado['pico_rss_mb']} MB", file=sys.stderr)
+    finally:
+        if args.corpus_dir is None:
+            shutil.rmtree(corpus_dir, ignore_errors=True)
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, ensure_ascii=False, indent=2)
+    print(json.dumps(resultados, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+# benchmarks/bench_serializacao.py
+#
+# Tempo de escrita/leitura e tamanho em disco dos documentos de exemplo
+# (data/output) para cada serializador, layout (indentado/compacto) e
+# compressão disponíveis. Uso (a partir da raiz do repositório):
+#   python benchmarks/bench_serializacao.py --repeticoes 5
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.output_writer import write_document
+from src.serializer import available_serializers, load_document, output_paths, zstandard
+
+
+def medir(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        t = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - t) * 1000)
+    return round(statistics.median(tempos), 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Escrita/leitura e tamanho das saídas por serializador e compressão.")
+    parser.add_argument('--repeticoes', type=int, default=5)
+    parser.add_argument('--output-dir', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'output'))
+    args = parser.parse_args()
+
+    compressoes = ["", ".gz"] + ([".zst"] if zstandard is not None else [])
+    tmp_dir = tempfile.mkdtemp(prefix="bench_serializacao_")
+    resultados = []
+    try:
+        for path in output_paths(args.output_dir):
+            documento = load_document(path)
+
+            # Referência: como o pipeline gravava antes (json.dumps(indent=2) + write)
+            destino = os.path.join(tmp_dir, "referencia.jsonl")
+            def escrever_referencia():
+                with open(destino, 'w', encoding='utf-8') as f:
+                    f.write(json.dumps(documento, ensure_ascii=False, indent=2))
+            def ler_referencia():
+                with open(destino, 'r', encoding='utf-8') as f:
+                    json.load(f)
+            resultados.append({"arquivo": os.path.basename(path), "serializador": "json (referência)",
+                               "indent": True, "compressao": "-", "escrita_ms": medir(escrever_referencia, args.repeticoes),
+                               "leitura_ms": medir(ler_referencia, args.repeticoes), "bytes": os.path.getsize(destino)})
+
+            for nome, serializer in available_serializers().items():
+                for indent in (True, False):
+                    for compressao in compressoes:
+                        destino = os.path.join(tmp_dir, f"saida.jsonl{compressao}")
+                        escrita = medir(lambda: write_document(destino, documento, indent, serializer), args.repeticoes)
+                        leitura = medir(lambda: load_document(destino, serializer), args.repeticoes)
+                        resultados.append({"arquivo": os.path.basename(path), "serializador": nome, "indent": indent,
+                                           "compressao": compressao or "-", "escrita_ms": escrita,
+                                           "leitura_ms": leitura, "bytes": os.path.getsize(destino)})
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print(json.dumps(resultados, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
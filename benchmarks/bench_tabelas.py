@@ -0,0 +1,266 @@
+# benchmarks/bench_tabelas.py
+#
+# Precisão/recall em nível de célula e tempo por página da extração de
+# tabelas, comparando qualquer backend/parâmetros (src/table_extractor)
+# com tabelas gold anotadas (benchmarks/gold/tabelas.json).
+#
+#   semear:  cria o gold a partir das saídas revisadas em data/output
+#            (raw_table_list). Páginas sem tabelas brutas completas na saída
+#            (ex: horários, que só guardam a grade já parseada) são semeadas
+#            com a configuração atual e marcadas como não revisadas.
+#   avaliar: roda cada configuração sobre as páginas do gold.
+#
+# Uso (a partir da raiz do repositório):
+#   python benchmarks/bench_tabelas.py semear
+#   python benchmarks/bench_tabelas.py avaliar --config camelot:line_scale=40 \
+#       --config camelot:line_scale=60 --config camelot:flavor=stream --config pymupdf
+#   python benchmarks/bench_tabelas.py avaliar --config pymupdf --paginas 19-22,33 --saida /tmp/tabelas.json
+#   python benchmarks/bench_tabelas.py avaliar --cache-raster --config camelot:line_scale=15 \
+#       --config camelot:line_scale=40 --config camelot:line_scale=60   # renderiza cada página uma vez
+#
+# Métricas (multiconjuntos, por página e somadas):
+#   celulas:     textos das células não vazias (espaços normalizados)
+#   adjacencias: pares (célula, vizinha não vazia à direita/abaixo), como no
+#                ICDAR 2013; penaliza células mescladas/divididas errado
+#                mesmo quando o texto extraído está certo
+
+import argparse
+import ast
+import glob
+import json
+import os
+import re
+import statistics
+import sys
+import time
+import warnings
+from collections import Counter
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, RAIZ)
+
+import fitz  # PyMuPDF
+
+from src.table_extractor import extract_tables, table_backends, cached_rasterization
+from src.raster_cache import RasterPageCache
+from src.serializer import load_document, COMPRESSOES
+
+GOLD_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gold', 'tabelas.json')
+# Configuração usada hoje pelos parsers de horário e PPC (horario_parser.get_raw_tables_from_page)
+CONFIG_ATUAL = "camelot:flavor=lattice,line_scale=40"
+
+
+# --- Configurações ---
+
+def parse_config(texto: str):
+    """"backend:chave=valor,chave=valor" -> (backend, parâmetros). Valores são literais Python quando possível."""
+    backend, _, resto = texto.partition(':')
+    parametros = {}
+    for par in filter(None, resto.split(',')):
+        chave, _, valor = par.partition('=')
+        try:
+            parametros[chave.strip()] = ast.literal_eval(valor.strip())
+        except (ValueError, SyntaxError):
+            parametros[chave.strip()] = valor.strip()
+    return backend.strip(), parametros
+
+def extrair(pdf_path: str, pagina: int, config: str):
+    """Tabelas da página como listas de linhas de str (formato do gold) e a duração em segundos."""
+    backend, parametros = parse_config(config)
+    inicio = time.perf_counter()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore") # "No tables found" etc. do Camelot
+        tabelas = extract_tables(pdf_path, pagina, backend, **parametros)
+    duracao = time.perf_counter() - inicio
+    return [df.fillna("").astype(str).values.tolist() for df in tabelas], duracao
+
+
+# --- Gold ---
+
+def _tabelas_da_saida(pagina_saida):
+    """Tabelas brutas completas de uma página de data/output, ou None se a saída não as tiver todas."""
+    resumo = pagina_saida.get("summary") or ""
+    if resumo.startswith("Nenhuma tabela"):
+        return []
+    registros = pagina_saida.get("raw_table_list")
+    match = re.match(r"Processadas (\d+) tabelas", resumo)
+    if registros is None or not match or len(registros) != int(match.group(1)):
+        return None
+    tabelas = []
+    for tabela in registros:
+        colunas = list(tabela[0].keys()) if tabela else []
+        tabelas.append([["" if linha.get(c) is None else str(linha.get(c)) for c in colunas] for linha in tabela])
+    return tabelas
+
+def semear(input_dir: str, output_dir: str, gold_path: str) -> None:
+    documentos = {}
+    for pdf_path in sorted(glob.glob(os.path.join(input_dir, '*.pdf'))):
+        nome = os.path.basename(pdf_path)
+        saidas = [p for p in (os.path.join(output_dir, f"{nome}.jsonl{ext}") for ext in COMPRESSOES) if os.path.exists(p)]
+        paginas_saida = {}
+        if saidas:
+            paginas_saida = {p["page"]: p for p in load_document(saidas[0]).get("page_specific_data", [])}
+        with fitz.open(pdf_path) as doc:
+            n_paginas = doc.page_count
+
+        paginas, nao_revisadas = {}, []
+        for pagina in range(1, n_paginas + 1):
+            tabelas = _tabelas_da_saida(paginas_saida[pagina]) if pagina in paginas_saida else None
+            if tabelas is None:
+                tabelas, _ = extrair(pdf_path, pagina, CONFIG_ATUAL)
+                nao_revisadas.append(pagina)
+            paginas[str(pagina)] = tabelas
+        documentos[nome] = {"paginas": paginas, "paginas_nao_revisadas": nao_revisadas}
+        print(f"{nome}: {n_paginas} páginas, {sum(len(t) for t in paginas.values())} tabelas "
+              f"({len(nao_revisadas)} páginas semeadas com '{CONFIG_ATUAL}', a revisar)", file=sys.stderr)
+
+    os.makedirs(os.path.dirname(os.path.abspath(gold_path)), exist_ok=True)
+    with open(gold_path, 'w', encoding='utf-8') as f:
+        json.dump({"descricao": "Tabelas esperadas por página (listas de linhas de células). "
+                                "Semeado de data/output (raw_table_list); páginas em paginas_nao_revisadas "
+                                f"vieram de '{CONFIG_ATUAL}' e precisam de revisão manual.",
+                   "documentos": documentos}, f, ensure_ascii=False, indent=1)
+    print(f"Gold salvo em '{gold_path}'.", file=sys.stderr)
+
+
+# --- Métricas ---
+
+def _norm(celula) -> str:
+    return ' '.join(str(celula).split())
+
+def celulas(tabelas) -> Counter:
+    return Counter(_norm(c) for tabela in tabelas for linha in tabela for c in linha if _norm(c))
+
+def adjacencias(tabelas) -> Counter:
+    """Relações (célula, próxima célula não vazia à direita/abaixo, direção) de todas as tabelas."""
+    relacoes = Counter()
+    for tabela in tabelas:
+        grade = [[_norm(c) for c in linha] for linha in tabela]
+        for i, linha in enumerate(grade):
+            for j, texto in enumerate(linha):
+                if not texto:
+                    continue
+                direita = next((t for t in linha[j + 1:] if t), None)
+                if direita:
+                    relacoes[(texto, direita, "h")] += 1
+                abaixo = next((l[j] for l in grade[i + 1:] if j < len(l) and l[j]), None)
+                if abaixo:
+                    relacoes[(texto, abaixo, "v")] += 1
+    return relacoes
+
+def _contagens(esperado: Counter, obtido: Counter):
+    acertos = sum((esperado & obtido).values())
+    return acertos, sum(obtido.values()), sum(esperado.values())
+
+def _prf(acertos: int, obtidos: int, esperados: int):
+    precisao = acertos / obtidos if obtidos else (1.0 if not esperados else 0.0)
+    recall = acertos / esperados if esperados else (1.0 if not obtidos else 0.0)
+    f1 = 2 * precisao * recall / (precisao + recall) if precisao + recall else 0.0
+    return {"precisao": round(precisao, 4), "recall": round(recall, 4), "f1": round(f1, 4)}
+
+
+def avaliar(gold, input_dir: str, config: str, filtro_docs=None, filtro_paginas=None):
+    totais = {"celulas": [0, 0, 0], "adjacencias": [0, 0, 0]}
+    tabelas_esperadas = tabelas_obtidas = 0
+    tempos, por_pagina, erros = [], [], []
+    for nome, info in gold["documentos"].items():
+        if filtro_docs and nome not in filtro_docs:
+            continue
+        pdf_path = os.path.join(input_dir, nome)
+        for pagina_str, esperadas in info["paginas"].items():
+            pagina = int(pagina_str)
+            if filtro_paginas and pagina not in filtro_paginas:
+                continue
+            try:
+                obtidas, duracao = extrair(pdf_path, pagina, config)
+            except Exception as e:
+                erros.append({"documento": nome, "pagina": pagina, "erro": str(e)})
+                obtidas, duracao = [], 0.0
+            tempos.append(duracao)
+            tabelas_esperadas += len(esperadas)
+            tabelas_obtidas += len(obtidas)
+            registro = {"documento": nome, "pagina": pagina, "tempo_ms": round(duracao * 1000, 1),
+                        "tabelas": [len(esperadas), len(obtidas)]}
+            for metrica, funcao in (("celulas", celulas), ("adjacencias", adjacencias)):
+                contagem = _contagens(funcao(esperadas), funcao(obtidas))
+                totais[metrica] = [t + c for t, c in zip(totais[metrica], contagem)]
+                registro[metrica] = _prf(*contagem)
+            por_pagina.append(registro)
+
+    return {
+        "config": config,
+        "paginas": len(tempos),
+        "tabelas_esperadas": tabelas_esperadas,
+        "tabelas_obtidas": tabelas_obtidas,
+        "celulas": _prf(*totais["celulas"]),
+        "adjacencias": _prf(*totais["adjacencias"]),
+        "tempo_por_pagina_ms": {"media": round(statistics.mean(tempos) * 1000, 1) if tempos else None,
+                                "p50": round(statistics.median(tempos) * 1000, 1) if tempos else None,
+                                "max": round(max(tempos) * 1000, 1) if tempos else None},
+        "tempo_total_s": round(sum(tempos), 2),
+        "erros": erros,
+        "por_pagina": por_pagina,
+    }
+
+
+def _intervalos(texto: str):
+    """"19-22,33" -> {19, 20, 21, 22, 33}"""
+    paginas = set()
+    for parte in filter(None, texto.split(',')):
+        inicio, _, fim = parte.partition('-')
+        paginas.update(range(int(inicio), int(fim or inicio) + 1))
+    return paginas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precisão/recall de células e tempo por página da extração de tabelas contra o gold.")
+    parser.add_argument('--gold', default=GOLD_PADRAO)
+    parser.add_argument('--input-dir', default=os.path.join(RAIZ, 'data', 'input'))
+    comandos = parser.add_subparsers(dest='comando', required=True)
+
+    p_semear = comandos.add_parser('semear', help="Cria o gold a partir de data/output")
+    p_semear.add_argument('--output-dir', default=os.path.join(RAIZ, 'data', 'output'))
+
+    p_avaliar = comandos.add_parser('avaliar', help="Avalia uma ou mais configurações")
+    p_avaliar.add_argument('--config', action='append', default=None,
+                           help=f"backend:chave=valor,... (backends: {', '.join(table_backends())}); "
+                                f"padrão: '{CONFIG_ATUAL}'. Pode ser repetido.")
+    p_avaliar.add_argument('--documentos', nargs='+', default=None)
+    p_avaliar.add_argument('--paginas', default=None, help="Ex: 19-22,33")
+    p_avaliar.add_argument('--saida', default=None, help="Grava o resultado completo (com o detalhe por página) em JSON")
+    p_avaliar.add_argument('--cache-raster', action='store_true',
+                           help="Compartilha as páginas rasterizadas entre as configurações lattice (src/raster_cache.py)")
+    args = parser.parse_args()
+
+    if args.comando == 'semear':
+        semear(args.input_dir, args.output_dir, args.gold)
+        return
+
+    with open(args.gold, 'r', encoding='utf-8') as f:
+        gold = json.load(f)
+    filtro_paginas = _intervalos(args.paginas) if args.paginas else None
+    resultados = []
+    cache = RasterPageCache() if args.cache_raster else None
+    try:
+        with cached_rasterization(cache):
+            for config in args.config or [CONFIG_ATUAL]:
+                resultado = avaliar(gold, args.input_dir, config, args.documentos, filtro_paginas)
+                resultados.append(resultado)
+                print(f"{config}: células P={resultado['celulas']['precisao']} R={resultado['celulas']['recall']}, "
+                      f"adjacências F1={resultado['adjacencias']['f1']}, "
+                      f"{resultado['tempo_por_pagina_ms']['media']} ms/página", file=sys.stderr)
+    finally:
+        if cache is not None:
+            relatorio = cache.report()
+            print(f"Cache de páginas rasterizadas: {relatorio['acertos']} acertos, {relatorio['faltas']} faltas, "
+                  f"{relatorio['descartes']} descartes", file=sys.stderr)
+            cache.close()
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, ensure_ascii=False, indent=2)
+    print(json.dumps([{k: v for k, v in r.items() if k != "por_pagina"} for r in resultados], ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+# benchmarks/check_embedding_cache.py
+#
+# Consistência do EmbeddingCache entre aberturas:
+#   1. Hashes repetidos no mesmo lote de put_many são gravados uma vez só
+#      (antes cada repetição virava uma linha em hashes.txt e o cache reaberto
+#      apontava para linhas de vetores.f32 que não existiam).
+#   2. Hashes já presentes no cache são ignorados em lotes seguintes.
+#   3. compact mantém os vetores vivos e descarta os demais.
+#
+# Uso (a partir da raiz do repositório):
+#   python benchmarks/check_embedding_cache.py
+# Sai com código 1 se alguma verificação falhar.
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import numpy as np
+
+from src.embedding_cache import EmbeddingCache
+
+DIM = 4
+
+
+def _vetor(valor: float) -> np.ndarray:
+    return np.full(DIM, valor, dtype=np.float32)
+
+
+def verificar(cache_dir: str) -> list:
+    problemas = []
+    cache = EmbeddingCache(cache_dir, "teste", DIM)
+    cache.put_many(['a', 'b', 'b'], np.stack([_vetor(1), _vetor(2), _vetor(3)]))
+    if len(cache) != 2:
+        problemas.append(f"lote com hash repetido: len={len(cache)}, esperado 2")
+    cache.put_many(['b', 'c', 'a', 'c'], np.stack([_vetor(9), _vetor(4), _vetor(9), _vetor(5)]))
+    if len(cache) != 3:
+        problemas.append(f"segundo lote: len={len(cache)}, esperado 3")
+
+    # Reabre do disco: hashes.txt e vetores.f32 precisam ter o mesmo número de linhas
+    try:
+        reaberto = EmbeddingCache(cache_dir, "teste", DIM)
+        esperado = {'a': 1, 'b': 2, 'c': 4}  # primeira ocorrência de cada hash
+        for h, valor in esperado.items():
+            vetor = reaberto.get(h)
+            if vetor is None or not np.array_equal(vetor, _vetor(valor)):
+                problemas.append(f"get({h!r}) após reabrir: {vetor}, esperado {_vetor(valor)}")
+    except (IndexError, ValueError) as e:
+        return problemas + [f"reabrir o cache falhou: {e!r}"]
+
+    removidos = reaberto.compact(['a', 'c'])
+    if removidos != 1 or 'b' in reaberto or not np.array_equal(reaberto.get('c'), _vetor(4)):
+        problemas.append(f"compact: {removidos} removido(s), 'b' presente={'b' in reaberto}")
+    return problemas
+
+
+def main():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        problemas = verificar(cache_dir)
+    for problema in problemas:
+        print(f"  FALHA  {problema}")
+    if problemas:
+        print(f"Alerta: {len(problemas)} falha(s) no EmbeddingCache.", file=sys.stderr)
+        sys.exit(1)
+    print("EmbeddingCache ok.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+# benchmarks/check_import_time.py
+#
+# Orçamento de tempo de importação dos pontos de entrada do pacote, medido
+# com `python -X importtime` em um interpretador novo por módulo. Garante que
+# os caminhos só de texto e só de consulta não carregam Camelot/pandas/PyMuPDF
+# (importados de forma preguiçosa, ver src/lazy.py) e sobem bem abaixo de 1 s.
+# Uso (a partir da raiz do repositório):
+#   python benchmarks/check_import_time.py
+#   python benchmarks/check_import_time.py --grupos texto consulta --top 15
+# Sai com código 1 se algum módulo estourar o orçamento ou importar uma
+# dependência proibida para o seu grupo.
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+PESADOS = ["camelot", "pandas", "fitz", "cv2", "matplotlib", "PyPDF2"]
+
+# grupo -> (módulos, orçamento em ms do tempo cumulativo de importação, dependências proibidas)
+GRUPOS = {
+    "texto": (["src.text_normalization", "src.structure_detector", "src.deduplicator",
+               "src.metadata_enricher", "src.document_classifier", "src.page_router"], 150, PESADOS + ["numpy"]),
+    "consulta": (["src.bm25_index", "src.sqlite_export", "src.output_writer", "src.chunk_store",
+                  "src.vector_store", "src.horario_index", "src.ppc_catalog"], 300, PESADOS),
+    "pipeline": (["src.pipeline", "src.ppc_parser", "src.horario_parser", "src.table_worker",
+                  "src.extraction_daemon", "src.checkpoint"], 300, PESADOS),
+}
+
+_MARCADOR = "@@inicio_medicao"
+
+
+def medir(modulo: str, proibidos):
+    """
+    Importa `modulo` em um interpretador novo com -X importtime. Devolve o tempo
+    cumulativo (ms) das importações disparadas por ele, o tempo próprio de cada
+    módulo importado e quais dependências proibidas ficaram em sys.modules.
+    """
+    codigo = (f"import sys, json; sys.stderr.write('{_MARCADOR}\\n'); sys.stderr.flush(); import {modulo}; "
+              f"print(json.dumps([m for m in {list(proibidos)!r} if m in sys.modules]))")
+    processo = subprocess.run([sys.executable, "-X", "importtime", "-c", codigo], cwd=RAIZ,
+                              capture_output=True, text=True)
+    if processo.returncode != 0:
+        raise RuntimeError(f"Falha ao importar {modulo}:\n{processo.stderr.strip()[-2000:]}")
+
+    linhas = processo.stderr.split(f"{_MARCADOR}\n", 1)[-1].splitlines()
+    total_us, proprio_us = 0, {}
+    for linha in linhas:
+        if not linha.startswith("import time:") or "self [us]" in linha:
+            continue
+        proprio, cumulativo, nome = linha[len("import time:"):].split("|", 2)
+        nivel = (len(nome) - len(nome.lstrip()) - 1) // 2
+        nome = nome.strip()
+        proprio_us[nome] = proprio_us.get(nome, 0) + int(proprio)
+        if nivel == 0:
+            total_us += int(cumulativo)
+    carregados = json.loads(processo.stdout.strip().splitlines()[-1])
+    return total_us / 1000, proprio_us, carregados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Orçamento de tempo de importação (python -X importtime) por ponto de entrada.")
+    parser.add_argument('--grupos', nargs='+', choices=list(GRUPOS), default=list(GRUPOS))
+    parser.add_argument('--repeticoes', type=int, default=3, help="Usa a menor medição de N interpretadores")
+    parser.add_argument('--fator', type=float, default=1.0, help="Multiplica os orçamentos (ex: 2 em máquinas lentas de CI)")
+    parser.add_argument('--top', type=int, default=10, help="Módulos com maior tempo próprio listados por violação")
+    args = parser.parse_args()
+
+    violacoes = []
+    for grupo in args.grupos:
+        modulos, orcamento_ms, proibidos = GRUPOS[grupo]
+        orcamento_ms *= args.fator
+        print(f"[{grupo}] orçamento {orcamento_ms:.0f} ms; proibidos: {', '.join(proibidos)}")
+        for modulo in modulos:
+            medicoes = [medir(modulo, proibidos) for _ in range(max(1, args.repeticoes))]
+            total_ms, proprio_us, carregados = min(medicoes, key=lambda m: m[0])
+            problemas = []
+            if total_ms > orcamento_ms:
+                problemas.append(f"{total_ms:.0f} ms > {orcamento_ms:.0f} ms")
+            if carregados:
+                problemas.append(f"importa {', '.join(carregados)}")
+            print(f"  {'FALHA' if problemas else 'ok':5}  {modulo:28} {total_ms:8.1f} ms"
+                  + (f"  ({'; '.join(problemas)})" if problemas else ""))
+            if problemas:
+                violacoes.append(modulo)
+                mais_caros = sorted(proprio_us.items(), key=lambda item: item[1], reverse=True)[:args.top]
+                for nome, us in mais_caros:
+                    print(f"         {us / 1000:8.1f} ms  {nome}")
+
+    if violacoes:
+        print(f"Alerta: {len(violacoes)} módulo(s) fora do orçamento de importação: {', '.join(violacoes)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+# benchmarks/check_ppc_parity.py
+#
+# Paridade da camada vetorizada do ppc_parser (_clean_series, _clean_frame,
+# _row_contains_all) com as versões originais em laço e da saída parseada com
+# a saída revisada em data/output/PPCBCC2019.pdf.jsonl.
+#
+#   1. Casos sintéticos: limpeza de células (quebras, espaços, NaN, vazios,
+#      números) e busca de cabeçalho com o texto atravessando células.
+#   2. Para cada tabela bruta de cada página do PPC: _clean_frame(df) igual a
+#      df.map(_clean_string) e _row_contains_all igual ao laço original por
+#      linha (células não nulas unidas por espaço).
+#   3. parsed_data_list de parse_ppc_page igual ao da saída de referência.
+#
+# Uso (a partir da raiz do repositório):
+#   python benchmarks/check_ppc_parity.py
+#   python benchmarks/check_ppc_parity.py --paginas 19-22,96-98
+# Sai com código 1 se alguma verificação falhar.
+
+import argparse
+import json
+import math
+import os
+import sys
+import warnings
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, RAIZ)
+
+import numpy as np
+import pandas as pd
+
+from src.ppc_parser import (_clean_string, _clean_series, _clean_frame, _row_contains_all,
+                            parse_ppc_page)
+from src.horario_parser import get_raw_tables_from_page
+from src.table_extractor import cached_rasterization
+from src.raster_cache import RasterPageCache
+from src.serializer import load_document
+
+PDF_PADRAO = os.path.join(RAIZ, 'data', 'input', 'PPCBCC2019.pdf')
+REFERENCIA_PADRAO = os.path.join(RAIZ, 'data', 'output', 'PPCBCC2019.pdf.jsonl')
+
+# Cabeçalhos procurados com _row_contains_all pelos parsers
+CABECALHOS = [["nome do professor", "regime de trabalho"]]
+
+
+# --- Versões Originais (laço por linha/célula) ---
+
+def _row_contains_all_laco(df: pd.DataFrame, texts):
+    """Busca de cabeçalho como era em _parse_docentes antes da vetorização."""
+    mascara = []
+    for _, row in df.iterrows():
+        row_str = ' '.join(row.dropna().astype(str)).lower()
+        mascara.append(all(text in row_str for text in texts))
+    return mascara
+
+def _sem_nan(valor):
+    """NaN -> None (a saída antiga gravava NaN em 'Item' de docentes sem número; hoje é null)."""
+    if isinstance(valor, float) and math.isnan(valor):
+        return None
+    if isinstance(valor, dict):
+        return {k: _sem_nan(v) for k, v in valor.items()}
+    if isinstance(valor, list):
+        return [_sem_nan(v) for v in valor]
+    return valor
+
+
+# --- Verificações ---
+
+def _mesmas_celulas(a: pd.DataFrame, b: pd.DataFrame) -> bool:
+    """Mesmo formato e mesmas células (None e NaN contam como nulo)."""
+    return a.shape == b.shape and all(
+        (pd.isna(x) and pd.isna(y)) or x == y
+        for x, y in zip(a.to_numpy(dtype=object).ravel(), b.to_numpy(dtype=object).ravel()))
+
+def checar_tabela(df: pd.DataFrame) -> list:
+    """Diferenças entre a camada vetorizada e as versões em laço para uma tabela bruta."""
+    problemas = []
+    if not _mesmas_celulas(_clean_frame(df), df.map(_clean_string)):
+        problemas.append("_clean_frame difere de df.map(_clean_string)")
+    for texts in CABECALHOS:
+        if _row_contains_all(df, texts).tolist() != _row_contains_all_laco(df, texts):
+            problemas.append(f"_row_contains_all({texts}) difere do laço original")
+    return problemas
+
+def casos_sinteticos() -> list:
+    problemas = []
+    celulas = pd.Series(["  a\nb  c ", "", "   ", None, np.nan, 12, 3.5, "Ética\n e  Cidadania"], dtype=object)
+    obtido, esperado = _clean_series(celulas), celulas.apply(_clean_string)
+    if not _mesmas_celulas(obtido.to_frame(), esperado.to_frame()):
+        problemas.append(f"_clean_series: {obtido.tolist()} != {esperado.tolist()}")
+
+    docentes = pd.DataFrame([
+        ["Quadro de docentes", None, None],
+        ["Nome do", "Professor", "Regime de\nTrabalho"],  # texto do cabeçalho dividido entre células
+        [None, None, None],
+        ["Fulano", "Mestre", "Dedicação exclusiva"],
+    ], dtype=object)
+    tabela = checar_tabela(docentes)
+    problemas += [f"docentes sintético: {p}" for p in tabela]
+    if _row_contains_all(docentes, CABECALHOS[0]).tolist() != [False, False, False, False]:
+        # "regime de\ntrabalho" não casa "regime de trabalho" (nem no laço original)
+        problemas.append("docentes sintético: cabeçalho com quebra de linha não deveria casar")
+    docentes.iloc[1, 2] = "Regime de Trabalho"
+    if _row_contains_all(docentes, CABECALHOS[0]).tolist() != [False, True, False, False]:
+        problemas.append("docentes sintético: cabeçalho dividido entre células não encontrado")
+    return problemas
+
+
+def _intervalos(texto: str):
+    """"19-22,33" -> {19, 20, 21, 22, 33}"""
+    paginas = set()
+    for parte in filter(None, texto.split(',')):
+        inicio, _, fim = parte.partition('-')
+        paginas.update(range(int(inicio), int(fim or inicio) + 1))
+    return paginas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Paridade da camada vetorizada do ppc_parser com as versões em laço e a saída de referência.")
+    parser.add_argument('--pdf', default=PDF_PADRAO)
+    parser.add_argument('--referencia', default=REFERENCIA_PADRAO)
+    parser.add_argument('--paginas', default=None, help="Ex: 19-22,96-98 (padrão: todas)")
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore", category=UserWarning) # Avisos de coluna do Camelot
+
+    falhas = [f"sintético: {p}" for p in casos_sinteticos()]
+    print(f"Casos sintéticos: {'ok' if not falhas else 'FALHA'}")
+
+    referencia = {p["page"]: p for p in load_document(args.referencia)["page_specific_data"]}
+    paginas = sorted(_intervalos(args.paginas)) if args.paginas else sorted(referencia)
+    n_tabelas = 0
+    with RasterPageCache() as cache, cached_rasterization(cache):  # A segunda extração da página sai do cache
+        for pagina in paginas:
+            tabelas = get_raw_tables_from_page(args.pdf, pagina) or []
+            n_tabelas += len(tabelas)
+            for i, df in enumerate(tabelas):
+                falhas += [f"pág {pagina}, tabela {i}: {p}" for p in checar_tabela(df)]
+
+            obtido = json.loads(json.dumps(parse_ppc_page(args.pdf, pagina, "none")["parsed_data_list"], default=str))
+            esperado = _sem_nan(referencia[pagina].get("parsed_data_list", []))
+            if _sem_nan(obtido) != esperado:
+                falhas.append(f"pág {pagina}: parsed_data_list difere da referência")
+
+    print(f"{len(paginas)} páginas, {n_tabelas} tabelas brutas verificadas.")
+    for falha in falhas:
+        print(f"  FALHA  {falha}")
+    if falhas:
+        print(f"Alerta: {len(falhas)} diferença(s) de paridade no ppc_parser.", file=sys.stderr)
+        sys.exit(1)
+    print("Paridade ok.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,289 @@
+# benchmarks/synthetic_corpus.py
+#
+# Gera PDFs sintéticos com o mesmo layout dos documentos reais, para medir o
+# pipeline em documentos de qualquer tamanho sem depender de PDFs externos:
+#   - horario:     grades de horário (lattice) com cabeçalho Segunda..Sexta e
+#                  células "Disciplina (Professor) P2 - Sala 7"
+#   - ppc:         Projeto Pedagógico com matriz curricular, ementário,
+#                  docentes e texto de regulamento
+#   - regulamento: calendário (tabela genérica com legenda) e texto com
+#                  capítulos, seções e artigos
+# O conteúdo é determinístico para uma mesma semente. Uso (a partir da raiz):
+#   python benchmarks/synthetic_corpus.py /tmp/corpus --paginas 100 --tipos horario ppc
+
+import argparse
+import json
+import os
+import random
+from typing import Dict, Any, List, Optional
+
+import fitz  # PyMuPDF
+
+RETRATO = (595, 842)   # A4
+PAISAGEM = (842, 595)
+
+# Células mescladas: None = continuação da célula à esquerda, ACIMA = continuação da célula de cima
+ACIMA = object()
+
+DISCIPLINAS = [
+    "Algoritmos e Programação", "Estruturas de Dados", "Cálculo Diferencial e Integral", "Álgebra Linear",
+    "Matemática Discreta", "Arquitetura de Computadores", "Sistemas Operacionais", "Banco de Dados",
+    "Engenharia de Software", "Redes de Computadores", "Compiladores", "Inteligência Artificial",
+    "Computação Gráfica", "Teoria da Computação", "Probabilidade e Estatística", "Programação Orientada a Objetos",
+    "Sistemas Distribuídos", "Análise de Algoritmos", "Física para Computação", "Metodologia Científica",
+]
+PROFESSORES = [
+    "Ana Souza", "Bruno Lima", "Carla Mendes", "Daniel Rocha", "Eduarda Alves", "Fábio Castro",
+    "Gabriela Nunes", "Henrique Dias", "Isabela Prado", "João Ferreira", "Larissa Gomes", "Marcos Teixeira",
+]
+SALAS = ["P2 - Sala 7", "P2 - Sala 5", "LabCC - P2", "LabRedes - P2", "Sala 6", None]
+FORMACOES = [
+    "Graduação em Ciência da Computação", "Mestrado em Ciência da Computação", "Doutorado em Engenharia Elétrica",
+    "Graduação em Matemática", "Mestrado em Modelagem Computacional", "Especialização em Redes de Computadores",
+]
+HORARIOS = ["07:00 - 07:50", "07:50 - 08:40", "08:40 - 09:30", "09:50 - 10:40", "10:40 - 11:30",
+            "13:00 - 13:50", "13:50 - 14:40", "14:40 - 15:30", "15:50 - 16:40"]
+ASSUNTOS = [
+    "o colegiado de curso", "a carga horária das atividades complementares", "o estágio supervisionado",
+    "o trabalho de conclusão de curso", "a avaliação da aprendizagem", "o aproveitamento de estudos",
+    "a frequência mínima obrigatória", "a matrícula em disciplinas optativas", "o núcleo docente estruturante",
+]
+ROMANOS = ["I", "II", "III", "IV", "V", "VI", "VII", "VIII", "IX", "X"]
+
+
+# --- Desenho ---
+
+def _texto(page: fitz.Page, rect: fitz.Rect, texto: str, fontsize: float = 7, align: int = 0) -> None:
+    """Escreve `texto` dentro de `rect`, reduzindo a fonte até caber (insert_textbox não escreve nada se não couber)."""
+    if not texto:
+        return
+    caixa = rect + (2, 1.5, -2, -1.5)
+    while fontsize >= 3:
+        if page.insert_textbox(caixa, texto, fontsize=fontsize, fontname="helv", align=align) >= 0:
+            return
+        fontsize -= 0.5
+
+def _tabela(page: fitz.Page, x0: float, y0: float, larguras: List[float], altura_linha: float,
+            linhas: List[List[Any]], fontsize: float = 7) -> float:
+    """
+    Desenha uma tabela com bordas em todas as células (detectável pelo modo lattice do Camelot).
+    Retorna a coordenada y da borda inferior.
+    """
+    xs = [x0]
+    for largura in larguras:
+        xs.append(xs[-1] + largura)
+    n_linhas, n_colunas = len(linhas), len(larguras)
+    for i, linha in enumerate(linhas):
+        for j in range(n_colunas):
+            valor = linha[j] if j < len(linha) else ""
+            if valor is None or valor is ACIMA:
+                continue
+            fim_col = j + 1
+            while fim_col < n_colunas and fim_col < len(linha) and linha[fim_col] is None:
+                fim_col += 1
+            fim_lin = i + 1
+            while fim_lin < n_linhas and j < len(linhas[fim_lin]) and linhas[fim_lin][j] is ACIMA:
+                fim_lin += 1
+            rect = fitz.Rect(xs[j], y0 + i * altura_linha, xs[fim_col], y0 + fim_lin * altura_linha)
+            page.draw_rect(rect, color=(0, 0, 0), width=0.6)
+            _texto(page, rect, str(valor), fontsize)
+    return y0 + n_linhas * altura_linha
+
+def _paragrafos(page: fitz.Page, y0: float, linhas: List[str], fontsize: float = 9) -> None:
+    largura, altura = page.rect.width, page.rect.height
+    _texto(page, fitz.Rect(50, y0, largura - 50, altura - 40), "\n".join(linhas), fontsize)
+
+
+# --- Conteúdo ---
+
+def _regulamento(rng: random.Random, capitulo: int, n_artigos: int, artigo_inicial: int) -> List[str]:
+    """Linhas de um capítulo de regulamento com seções e artigos (padrões do structure_detector)."""
+    linhas = [f"CAPÍTULO {ROMANOS[(capitulo - 1) % len(ROMANOS)]} - DAS DISPOSIÇÕES SOBRE {rng.choice(ASSUNTOS).upper()}", ""]
+    for k in range(n_artigos):
+        if k % 3 == 0:
+            linhas += [f"Seção {capitulo}.{k // 3 + 1} - {rng.choice(ASSUNTOS).capitalize()}", ""]
+        assunto = rng.choice(ASSUNTOS)
+        linhas += [
+            f"Artigo {artigo_inicial + k}º Compete ao BCC regulamentar {assunto}, observadas as normas do IFNMG "
+            f"e as resoluções do CONSEP vigentes na data de publicação deste PPC.",
+            f"Parágrafo único. O disposto neste artigo aplica-se também ao que trata de {rng.choice(ASSUNTOS)}, "
+            f"cabendo ao colegiado deliberar sobre os casos omissos.",
+            "",
+        ]
+    return linhas
+
+def _celula_horario(rng: random.Random) -> str:
+    disciplina = rng.choice(DISCIPLINAS)
+    sala = rng.choice(SALAS)
+    texto = f"{disciplina} ({rng.choice(PROFESSORES)})"
+    return f"{texto} {sala}" if sala else texto
+
+
+# --- Geradores ---
+
+def gerar_horario(path: str, paginas: int, seed: int = 0) -> Dict[str, Any]:
+    """Uma grade de horário por página (um período por página), em paisagem."""
+    rng = random.Random(seed)
+    dias = ["Segunda", "Terça", "Quarta", "Quinta", "Sexta"]
+    aulas = 0
+    with fitz.open() as doc:
+        for p in range(paginas):
+            page = doc.new_page(width=PAISAGEM[0], height=PAISAGEM[1])
+            periodo = p % 10 + 1
+            _paragrafos(page, 25, [
+                "INSTITUTO FEDERAL DO NORTE DE MINAS GERAIS",
+                "1/2025",
+                f"CIÊNCIA DA COMPUTAÇÃO - {periodo}º PERÍODO",
+                f"SALAS: {SALAS[p % 2]}",
+                "HORÁRIO DAS AULAS - TURNOS MANHÃ E TARDE",
+            ], fontsize=9)
+            linhas = [["Horário"] + dias]
+            for horario in HORARIOS:
+                linha = [horario]
+                for _ in dias:
+                    if rng.random() < 0.7:
+                        linha.append(_celula_horario(rng))
+                        aulas += 1
+                    else:
+                        linha.append("")
+                linhas.append(linha)
+            _tabela(page, 40, 110, [90] + [140] * len(dias), 48, linhas)
+        doc.save(path, garbage=3, deflate=True)
+    return {"arquivo": os.path.basename(path), "tipo": "horario", "paginas": paginas, "aulas": aulas}
+
+
+def _matriz(rng: random.Random, periodo: int) -> List[List[Any]]:
+    linhas = [
+        [f"{periodo}° PERÍODO", None, None, None, None, None, None],
+        ["DISCIPLINA", "CH Semanal", None, None, "CH Semestral", None, "Pré- Requisitos"],
+        [ACIMA, "Teórica", "Prática", "Total", "Hora Aula", "Horas", ACIMA],
+    ]
+    total = 0
+    for disciplina in rng.sample(DISCIPLINAS, 6):
+        teorica, pratica = rng.choice([(4, 0), (2, 2), (3, 1), (2, 0)])
+        semanal = teorica + pratica
+        total += semanal * 20
+        linhas.append([disciplina, str(teorica), str(pratica), str(semanal), str(semanal * 20),
+                       str(semanal * 50 // 3), rng.choice(["-", rng.choice(DISCIPLINAS)])])
+    linhas.append(["TOTAL", "", "", "", str(total), str(total * 5 // 6), ""])
+    return linhas
+
+def _ementa(rng: random.Random) -> List[List[Any]]:
+    disciplina = rng.choice(DISCIPLINAS)
+    aulas = rng.choice([2, 4])
+    assuntos = ", ".join(rng.sample(ASSUNTOS, 3))
+    return [
+        ["Disciplina:", disciplina, f"Carga Horária: {aulas * 15}h", f"Aulas Semanais: {aulas}"],
+        ["Ementa:", f"Fundamentos de {disciplina.lower()}. Estudo de {assuntos}. Aplicações práticas em projetos.", None, None],
+        ["Objetivos:", f"Capacitar o estudante a aplicar os conceitos de {disciplina.lower()} na resolução de problemas.", None, None],
+        ["Bibliografia Básica:", f"{rng.choice(PROFESSORES).upper()}. {disciplina}. 3. ed. São Paulo: Pearson, 2015.", None, None],
+        ["Bibliografia Complementar:", f"{rng.choice(PROFESSORES).upper()}. Introdução a {disciplina.lower()}. Rio de Janeiro: LTC, 2012.", None, None],
+    ]
+
+def _docentes(rng: random.Random, inicio: int) -> List[List[Any]]:
+    linhas = [["Item", "Nome do Professor", "Formação", "Regime de Trabalho"]]
+    for k, professor in enumerate(rng.sample(PROFESSORES, 6)):
+        formacoes = rng.sample(FORMACOES, rng.choice([1, 2]))
+        regime = rng.choice(["DE", "40h", "20h"])
+        linhas.append([str(inicio + k), professor, formacoes[0], regime])
+        for formacao in formacoes[1:]:
+            linhas.append([ACIMA, ACIMA, formacao, ACIMA])
+    return linhas
+
+def gerar_ppc(path: str, paginas: int, seed: int = 0) -> Dict[str, Any]:
+    """
+    Projeto Pedagógico: capa com texto, seguida de páginas que alternam
+    matriz curricular, ementário (duas ementas), docentes e regulamento.
+    """
+    rng = random.Random(seed)
+    contagem = {"ppc_matriz_curricular": 0, "ppc_ementario": 0, "ppc_docentes": 0, "texto": 0}
+    ciclo = ["ppc_matriz_curricular", "ppc_ementario", "ppc_docentes", "texto"]
+    artigo = 1
+    with fitz.open() as doc:
+        for p in range(paginas):
+            page = doc.new_page(width=RETRATO[0], height=RETRATO[1])
+            if p == 0:
+                linhas = ["PROJETO PEDAGÓGICO DO CURSO DE BACHARELADO EM CIÊNCIA DA COMPUTAÇÃO", ""]
+                linhas += _regulamento(rng, 1, 4, artigo)
+                artigo += 4
+                _paragrafos(page, 50, linhas)
+                contagem["texto"] += 1
+                continue
+            tipo = ciclo[(p - 1) % len(ciclo)]
+            if tipo == "ppc_matriz_curricular":
+                _paragrafos(page, 40, ["MATRIZ CURRICULAR"], fontsize=10)
+                _tabela(page, 40, 70, [175, 50, 50, 45, 55, 45, 95], 22, _matriz(rng, (p // len(ciclo)) % 10 + 1))
+                contagem[tipo] += 1
+            elif tipo == "ppc_ementario":
+                y = _tabela(page, 40, 50, [110, 215, 95, 95], 45, _ementa(rng))
+                _tabela(page, 40, y + 40, [110, 215, 95, 95], 45, _ementa(rng))
+                contagem[tipo] += 2
+            elif tipo == "ppc_docentes":
+                _paragrafos(page, 40, ["CORPO DOCENTE"], fontsize=10)
+                _tabela(page, 40, 70, [40, 160, 215, 100], 22, _docentes(rng, (p // len(ciclo)) * 6 + 1))
+                contagem[tipo] += 1
+            else:
+                capitulo = p // len(ciclo) + 2
+                _paragrafos(page, 50, _regulamento(rng, capitulo, 5, artigo))
+                artigo += 5
+                contagem[tipo] += 1
+        doc.save(path, garbage=3, deflate=True)
+    return {"arquivo": os.path.basename(path), "tipo": "ppc", "paginas": paginas, "tabelas": contagem}
+
+
+def gerar_regulamento(path: str, paginas: int, seed: int = 0) -> Dict[str, Any]:
+    """Documento genérico: páginas pares com um calendário mensal (tabela + legenda), ímpares com regulamento."""
+    rng = random.Random(seed)
+    meses = ["JANEIRO", "FEVEREIRO", "MARÇO", "ABRIL", "MAIO", "JUNHO",
+             "JULHO", "AGOSTO", "SETEMBRO", "OUTUBRO", "NOVEMBRO", "DEZEMBRO"]
+    artigo = 1
+    with fitz.open() as doc:
+        for p in range(paginas):
+            page = doc.new_page(width=RETRATO[0], height=RETRATO[1])
+            if p % 2 == 0:
+                _paragrafos(page, 40, ["CALENDÁRIO ACADÊMICO 2025"], fontsize=11)
+                linhas = [[f"{meses[(p // 2) % 12]} 2025", None, None, None, None, None, None],
+                          ["D", "S", "T", "Q", "Q", "S", "S"]]
+                dia = 1 - rng.randrange(7)
+                for _ in range(5):
+                    semana = []
+                    for _ in range(7):
+                        marca = rng.choice(["", "", "", "", "F", "R"]) if dia >= 1 else ""
+                        semana.append(f"{dia}{marca}" if 1 <= dia <= 30 else "")
+                        dia += 1
+                    linhas.append(semana)
+                linhas.append(["Legenda: F - Feriado; R - Recesso escolar; dias sem marca são letivos.",
+                               None, None, None, None, None, None])
+                _tabela(page, 80, 70, [62] * 7, 26, linhas, fontsize=8)
+            else:
+                capitulo = p // 2 + 1
+                _paragrafos(page, 50, _regulamento(rng, capitulo, 5, artigo))
+                artigo += 5
+        doc.save(path, garbage=3, deflate=True)
+    return {"arquivo": os.path.basename(path), "tipo": "regulamento", "paginas": paginas}
+
+
+GERADORES = {"horario": gerar_horario, "ppc": gerar_ppc, "regulamento": gerar_regulamento}
+
+def gerar_corpus(output_dir: str, paginas: int, tipos: Optional[List[str]] = None, seed: int = 0) -> List[Dict[str, Any]]:
+    """Gera um PDF de `paginas` páginas para cada tipo em `tipos` (padrão: todos)."""
+    os.makedirs(output_dir, exist_ok=True)
+    resumo = []
+    for tipo in tipos or list(GERADORES):
+        path = os.path.join(output_dir, f"sintetico_{tipo}_{paginas}p.pdf")
+        resumo.append(GERADORES[tipo](path, paginas, seed))
+    return resumo
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera PDFs sintéticos (horário, PPC, regulamento) para benchmarks do pipeline.")
+    parser.add_argument('output_dir')
+    parser.add_argument('--paginas', type=int, default=10)
+    parser.add_argument('--tipos', nargs='+', choices=list(GERADORES), default=list(GERADORES))
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    print(json.dumps(gerar_corpus(args.output_dir, args.paginas, args.tipos, args.seed), ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,423 @@
+# src/bm25_index.py
+
+import json
+import os
+import re
+import shutil
+import threading
+from collections import Counter
+from typing import Dict, Any, Optional, List, Tuple
+
+import numpy as np
+
+try:
+    from src.text_normalization import normalize_text, remove_accents
+except ImportError:
+    from .text_normalization import normalize_text, remove_accents
+
+# Stopwords do português (já sem acentos, pois a análise remove acentos antes)
+STOPWORDS_PT = frozenset("""
+a ao aos aquela aquelas aquele aqueles aquilo as ate com como da das de dela delas dele deles depois do dos
+e ela elas ele eles em entre era eram essa essas esse esses esta estas este estes eu foi foram ha isso isto
+ja la lhe lhes mais mas me mesmo meu meus minha minhas muito na nas nem no nos nossa nossas nosso nossos num
+numa o os ou para pela pelas pelo pelos por qual quando que quem se sem ser seu seus sua suas tambem te tem
+ter tu um uma umas uns voce voces vos sao quais
+""".split())
+
+# Stemming leve: só plurais e advérbios em -mente (primeira regra que casar)
+_SUFIXOS_PT = [
+    ("coes", "cao"), ("soes", "sao"), ("oes", "ao"), ("aes", "ao"), ("ais", "al"), ("eis", "el"),
+    ("ois", "ol"), ("res", "r"), ("zes", "z"), ("ns", "m"), ("mente", ""),
+]
+
+_token_pattern = re.compile(r"\w+")
+
+
+# --- Análise de Texto ---
+
+def _stem_pt(token: str) -> str:
+    for sufixo, troca in _SUFIXOS_PT:
+        if token.endswith(sufixo) and len(token) - len(sufixo) >= 3:
+            return token[:-len(sufixo)] + troca
+    if token.endswith("s") and len(token) > 3 and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+def analyze(text: str) -> List[str]:
+    """Normaliza (normalize_text), remove acentos, tokeniza, tira stopwords e aplica o stemming leve."""
+    text = remove_accents(normalize_text(text))
+    return [_stem_pt(tok) for tok in _token_pattern.findall(text) if len(tok) > 1 and tok not in STOPWORDS_PT]
+
+def split_passages(text: str, palavras_por_passagem: int) -> List[Tuple[int, int]]:
+    """Divide o texto de um chunk em janelas de N palavras. Retorna (inicio, fim) em caracteres."""
+    spans = [m.span() for m in re.finditer(r"\S+", text)]
+    return [(spans[i][0], spans[min(i + palavras_por_passagem, len(spans)) - 1][1])
+            for i in range(0, len(spans), palavras_por_passagem)]
+
+
+# --- Segmento ---
+
+class _Segmento:
+    """
+    Um segmento imutável do índice: vocabulário ordenado e postings em arrays
+    inteiros contíguos (term_offsets, passage_ids, tfs, passage_lens), gravados
+    como .npy e abertos com mmap.
+    """
+
+    ARRAYS = ("term_offsets", "passage_ids", "tfs", "passage_lens")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.nome = os.path.basename(path)
+        with open(os.path.join(path, "meta.json"), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        self.terms: Dict[str, int] = {term: i for i, term in enumerate(meta["terms"])}
+        self.passagens: List[Dict[str, Any]] = meta["passagens"]
+        self.documentos = set(meta["documentos"])
+        for nome in self.ARRAYS:
+            # ndarray sobre o mmap: mesma memória, sem o custo de np.memmap.__getitem__ a cada fatia
+            setattr(self, nome, np.asarray(np.load(os.path.join(path, f"{nome}.npy"), mmap_mode='r')))
+        self.total_tokens = int(np.asarray(self.passage_lens, dtype=np.int64).sum())
+        self._doc_da_passagem = np.array([p["doc_id"] for p in self.passagens], dtype=object)
+
+    def __len__(self) -> int:
+        return len(self.passagens)
+
+    def postings(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        i = self.terms.get(term)
+        if i is None:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32)
+        ini, fim = int(self.term_offsets[i]), int(self.term_offsets[i + 1])
+        return self.passage_ids[ini:fim], self.tfs[ini:fim]
+
+    def mascara_removidos(self, removidos: set) -> Optional[np.ndarray]:
+        """Máscara booleana das passagens de documentos removidos (None se não houver)."""
+        afetados = self.documentos & removidos
+        if not afetados:
+            return None
+        return np.isin(self._doc_da_passagem, list(afetados))
+
+def _write_segment(path: str, passagens: List[Dict[str, Any]], postings: Dict[str, List[Tuple[int, int]]],
+                   passage_lens: List[int]) -> None:
+    """Grava um segmento (meta.json + arrays .npy) em um diretório temporário e o move para `path`."""
+    tmp_path = path + ".tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    terms = sorted(postings)
+    offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+    for i, term in enumerate(terms):
+        offsets[i + 1] = offsets[i] + len(postings[term])
+    passage_ids = np.empty(int(offsets[-1]), dtype=np.int32)
+    tfs = np.empty(int(offsets[-1]), dtype=np.int32)
+    for i, term in enumerate(terms):
+        lista = postings[term]
+        passage_ids[offsets[i]:offsets[i + 1]] = [p for p, _ in lista]
+        tfs[offsets[i]:offsets[i + 1]] = [tf for _, tf in lista]
+
+    np.save(os.path.join(tmp_path, "term_offsets.npy"), offsets)
+    np.save(os.path.join(tmp_path, "passage_ids.npy"), passage_ids)
+    np.save(os.path.join(tmp_path, "tfs.npy"), tfs)
+    np.save(os.path.join(tmp_path, "passage_lens.npy"), np.asarray(passage_lens, dtype=np.int32))
+    meta = {
+        "terms": terms,
+        "passagens": passagens,
+        "documentos": sorted({p["doc_id"] for p in passagens}),
+    }
+    with open(os.path.join(tmp_path, "meta.json"), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+# --- Índice ---
+
+class BM25Index:
+    """
+    Índice invertido BM25 sobre os content_chunks do pipeline, em segmentos.
+
+    Cada chamada a add_document/add_documents grava um novo segmento, sem
+    reescrever os existentes. Quando um nível acumula `fator_merge` segmentos,
+    eles são unidos em um segmento do nível seguinte (em uma thread, se
+    `merge_em_background`), como numa LSM-tree. Reindexar um documento marca a
+    versão antiga como removida; ela some fisicamente no próximo merge.
+    """
+
+    def __init__(self, index_dir: str, k1: float = 1.2, b: float = 0.75, palavras_por_passagem: int = 200,
+                 fator_merge: int = 8, merge_em_background: bool = True):
+        self.index_dir = index_dir
+        self.k1, self.b = k1, b
+        self.palavras_por_passagem = palavras_por_passagem
+        self.fator_merge = fator_merge
+        self.merge_em_background = merge_em_background
+
+        self._lock = threading.RLock()
+        self._merge_thread: Optional[threading.Thread] = None
+        os.makedirs(index_dir, exist_ok=True)
+
+        manifest = self._read_manifest()
+        self._proximo_id: int = manifest["proximo_id"]
+        self._niveis: Dict[str, int] = {s["nome"]: s["nivel"] for s in manifest["segmentos"]}
+        self._removidos: Dict[str, set] = {nome: set(docs) for nome, docs in manifest["removidos"].items()}
+        self._segmentos: List[_Segmento] = [_Segmento(os.path.join(index_dir, s["nome"])) for s in manifest["segmentos"]]
+
+    # --- Persistência do manifesto ---
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.index_dir, "manifest.json")
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        try:
+            with open(self._manifest_path(), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"proximo_id": 0, "segmentos": [], "removidos": {}}
+
+    def _write_manifest(self) -> None:
+        manifest = {
+            "proximo_id": self._proximo_id,
+            "segmentos": [{"nome": s.nome, "nivel": self._niveis[s.nome]} for s in self._segmentos],
+            "removidos": {nome: sorted(docs) for nome, docs in self._removidos.items() if docs},
+        }
+        tmp_path = self._manifest_path() + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self._manifest_path())
+
+    def _novo_nome(self) -> str:
+        with self._lock:
+            nome = f"seg_{self._proximo_id:06d}"
+            self._proximo_id += 1
+            return nome
+
+    # --- Indexação ---
+
+    def add_document(self, documento: Dict[str, Any]) -> Optional[str]:
+        """Indexa os content_chunks de um documento final do pipeline em um novo segmento."""
+        return self.add_documents([documento])
+
+    def add_documents(self, documentos: List[Dict[str, Any]]) -> Optional[str]:
+        """Indexa vários documentos em um único segmento (útil para carga inicial)."""
+        passagens, passage_lens = [], []
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        doc_ids = set()
+
+        for documento in documentos:
+            doc_id = documento.get("metadata", {}).get("doc_id")
+            doc_ids.add(doc_id)
+            for chunk_idx, chunk in enumerate(documento.get("content_chunks", [])):
+                texto = chunk.get("texto") if isinstance(chunk, dict) else None
+                if not texto:
+                    continue
+                for inicio, fim in split_passages(texto, self.palavras_por_passagem):
+                    tokens = analyze(texto[inicio:fim])
+                    if not tokens:
+                        continue
+                    pid = len(passagens)
+                    passagens.append({"doc_id": doc_id, "chunk": chunk_idx, "inicio": inicio, "fim": fim,
+                                      "texto": texto[inicio:fim]})
+                    passage_lens.append(len(tokens))
+                    for term, tf in Counter(tokens).items():
+                        postings.setdefault(term, []).append((pid, tf))
+
+        with self._lock:
+            # Versões anteriores destes documentos passam a ser ignoradas
+            for segmento in self._segmentos:
+                antigos = segmento.documentos & doc_ids
+                if antigos:
+                    self._removidos.setdefault(segmento.nome, set()).update(antigos)
+
+            nome = None
+            if passagens:
+                nome = self._novo_nome()
+                _write_segment(os.path.join(self.index_dir, nome), passagens, postings, passage_lens)
+                self._segmentos = self._segmentos + [_Segmento(os.path.join(self.index_dir, nome))]
+                self._niveis[nome] = 0
+            self._write_manifest()
+
+        self._maybe_merge()
+        return nome
+
+    def remove_document(self, doc_id: str) -> None:
+        with self._lock:
+            for segmento in self._segmentos:
+                if doc_id in segmento.documentos:
+                    self._removidos.setdefault(segmento.nome, set()).add(doc_id)
+            self._write_manifest()
+
+    # --- Merge de Segmentos ---
+
+    def _candidatos_merge(self) -> Optional[List[_Segmento]]:
+        """Segmentos do menor nível que já acumulou `fator_merge` segmentos (ou None)."""
+        por_nivel: Dict[int, List[_Segmento]] = {}
+        for segmento in self._segmentos:
+            por_nivel.setdefault(self._niveis[segmento.nome], []).append(segmento)
+        return next((segs for _, segs in sorted(por_nivel.items()) if len(segs) >= self.fator_merge), None)
+
+    def _maybe_merge(self) -> None:
+        with self._lock:
+            if self._merge_thread is not None and self._merge_thread.is_alive():
+                return
+            if not self._candidatos_merge():
+                return
+            if self.merge_em_background:
+                self._merge_thread = threading.Thread(target=self._merge_pendentes, daemon=True)
+                self._merge_thread.start()
+                return
+        self._merge_pendentes()
+
+    def _merge_pendentes(self) -> None:
+        while True:
+            with self._lock:
+                candidatos = self._candidatos_merge()
+            if not candidatos:
+                return
+            self._merge(candidatos)
+
+    def wait_for_merges(self) -> None:
+        """Bloqueia até não haver merges em andamento nem pendentes."""
+        while True:
+            thread = self._merge_thread
+            if thread is not None and thread.is_alive():
+                thread.join()
+                continue
+            with self._lock:
+                pendente = self._candidatos_merge()
+            if not pendente:
+                return
+            self._maybe_merge()
+
+    def merge_all(self) -> None:
+        """Une todos os segmentos em um só (remove fisicamente os documentos marcados)."""
+        self.wait_for_merges()
+        with self._lock:
+            segmentos = list(self._segmentos)
+        if len(segmentos) > 1 or any(self._removidos.get(s.nome) for s in segmentos):
+            self._merge(segmentos)
+
+    def _merge(self, segmentos: List[_Segmento]) -> None:
+        with self._lock:
+            removidos_inicio = {s.nome: set(self._removidos.get(s.nome, set())) for s in segmentos}
+
+        passagens, passage_lens = [], []
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        for segmento in segmentos:
+            mascara = segmento.mascara_removidos(removidos_inicio[segmento.nome])
+            novo_id = np.full(len(segmento), -1, dtype=np.int64)
+            for pid, passagem in enumerate(segmento.passagens):
+                if mascara is None or not mascara[pid]:
+                    novo_id[pid] = len(passagens)
+                    passagens.append(passagem)
+                    passage_lens.append(int(segmento.passage_lens[pid]))
+            for term, i in segmento.terms.items():
+                ini, fim = int(segmento.term_offsets[i]), int(segmento.term_offsets[i + 1])
+                ids = novo_id[segmento.passage_ids[ini:fim]]
+                validos = ids >= 0
+                if validos.any():
+                    lista = postings.setdefault(term, [])
+                    lista.extend(zip(ids[validos].tolist(), np.asarray(segmento.tfs[ini:fim])[validos].tolist()))
+
+        nivel = max(self._niveis[s.nome] for s in segmentos) + 1
+        nome = self._novo_nome() if passagens else None
+        if nome:
+            _write_segment(os.path.join(self.index_dir, nome), passagens, postings, passage_lens)
+
+        with self._lock:
+            unidos = {s.nome for s in segmentos}
+            novos = [s for s in self._segmentos if s.nome not in unidos]
+            if nome:
+                novo = _Segmento(os.path.join(self.index_dir, nome))
+                self._niveis[nome] = nivel
+                # Remoções feitas durante o merge continuam valendo no segmento novo
+                tardios = set()
+                for s in segmentos:
+                    tardios |= self._removidos.get(s.nome, set()) - removidos_inicio[s.nome]
+                if tardios & novo.documentos:
+                    self._removidos[nome] = tardios & novo.documentos
+                novos.append(novo)
+            for s in segmentos:
+                self._removidos.pop(s.nome, None)
+                self._niveis.pop(s.nome, None)
+            self._segmentos = novos
+            self._write_manifest()
+
+        for s in segmentos:
+            shutil.rmtree(s.path, ignore_errors=True) # Leitores ainda abertos mantêm o mmap válido (POSIX)
+
+    # --- Consulta ---
+
+    def search(self, query: str, k: int = 10) -> List[Dict[str, Any]]:
+        """Retorna as k passagens com maior score BM25 (doc_id, chunk, inicio, fim, texto, score)."""
+        termos = list(dict.fromkeys(analyze(query)))
+        with self._lock:
+            segmentos = list(self._segmentos)
+            removidos = {nome: set(docs) for nome, docs in self._removidos.items()}
+        if not termos or not segmentos:
+            return []
+
+        # Passagens de documentos removidos/reindexados (ainda não descartadas por um merge)
+        # ficam fora de N, do comprimento médio e do df, como se já tivessem sido apagadas
+        mascaras = [s.mascara_removidos(removidos.get(s.nome, set())) for s in segmentos]
+        total_passagens, total_tokens = 0, 0
+        for segmento, mascara in zip(segmentos, mascaras):
+            total_passagens += len(segmento)
+            total_tokens += segmento.total_tokens
+            if mascara is not None:
+                total_passagens -= int(np.count_nonzero(mascara))
+                total_tokens -= int(np.asarray(segmento.passage_lens, dtype=np.int64)[mascara].sum())
+        media_len = total_tokens / max(total_passagens, 1)
+
+        postings_por_segmento = []
+        df = np.zeros(len(termos), dtype=np.int64)
+        for segmento, mascara in zip(segmentos, mascaras):
+            lista = []
+            for j, termo in enumerate(termos):
+                ids, tfs = segmento.postings(termo)
+                if mascara is not None and len(ids):
+                    vivos = ~mascara[ids]
+                    ids, tfs = ids[vivos], tfs[vivos]
+                lista.append((ids, tfs))
+                df[j] += len(ids)
+            postings_por_segmento.append(lista)
+        idf = np.log(1.0 + (total_passagens - df + 0.5) / (df + 0.5))
+
+        # Scores calculados só sobre as entradas das postings (normalização inclusive), sem vetores
+        # do tamanho do segmento por termo
+        candidatos: List[Tuple[float, _Segmento, int]] = []
+        for segmento, lista in zip(segmentos, postings_por_segmento):
+            ids_termos, contribuicoes = [], []
+            for peso, (ids, tfs) in zip(idf, lista):
+                if len(ids):
+                    tfs = tfs.astype(np.float32)
+                    norm = self.k1 * (1 - self.b + self.b * segmento.passage_lens[ids].astype(np.float32) / media_len)
+                    ids_termos.append(ids)
+                    contribuicoes.append(peso * tfs * (self.k1 + 1) / (tfs + norm))
+            if not ids_termos:
+                continue
+            if len(ids_termos) == 1:  # Um termo só: a lista de postings já não tem repetições
+                pids, scores = ids_termos[0], contribuicoes[0]
+            else:
+                todos_ids = np.concatenate(ids_termos)
+                if len(todos_ids) * 8 < len(segmento):
+                    # Termos raros: agrupa as passagens das postings (ordenação de poucos ids)
+                    pids, posicao = np.unique(todos_ids, return_inverse=True)
+                    scores = np.bincount(posicao, weights=np.concatenate(contribuicoes))
+                else:
+                    # Termos frequentes: um único acumulador até o maior id tocado sai mais barato que ordenar
+                    scores = np.bincount(todos_ids, weights=np.concatenate(contribuicoes))
+                    pids = np.flatnonzero(scores)
+                    scores = scores[pids]
+            n = min(k, len(pids))
+            top = np.argpartition(-scores, n - 1)[:n]
+            candidatos.extend((float(scores[i]), segmento, int(pids[i])) for i in top)
+
+        candidatos.sort(key=lambda c: c[0], reverse=True)
+        return [{**segmento.passagens[pid], "score": score} for score, segmento, pid in candidatos[:k]]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "segmentos": len(self._segmentos),
+                "niveis": {s.nome: self._niveis[s.nome] for s in self._segmentos},
+                "passagens": sum(len(s) for s in self._segmentos),
+                "documentos_removidos": sum(len(d) for d in self._removidos.values()),
+            }
@@ -0,0 +1,169 @@
+# src/checkpoint.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Dict, Any, Optional, List, Tuple
+
+try:
+    from src.document_classifier import content_hash
+    from src.serializer import get_serializer
+except ImportError:
+    from .document_classifier import content_hash
+    from .serializer import get_serializer
+
+OK, FALHA = "ok", "falha"
+
+# Muda quando o formato das entradas de página muda, invalidando os checkpoints antigos
+VERSAO_CHECKPOINT = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documentos (
+    doc_key TEXT PRIMARY KEY,      -- hash do conteúdo + configuração da execução
+    nome TEXT NOT NULL,            -- nome do arquivo (o mesmo usado na saída)
+    n_paginas INTEGER,
+    configuracao TEXT,
+    criado_em REAL
+);
+
+CREATE TABLE IF NOT EXISTS paginas (
+    doc_key TEXT NOT NULL,
+    pagina INTEGER NOT NULL,       -- 1-indexada
+    estado TEXT NOT NULL,          -- "ok" ou "falha"
+    texto TEXT,                    -- texto bruto da página (para os content_chunks)
+    entrada BLOB,                  -- entrada de page_specific_data (JSON), só com estado "ok"
+    raw_strings BLOB,              -- tabela de strings da página (modo "all" das tabelas brutas)
+    erro TEXT,
+    tentativas INTEGER NOT NULL DEFAULT 1,
+    duracao_s REAL,
+    atualizado_em REAL,
+    PRIMARY KEY (doc_key, pagina)
+);
+"""
+
+
+class PageCheckpoint:
+    """
+    Checkpoints por página de execuções longas, em um SQLite em `work_dir`.
+
+    process_document grava cada página assim que ela termina (entrada de
+    page_specific_data e texto bruto, ou a falha com a mensagem de erro). Uma
+    execução interrompida (queda do processo, OOM, Ctrl+C) retoma do ponto em
+    que parou: as páginas "ok" vêm do checkpoint e só as que faltam (ou que
+    falharam) são processadas antes de montar o documento.
+
+    Os checkpoints de um documento são identificados pelo hash do conteúdo e
+    pela configuração que muda o resultado (tipo, política de tabelas brutas,
+    roteamento): se o PDF ou a configuração mudam, as páginas são refeitas.
+    Depois que o documento final é gravado, o chamador descarta os
+    checkpoints com discard_document().
+    """
+
+    def __init__(self, work_dir: str):
+        os.makedirs(work_dir, exist_ok=True)
+        self.db_path = os.path.join(work_dir, "checkpoints.sqlite")
+        # timeout: o daemon de extração abre o mesmo banco em vários workers
+        self._conn = sqlite3.connect(self.db_path, timeout=30)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL") # Com WAL, sobrevive à queda do processo
+        self._conn.executescript(_SCHEMA)
+        self._serializer = get_serializer()
+
+    # --- Documentos ---
+
+    def open_document(self, pdf_path: str, n_paginas: int, configuracao: Dict[str, Any]) -> str:
+        """
+        Chave dos checkpoints do PDF nesta configuração. Checkpoints do mesmo
+        nome de arquivo com outro conteúdo ou outra configuração são apagados.
+        """
+        nome = os.path.basename(pdf_path)
+        config_json = json.dumps({**configuracao, "versao": VERSAO_CHECKPOINT}, sort_keys=True)
+        doc_key = f"{content_hash(pdf_path)[:20]}:{hashlib.sha1(config_json.encode('utf-8')).hexdigest()[:12]}"
+        with self._conn:
+            antigas = [linha[0] for linha in self._conn.execute(
+                "SELECT doc_key FROM documentos WHERE nome = ? AND doc_key != ?", (nome, doc_key))]
+            for antiga in antigas:
+                self._apagar(antiga)
+            self._conn.execute("INSERT OR IGNORE INTO documentos VALUES (?, ?, ?, ?, ?)",
+                               (doc_key, nome, n_paginas, config_json, time.time()))
+        return doc_key
+
+    def _apagar(self, doc_key: str) -> None:
+        self._conn.execute("DELETE FROM paginas WHERE doc_key = ?", (doc_key,))
+        self._conn.execute("DELETE FROM documentos WHERE doc_key = ?", (doc_key,))
+
+    def discard_document(self, pdf_path: str) -> None:
+        """Apaga os checkpoints do arquivo (chamar depois de gravar o documento final)."""
+        nome = os.path.basename(pdf_path)
+        with self._conn:
+            for (doc_key,) in self._conn.execute("SELECT doc_key FROM documentos WHERE nome = ?", (nome,)).fetchall():
+                self._apagar(doc_key)
+
+    # --- Páginas ---
+
+    def page_states(self, doc_key: str) -> Dict[int, Dict[str, Any]]:
+        """{página: {"estado", "erro", "tentativas"}} das páginas já registradas."""
+        return {pagina: {"estado": estado, "erro": erro, "tentativas": tentativas}
+                for pagina, estado, erro, tentativas in self._conn.execute(
+                    "SELECT pagina, estado, erro, tentativas FROM paginas WHERE doc_key = ?", (doc_key,))}
+
+    def load_page(self, doc_key: str, pagina: int) -> Tuple[Dict[str, Any], str, Optional[List[str]]]:
+        """(entrada, texto, tabela de strings da página) de uma página "ok"."""
+        entrada, texto, raw_strings = self._conn.execute(
+            "SELECT entrada, texto, raw_strings FROM paginas WHERE doc_key = ? AND pagina = ? AND estado = ?",
+            (doc_key, pagina, OK)).fetchone()
+        return (self._serializer.loads(entrada), texto or "",
+                self._serializer.loads(raw_strings) if raw_strings is not None else None)
+
+    def save_page(self, doc_key: str, pagina: int, entrada: Dict[str, Any], texto: str,
+                  raw_strings: Optional[List[str]] = None, duracao_s: Optional[float] = None) -> None:
+        self._gravar(doc_key, pagina, OK, texto, self._serializer.dumps(entrada),
+                     self._serializer.dumps(raw_strings) if raw_strings else None, None, duracao_s)
+
+    def save_failure(self, doc_key: str, pagina: int, texto: str, erro: str,
+                     duracao_s: Optional[float] = None) -> None:
+        self._gravar(doc_key, pagina, FALHA, texto, None, None, erro, duracao_s)
+
+    def _gravar(self, doc_key, pagina, estado, texto, entrada, raw_strings, erro, duracao_s) -> None:
+        # Um commit por página: o que terminou antes de uma queda não se perde
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO paginas (doc_key, pagina, estado, texto, entrada, raw_strings, erro, duracao_s, atualizado_em) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (doc_key, pagina) DO UPDATE SET estado = excluded.estado, texto = excluded.texto, "
+                "entrada = excluded.entrada, raw_strings = excluded.raw_strings, erro = excluded.erro, "
+                "duracao_s = excluded.duracao_s, atualizado_em = excluded.atualizado_em, tentativas = tentativas + 1",
+                (doc_key, pagina, estado, texto, entrada, raw_strings, erro, duracao_s, time.time()))
+
+    # --- Consulta ---
+
+    def failures(self, nome: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Falhas registradas (de todos os documentos, ou só do arquivo `nome`)."""
+        consulta = ("SELECT d.nome, p.pagina, p.erro, p.tentativas FROM paginas p JOIN documentos d USING (doc_key) "
+                    "WHERE p.estado = ?")
+        parametros: Tuple[Any, ...] = (FALHA,)
+        if nome is not None:
+            consulta += " AND d.nome = ?"
+            parametros += (os.path.basename(nome),)
+        return [{"nome": n, "pagina": p, "erro": e, "tentativas": t}
+                for n, p, e, t in self._conn.execute(consulta + " ORDER BY d.nome, p.pagina", parametros)]
+
+    def report(self) -> List[Dict[str, Any]]:
+        """Documentos com checkpoints pendentes (não descartados): páginas ok, com falha e faltando."""
+        linhas = self._conn.execute(
+            "SELECT d.nome, d.n_paginas, SUM(p.estado = ?), SUM(p.estado = ?) FROM documentos d "
+            "LEFT JOIN paginas p USING (doc_key) GROUP BY d.doc_key ORDER BY d.nome", (OK, FALHA))
+        return [{"nome": nome, "paginas": n, "ok": ok or 0, "falhas": falhas or 0,
+                 "faltando": n - (ok or 0) - (falhas or 0)} for nome, n, ok, falhas in linhas]
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
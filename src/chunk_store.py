@@ -0,0 +1,176 @@
+# src/chunk_store.py
+
+import json
+import mmap
+import os
+import shutil
+from typing import Dict, Any, Optional, List, Iterable
+
+import numpy as np
+
+try:
+    from src.serializer import load_document
+except ImportError:
+    from .serializer import load_document
+
+# Tipos de registro no índice
+TIPO_CHUNK = 0
+TIPO_PAGINA = 1 # page_specific_data de uma página, serializado em JSON
+
+# Registro de largura fixa do índice (um por chunk ou página)
+REGISTRO_DTYPE = np.dtype([
+    ("offset", "<u8"),  # posição em dados.bin
+    ("length", "<u4"),  # tamanho em bytes
+    ("doc", "<u4"),     # índice do documento em documentos.json
+    ("pagina", "<i4"),  # número da página (-1 para chunks)
+    ("tipo", "u1"),
+])
+
+
+# --- Escrita ---
+
+def write_chunk_store(store_dir: str, documentos: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Grava o corpus em formato binário:
+    - dados.bin: textos dos chunks (UTF-8) e páginas (JSON) concatenados;
+    - indice.npy: um REGISTRO_DTYPE por registro (offset/tamanho no dados.bin);
+    - documentos.json: doc_id, nome_doc e os intervalos [inicio, fim) de cada
+      documento no índice (chunks e páginas; páginas ordenadas pelo número).
+
+    Escreve em um diretório temporário e troca no final, então leitores nunca
+    veem um store parcial.
+    """
+    tmp_dir = store_dir.rstrip(os.sep) + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    registros: List[tuple] = []
+    documentos_info = []
+    offset = 0
+    with open(os.path.join(tmp_dir, "dados.bin"), 'wb') as dados:
+        def gravar(blob: bytes, doc: int, pagina: int, tipo: int):
+            nonlocal offset
+            dados.write(blob)
+            registros.append((offset, len(blob), doc, pagina, tipo))
+            offset += len(blob)
+
+        for doc_idx, documento in enumerate(documentos):
+            metadata = documento.get("metadata", {})
+            info = {"doc_id": metadata.get("doc_id"), "nome_doc": metadata.get("nome_doc")}
+
+            inicio = len(registros)
+            for chunk in documento.get("content_chunks", []):
+                texto = chunk.get("texto") if isinstance(chunk, dict) else None
+                gravar((texto or "").encode('utf-8'), doc_idx, -1, TIPO_CHUNK)
+            info["chunks"] = [inicio, len(registros)]
+
+            inicio = len(registros)
+            paginas = sorted(documento.get("page_specific_data", []), key=lambda p: p.get("page", 0))
+            for page in paginas:
+                blob = json.dumps(page, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+                gravar(blob, doc_idx, int(page.get("page", -1)), TIPO_PAGINA)
+            info["paginas"] = [inicio, len(registros)]
+            documentos_info.append(info)
+
+    np.save(os.path.join(tmp_dir, "indice.npy"), np.array(registros, dtype=REGISTRO_DTYPE))
+    with open(os.path.join(tmp_dir, "documentos.json"), 'w', encoding='utf-8') as f:
+        json.dump(documentos_info, f, ensure_ascii=False)
+
+    shutil.rmtree(store_dir, ignore_errors=True)
+    os.replace(tmp_dir, store_dir)
+    return {"documentos": len(documentos_info), "registros": len(registros), "bytes": offset}
+
+def write_chunk_store_from_jsonl(store_dir: str, paths: List[str]) -> Dict[str, int]:
+    """Monta o store a partir dos arquivos de data/output (.jsonl, .jsonl.gz ou .jsonl.zst; um documento por vez)."""
+    def carregar():
+        for path in paths:
+            yield load_document(path)
+    return write_chunk_store(store_dir, carregar())
+
+
+# --- Leitura ---
+
+class ChunkStore:
+    """
+    Leitor do store: dados.bin é mapeado com mmap e o índice é aberto com
+    np.load(mmap_mode='r'), então nada é carregado até ser acessado. Os
+    métodos de acesso devolvem memoryview sobre o mmap (sem cópia nem parse);
+    *_text / page_data decodificam quando o chamador precisa do objeto.
+    """
+
+    def __init__(self, store_dir: str):
+        self.store_dir = store_dir
+        self.indice = np.load(os.path.join(store_dir, "indice.npy"), mmap_mode='r')
+        with open(os.path.join(store_dir, "documentos.json"), 'r', encoding='utf-8') as f:
+            self.documentos: List[Dict[str, Any]] = json.load(f)
+        self._doc_ids = {info["doc_id"]: i for i, info in enumerate(self.documentos)}
+
+        self._arquivo = open(os.path.join(store_dir, "dados.bin"), 'rb')
+        if os.fstat(self._arquivo.fileno()).st_size:
+            self._mmap = mmap.mmap(self._arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+            self._dados = memoryview(self._mmap)
+        else: # mmap não aceita arquivo vazio
+            self._mmap = None
+            self._dados = memoryview(b"")
+
+    def close(self) -> None:
+        """Fecha o mmap. As memoryviews devolvidas precisam ter sido liberadas antes (senão: BufferError)."""
+        self._dados.release()
+        if self._mmap is not None:
+            self._mmap.close()
+        self._arquivo.close()
+
+    def __enter__(self) -> "ChunkStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.indice)
+
+    def _doc(self, doc_id: str) -> Dict[str, Any]:
+        if doc_id not in self._doc_ids:
+            raise KeyError(f"Documento não encontrado no store: '{doc_id}'")
+        return self.documentos[self._doc_ids[doc_id]]
+
+    # --- Acesso por id, offset, chunk e página ---
+
+    def read(self, offset: int, length: int) -> memoryview:
+        """Fatia arbitrária de dados.bin (acesso por offset de bytes)."""
+        return self._dados[offset:offset + length]
+
+    def record(self, record_id: int) -> memoryview:
+        """Bytes do registro global `record_id` (chunk ou página)."""
+        registro = self.indice[record_id]
+        return self.read(int(registro["offset"]), int(registro["length"]))
+
+    def num_chunks(self, doc_id: str) -> int:
+        inicio, fim = self._doc(doc_id)["chunks"]
+        return fim - inicio
+
+    def chunk(self, doc_id: str, chunk_idx: int) -> memoryview:
+        inicio, fim = self._doc(doc_id)["chunks"]
+        if not 0 <= chunk_idx < fim - inicio:
+            raise IndexError(f"Chunk {chunk_idx} fora do intervalo para '{doc_id}' ({fim - inicio} chunks).")
+        return self.record(inicio + chunk_idx)
+
+    def chunk_text(self, doc_id: str, chunk_idx: int) -> str:
+        return str(self.chunk(doc_id, chunk_idx), 'utf-8')
+
+    def pages(self, doc_id: str) -> List[int]:
+        inicio, fim = self._doc(doc_id)["paginas"]
+        return [int(p) for p in self.indice["pagina"][inicio:fim]]
+
+    def page(self, doc_id: str, page_num: int) -> Optional[memoryview]:
+        """page_specific_data da página (JSON em bytes), localizada por busca binária; None se não existir."""
+        inicio, fim = self._doc(doc_id)["paginas"]
+        paginas = self.indice["pagina"][inicio:fim]
+        pos = int(np.searchsorted(paginas, page_num))
+        if pos >= len(paginas) or paginas[pos] != page_num:
+            return None
+        return self.record(inicio + pos)
+
+    def page_data(self, doc_id: str, page_num: int) -> Optional[Dict[str, Any]]:
+        blob = self.page(doc_id, page_num)
+        return None if blob is None else json.loads(bytes(blob))
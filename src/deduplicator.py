@@ -1,6 +1,16 @@
 import hashlib
 from typing import List, Dict
 
+try:
+    from src.instrumentation import timed
+except ImportError:
+    from .instrumentation import timed
+
+def chunk_hash(text: str) -> str:
+    """Hash SHA-256 (hex) do texto de um chunk, já sem espaços nas pontas."""
+    return hashlib.sha256(text.strip().encode('utf-8')).hexdigest()
+
+@timed()
 def deduplicate_chunks(chunks: List[Dict], min_length: int = 50) -> List[Dict]:
     """
     Remove blocos de texto duplicados de uma lista de chunks.
@@ -17,6 +27,8 @@ def deduplicate_chunks(chunks: List[Dict], min_length: int = 50) -> List[Dict]:
 
     Returns:
         Uma nova lista de chunks contendo apenas os blocos de texto únicos.
+        Cada chunk com texto recebe o campo "hash" (ver chunk_hash), que é
+        reaproveitado como chave do cache de embeddings.
     """
     seen_hashes = set()
     unique_chunks = []
@@ -24,15 +36,18 @@ def deduplicate_chunks(chunks: List[Dict], min_length: int = 50) -> List[Dict]:
     for chunk in chunks:
         # Pega o texto do chunk, garantindo que exista
         text = chunk.get('texto', '').strip()
-        
-        # Ignora textos muito curtos ou vazios
-        if len(text) < min_length:
+        if not text:
             unique_chunks.append(chunk)
             continue
 
         # Calcula o hash do texto para criar uma assinatura única
-        # Usamos encode('utf-8') pois o hashlib trabalha com bytes
-        text_hash = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        text_hash = chunk_hash(text)
+        chunk = {**chunk, "hash": text_hash}
+
+        # Textos muito curtos não são deduplicados
+        if len(text) < min_length:
+            unique_chunks.append(chunk)
+            continue
 
         # Se nunca vimos esse hash antes, o texto é único
         if text_hash not in seen_hashes:
@@ -0,0 +1,204 @@
+# src/document_classifier.py
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Dict, Any, Optional, List
+
+try:
+    import fcntl  # Trava entre processos do cache em disco (só Unix)
+except ImportError:
+    fcntl = None
+
+try:
+    from src.lazy import lazy_module
+except ImportError:
+    from .lazy import lazy_module
+
+fitz = lazy_module("fitz")  # PyMuPDF, carregado só no primeiro uso
+
+# 1. Lista de keywords para PPC (Prioridade 1)
+PPC_KEYWORDS = ["projeto pedagógico", "matriz curricular", "ementário", "colegiado de curso", "ppcbcc"]
+# 2. Lista de keywords para Horário (Prioridade 2)
+HORARIO_KEYWORDS = ["horário", "segunda", "terça", "quarta", "quinta", "sexta", "manhã", "tarde"]
+# Fora da primeira página só estas contam para PPC ("colegiado de curso" aparece
+# em qualquer regulamento acadêmico)
+PPC_KEYWORDS_FORTES = ["projeto pedagógico", "matriz curricular", "ementário", "ppcbcc"]
+
+# Mínimo de keywords de horário para uma página votar "schedule"; com muitas
+# linhas de régua (grade desenhada), menos keywords bastam
+MIN_HORARIO_KEYWORDS = 5
+MIN_HORARIO_KEYWORDS_COM_GRADE = 3
+MIN_LINHAS_GRADE = 40
+
+# Muda quando as regras mudam, invalidando as classificações em cache
+VERSAO_CLASSIFICADOR = 2
+
+
+# --- Estatísticas Baratas por Página ---
+
+def page_features(page: fitz.Page, texto: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Sinais baratos de uma página (poucos ms, sem renderizar): texto, densidade
+    de texto, quantidade de linhas de régua desenhadas (segmentos horizontais/
+    verticais e lados de retângulos), que é o que o Camelot lattice procura, e
+    o tamanho em pixels da maior imagem (uma tabela escaneada não tem linhas
+    vetoriais, mas o lattice ainda encontra as linhas na página renderizada).
+    `texto` evita reextrair o texto quando o chamador já o tem.
+    """
+    if texto is None:
+        texto = page.get_text("text")
+    linhas_regua = 0
+    for caminho in page.get_cdrawings():
+        for item in caminho["items"]:
+            if item[0] == "re":
+                linhas_regua += 4
+            elif item[0] == "l":
+                (x0, y0), (x1, y1) = item[1], item[2]
+                if abs(x0 - x1) < 1 or abs(y0 - y1) < 1:
+                    linhas_regua += 1
+    # get_images lê só os recursos da página (largura e altura de cada imagem), sem decodificar
+    maior_imagem_px = max((img[2] * img[3] for img in page.get_images()), default=0)
+    area = abs(page.rect) or 1.0
+    return {
+        "texto": texto.lower(),
+        "caracteres": len(texto),
+        "densidade_texto": round(len(texto) / area * 1000, 3), # caracteres por 1000 pt²
+        "linhas_regua": linhas_regua,
+        "maior_imagem_px": maior_imagem_px,
+    }
+
+def sample_pages(n_paginas: int, amostras: int) -> List[int]:
+    """Índices (0-indexados) amostrados: a primeira página e o restante espaçado uniformemente até a última."""
+    if n_paginas <= amostras:
+        return list(range(n_paginas))
+    if amostras <= 1:
+        return [0]
+    return sorted({round(k * (n_paginas - 1) / (amostras - 1)) for k in range(amostras)})
+
+
+# --- Voto por Página ---
+
+def _page_vote(features: Dict[str, Any], primeira: bool) -> Dict[str, Any]:
+    """Mesma prioridade da detecção antiga pela primeira página: PPC, depois horário, senão genérico."""
+    texto = features["texto"]
+    ppc_hits = [kw for kw in (PPC_KEYWORDS if primeira else PPC_KEYWORDS_FORTES) if kw in texto]
+    horario_hits = sum(1 for kw in HORARIO_KEYWORDS if kw in texto)
+    if ppc_hits:
+        voto = "ppc"
+    elif horario_hits >= MIN_HORARIO_KEYWORDS or (horario_hits >= MIN_HORARIO_KEYWORDS_COM_GRADE
+                                                  and features["linhas_regua"] >= MIN_LINHAS_GRADE):
+        voto = "schedule"
+    else:
+        voto = "generic"
+    return {"voto": voto, "ppc_keywords": ppc_hits, "horario_keywords": horario_hits,
+            "caracteres": features["caracteres"], "linhas_regua": features["linhas_regua"]}
+
+
+def _decide(votos_pagina: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combina os votos das páginas amostradas (a primeira página vale 2, as
+    demais 1). Um tipo específico vence o genérico com peso >= 2 (a primeira
+    página, ou duas outras), já que páginas de texto corrido existem em todo
+    tipo; PPC vence horário no empate. A confiança é a fração do peso total
+    (votos genéricos incluídos) que ficou com o tipo escolhido.
+    """
+    pesos = {"ppc": 0, "schedule": 0, "generic": 0}
+    for i, pagina in enumerate(votos_pagina):
+        pesos[pagina["voto"]] += 2 if i == 0 else 1
+    total = sum(pesos.values())
+    if not total:
+        return {"pdf_type": "generic", "confianca": 0.0}
+
+    pdf_type = "ppc" if pesos["ppc"] >= pesos["schedule"] else "schedule"
+    if pesos[pdf_type] < 2:
+        pdf_type = "generic"
+    return {"pdf_type": pdf_type, "confianca": round(pesos[pdf_type] / total, 3)}
+
+
+# --- Classificação do Documento (com cache por conteúdo) ---
+
+# hash do conteúdo -> classificação; compartilhado por todas as chamadas do processo
+_CACHE: Dict[str, Dict[str, Any]] = {}
+
+def content_hash(pdf_path: str) -> str:
+    """SHA-256 do arquivo (independe do nome/caminho)."""
+    h = hashlib.sha256()
+    with open(pdf_path, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloco)
+    return h.hexdigest()
+
+def _load_cache_file(cache_path: str) -> Dict[str, Dict[str, Any]]:
+    if not os.path.exists(cache_path):
+        return {}
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Alerta: Cache de classificação ilegível em '{cache_path}' ({e}). Ignorando.")
+        return {}
+
+def _save_cache_entry(cache_path: str, chave: str, resultado: Dict[str, Any]) -> None:
+    """
+    Acrescenta uma classificação ao JSON do cache. Vários processos (ex: os
+    workers do extraction_daemon) gravam no mesmo arquivo: sob uma trava
+    exclusiva em `cache_path + ".lock"`, o JSON é relido e mesclado (para não
+    perder as entradas gravadas pelos outros) e escrito em um arquivo
+    temporário próprio antes do os.replace.
+    """
+    diretorio = os.path.dirname(os.path.abspath(cache_path))
+    os.makedirs(diretorio, exist_ok=True)
+    with open(cache_path + ".lock", 'a') as trava:
+        if fcntl is not None:
+            fcntl.flock(trava, fcntl.LOCK_EX)  # Liberada ao fechar o arquivo
+        entradas = _load_cache_file(cache_path)
+        entradas[chave] = resultado
+        fd, tmp_path = tempfile.mkstemp(dir=diretorio, prefix=os.path.basename(cache_path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entradas, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+def classify_document(pdf_path: str, amostras: int = 4, cache_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Classifica o PDF como "ppc", "schedule" ou "generic" a partir de algumas
+    páginas amostradas (texto e linhas desenhadas, sem Camelot).
+
+    O resultado fica em cache pelo hash do conteúdo: em memória para o
+    processo e, com `cache_path`, também em um JSON reaproveitado entre
+    execuções e scripts. Renomear ou copiar o arquivo não refaz a análise.
+
+    Returns:
+        {"pdf_type": ..., "confianca": 0..1, "paginas_amostradas": [1-indexadas],
+         "sinais": [voto e estatísticas de cada página amostrada], "hash": ..., "cache": bool}
+    """
+    chave = f"{content_hash(pdf_path)}:v{VERSAO_CLASSIFICADOR}:{amostras}"
+    resultado = _CACHE.get(chave)
+    if resultado is None and cache_path:  # O JSON só é lido quando a memória não tem a chave
+        resultado = _load_cache_file(cache_path).get(chave)
+    if resultado is not None:
+        _CACHE[chave] = resultado
+        return {**resultado, "cache": True}
+
+    votos_pagina = []
+    paginas = []
+    with fitz.open(pdf_path) as doc:
+        for indice in sample_pages(doc.page_count, amostras):
+            paginas.append(indice + 1)
+            votos_pagina.append(_page_vote(page_features(doc.load_page(indice)), primeira=indice == 0))
+
+    resultado = {**_decide(votos_pagina), "paginas_amostradas": paginas, "sinais": votos_pagina,
+                 "hash": chave.split(":")[0]}
+    _CACHE[chave] = resultado
+    if cache_path:
+        _save_cache_entry(cache_path, chave, resultado)
+    return {**resultado, "cache": False}
@@ -0,0 +1,165 @@
+# src/embedding_cache.py
+
+import os
+import re
+from typing import Dict, Any, Optional, List, Iterable
+
+import numpy as np
+
+try:
+    from src.deduplicator import chunk_hash
+    from src.vector_store import Encoder
+except ImportError:
+    from .deduplicator import chunk_hash
+    from .vector_store import Encoder
+
+
+class EmbeddingCache:
+    """
+    Cache persistente de embeddings, chaveado por (hash do texto, encoder_id).
+
+    Cada encoder tem seu próprio subdiretório com dois arquivos append-only:
+    - vetores.f32: matriz float32 (n x dim) lida via np.memmap (sem cópia);
+    - hashes.txt: um hash por linha; a linha i é a chave da linha i da matriz.
+
+    O vetor é gravado antes do hash, então um processo interrompido deixa no
+    máximo linhas órfãs no fim de vetores.f32, que são ignoradas (e
+    sobrescritas) na próxima abertura.
+    """
+
+    def __init__(self, cache_dir: str, encoder_id: str, dim: int):
+        self.encoder_id = encoder_id
+        self.dim = dim
+        self.path = os.path.join(cache_dir, re.sub(r"[^\w.-]+", "_", encoder_id))
+        os.makedirs(self.path, exist_ok=True)
+        self._vetores_path = os.path.join(self.path, "vetores.f32")
+        self._hashes_path = os.path.join(self.path, "hashes.txt")
+
+        self._offsets: Dict[str, int] = {}
+        if os.path.exists(self._hashes_path):
+            with open(self._hashes_path, 'r', encoding='utf-8') as f:
+                for linha, h in enumerate(f):
+                    self._offsets[h.strip()] = linha
+        self._n = len(self._offsets)
+
+        # Descarta vetores órfãos (gravados sem o hash correspondente)
+        tamanho = self._n * self.dim * 4
+        if not os.path.exists(self._vetores_path):
+            open(self._vetores_path, 'wb').close()
+        elif os.path.getsize(self._vetores_path) > tamanho:
+            with open(self._vetores_path, 'r+b') as f:
+                f.truncate(tamanho)
+        elif os.path.getsize(self._vetores_path) < tamanho:
+            raise ValueError(f"Cache de embeddings corrompido em '{self.path}': hashes sem vetor.")
+
+        self._mapa: Optional[np.memmap] = None
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __contains__(self, h: str) -> bool:
+        return h in self._offsets
+
+    def _matriz(self) -> np.ndarray:
+        """Memmap somente leitura, reaberto quando o arquivo cresceu."""
+        if self._n == 0:
+            return np.empty((0, self.dim), dtype=np.float32)
+        if self._mapa is None or len(self._mapa) < self._n:
+            self._mapa = np.memmap(self._vetores_path, dtype=np.float32, mode='r', shape=(self._n, self.dim))
+        return self._mapa
+
+    # --- Consulta e Inserção ---
+
+    def get(self, h: str) -> Optional[np.ndarray]:
+        """Vetor do hash `h` como view do memmap (sem cópia), ou None."""
+        linha = self._offsets.get(h)
+        return None if linha is None else self._matriz()[linha]
+
+    def get_many(self, hashes: List[str]) -> np.ndarray:
+        """Linhas do cache para os hashes informados (todos precisam existir)."""
+        return self._matriz()[[self._offsets[h] for h in hashes]]
+
+    def put_many(self, hashes: List[str], vetores: np.ndarray) -> None:
+        """Acrescenta vetores novos ao fim dos arquivos (hashes já presentes são ignorados)."""
+        vetores = np.asarray(vetores, dtype=np.float32).reshape(-1, self.dim)
+        novos, vistos = [], set()  # `vistos` evita gravar duas vezes um hash repetido no mesmo lote
+        for i, h in enumerate(hashes):
+            if h not in self._offsets and h not in vistos:
+                vistos.add(h)
+                novos.append((h, i))
+        if not novos:
+            return
+        novos_idx = [i for _, i in novos]
+        with open(self._vetores_path, 'ab') as f:
+            f.write(np.ascontiguousarray(vetores[novos_idx]).tobytes())
+        with open(self._hashes_path, 'a', encoding='utf-8') as f:
+            f.write(''.join(f"{h}\n" for h, _ in novos))
+        for h, _ in novos:
+            self._offsets[h] = self._n
+            self._n += 1
+
+    # --- Compactação ---
+
+    def compact(self, hashes_vivos: Iterable[str]) -> int:
+        """
+        Reescreve o cache mantendo só os hashes em `hashes_vivos` (ex: os
+        hashes dos content_chunks atuais de todos os documentos). Retorna o
+        número de vetores descartados.
+        """
+        vivos = set(hashes_vivos)
+        mantidos = [(h, linha) for h, linha in sorted(self._offsets.items(), key=lambda x: x[1]) if h in vivos]
+        removidos = self._n - len(mantidos)
+        if removidos == 0:
+            return 0
+
+        matriz = self._matriz()
+        tmp_vetores, tmp_hashes = self._vetores_path + ".tmp", self._hashes_path + ".tmp"
+        with open(tmp_vetores, 'wb') as f:
+            for ini in range(0, len(mantidos), 4096):
+                f.write(np.ascontiguousarray(matriz[[linha for _, linha in mantidos[ini:ini + 4096]]]).tobytes())
+        with open(tmp_hashes, 'w', encoding='utf-8') as f:
+            f.write(''.join(f"{h}\n" for h, _ in mantidos))
+
+        self._mapa = None
+        del matriz
+        os.replace(tmp_vetores, self._vetores_path)
+        os.replace(tmp_hashes, self._hashes_path)
+        self._offsets = {h: i for i, (h, _) in enumerate(mantidos)}
+        self._n = len(mantidos)
+        return removidos
+
+
+class CachedEncoder(Encoder):
+    """
+    Envolve um Encoder com o EmbeddingCache: só os textos cujo hash ainda não
+    está no cache são enviados ao encoder. Mantém o mesmo encoder_id, então
+    pode substituir o encoder original em qualquer lugar (ex: VectorStore).
+    """
+
+    def __init__(self, encoder: Encoder, cache_dir: str):
+        self.encoder = encoder
+        self.encoder_id = encoder.encoder_id
+        self.dim = encoder.dim
+        self.cache = EmbeddingCache(cache_dir, encoder.encoder_id, encoder.dim)
+        self.acertos = 0
+        self.falhas = 0
+
+    def encode(self, texts: List[str], hashes: Optional[List[str]] = None) -> np.ndarray:
+        if hashes is None:
+            hashes = [chunk_hash(t) for t in texts]
+
+        faltando = {}
+        for text, h in zip(texts, hashes):
+            if h not in self.cache and h not in faltando:
+                faltando[h] = text
+        if faltando:
+            self.cache.put_many(list(faltando), self.encoder.encode(list(faltando.values())))
+        self.falhas += len(faltando)
+        self.acertos += len(texts) - len(faltando)
+
+        return self.cache.get_many(hashes) if texts else np.empty((0, self.dim), dtype=np.float32)
+
+    def encode_chunks(self, chunks: List[Dict[str, Any]]) -> np.ndarray:
+        """Embeddings dos content_chunks, reaproveitando o campo "hash" gravado por deduplicate_chunks."""
+        chunks = [c for c in chunks if isinstance(c, dict) and c.get("texto", "").strip()]
+        return self.encode([c["texto"] for c in chunks], [c.get("hash") or chunk_hash(c["texto"]) for c in chunks])
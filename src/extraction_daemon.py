@@ -0,0 +1,640 @@
+# src/extraction_daemon.py
+#
+# Serviço de longa duração: observa a pasta de entrada (inotify, com varredura
+# periódica como alternativa) e aceita pedidos por um socket Unix local. Os PDFs
+# novos ou alterados são processados por workers já aquecidos (Camelot, pandas e
+# PyMuPDF importados antes do primeiro documento), então a saída aparece poucos
+# segundos depois do arquivo chegar, sem o custo de partida a frio do notebook.
+# Uso (a partir da raiz do repositório):
+#   python -m src.extraction_daemon run --input-dir data/input --output-dir data/output --workers 2
+#   python -m src.extraction_daemon submit data/input/arquivo.pdf --prioridade 0
+#   python -m src.extraction_daemon status
+#   python -m src.extraction_daemon stop
+
+from __future__ import annotations
+
+import argparse
+import ctypes
+import itertools
+import json
+import multiprocessing
+import os
+import queue
+import select
+import signal
+import socket
+import socketserver
+import struct
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, Optional, List, Tuple
+
+try:
+    from src.pipeline import process_document
+    from src.output_writer import write_document
+    from src.bm25_index import BM25Index
+    from src.sqlite_export import connect as connect_sqlite, upsert_document
+    from src.table_worker import IsolatedTableExtractor
+    from src.raster_cache import RasterPageCache
+    from src.checkpoint import PageCheckpoint
+    from src.table_extractor import camelot, pd, fitz
+    from src.lazy import load_module
+except ImportError:
+    from .pipeline import process_document
+    from .output_writer import write_document
+    from .bm25_index import BM25Index
+    from .sqlite_export import connect as connect_sqlite, upsert_document
+    from .table_worker import IsolatedTableExtractor
+    from .raster_cache import RasterPageCache
+    from .checkpoint import PageCheckpoint
+    from .table_extractor import camelot, pd, fitz
+    from .lazy import load_module
+
+# Prioridades padrão (menor = antes): pedidos explícitos passam na frente dos arquivos da pasta
+PRIORIDADE_SOCKET = 0
+PRIORIDADE_PASTA = 10
+
+# Um arquivo só entra na fila quando o mtime tem pelo menos este tempo (cópia terminada)
+ESTABILIDADE_S = 1.0
+
+# Quantos jobs terminados ficam no histórico consultável pelo socket
+HISTORICO_JOBS = 200
+
+NA_FILA, PROCESSANDO, CONCLUIDO, ERRO = "na_fila", "processando", "concluido", "erro"
+
+
+# --- Workers Aquecidos ---
+# Cada processo do pool guarda, entre documentos, o seu extrator isolado de tabelas,
+# o seu cache de páginas rasterizadas (diretórios temporários diferentes por worker)
+# e a sua conexão ao banco de checkpoints (compartilhado, em <output_dir>/work).
+
+_ESTADO_WORKER: Dict[str, Any] = {}
+
+def _preload() -> None:
+    """Importa as bibliotecas pesadas (preguiçosas no pipeline) no processo atual."""
+    for proxy in (fitz, pd, camelot):
+        load_module(proxy)
+
+def _init_worker(opcoes: Dict[str, Any]) -> None:
+    # Ctrl+C no terminal chega ao grupo todo: o worker termina o documento atual e
+    # quem decide o encerramento é o processo principal
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    _preload() # Sem efeito com fork (já importadas no pai); necessário com spawn
+    from multiprocessing.util import Finalize
+
+    extrator = None
+    if opcoes.get("timeout_tabelas_s"):
+        extrator = IsolatedTableExtractor(timeout_s=opcoes["timeout_tabelas_s"])
+        Finalize(extrator, extrator.close, exitpriority=10)
+    cache = None
+    if opcoes.get("cache_raster_mb"):
+        cache = RasterPageCache(max_mb=opcoes["cache_raster_mb"])
+        Finalize(cache, cache.close, exitpriority=10)
+    checkpoint = PageCheckpoint(opcoes["checkpoint_dir"]) if opcoes.get("checkpoint_dir") else None
+    _ESTADO_WORKER.update(opcoes=opcoes, extrator=extrator, cache_raster=cache, checkpoint=checkpoint)
+
+def _aquecer() -> int:
+    return os.getpid()
+
+def _process_job(pdf_path: str) -> Dict[str, Any]:
+    """Executa o pipeline completo em um worker e grava a saída. Devolve o documento para indexação."""
+    opcoes = _ESTADO_WORKER["opcoes"]
+    inicio = time.perf_counter()
+    documento, pdf_type = process_document(pdf_path, opcoes["images_output_dir"], acronyms=opcoes["acronyms"],
+                                           raw_tables_policy=opcoes["raw_tables_policy"],
+                                           table_extractor=_ESTADO_WORKER["extrator"],
+                                           classification_cache=opcoes["classification_cache"],
+                                           raster_cache=_ESTADO_WORKER["cache_raster"],
+                                           checkpoint=_ESTADO_WORKER["checkpoint"])
+    if documento is None:
+        raise RuntimeError("erro crítico ou páginas com falha na extração (as concluídas ficam no checkpoint)")
+    write_document(output_path_for(opcoes["output_dir"], pdf_path, opcoes["compressao"]), documento,
+                   indent=opcoes["indent"])
+    if _ESTADO_WORKER["checkpoint"] is not None:
+        _ESTADO_WORKER["checkpoint"].discard_document(pdf_path)
+    return {"documento": documento, "pdf_type": pdf_type, "paginas": len(documento.get("page_specific_data", [])),
+            "duracao_s": round(time.perf_counter() - inicio, 2), "worker": os.getpid()}
+
+def output_path_for(output_dir: str, pdf_path: str, compressao: str = "") -> str:
+    """Mesmo nome de saída do notebook: <output_dir>/<arquivo>.pdf.jsonl[.gz|.zst]."""
+    return os.path.join(output_dir, f"{os.path.basename(pdf_path)}.jsonl{compressao}")
+
+
+# --- Observação da Pasta (inotify ou varredura) ---
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+
+class _Inotify:
+    """inotify do Linux via ctypes (sem dependências): avisa quando um arquivo é fechado após escrita ou movido para a pasta."""
+
+    def __init__(self, diretorio: str):
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+        if self._libc.inotify_add_watch(self.fd, os.fsencode(diretorio), _IN_CLOSE_WRITE | _IN_MOVED_TO) < 0:
+            erro = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(erro, "inotify_add_watch")
+
+    def wait(self, timeout_s: float) -> List[str]:
+        """Nomes dos arquivos com eventos (vazio no timeout)."""
+        prontos, _, _ = select.select([self.fd], [], [], timeout_s)
+        if not prontos:
+            return []
+        nomes = []
+        try:
+            dados = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        offset = 0
+        while offset < len(dados):
+            _, _, _, tamanho = struct.unpack_from("iIII", dados, offset)
+            nome = dados[offset + 16:offset + 16 + tamanho].rstrip(b"\0")
+            nomes.append(os.fsdecode(nome))
+            offset += 16 + tamanho
+        return nomes
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class FolderWatcher:
+    """
+    Detecta PDFs novos ou alterados em `input_dir` pela impressão digital
+    (tamanho, mtime_ns). Com inotify, a pasta é varrida a cada evento (e a cada
+    `intervalo_s`, caso algum evento se perca); sem inotify, a cada `intervalo_s`.
+    Um arquivo entra na fila quando o mtime tem ao menos ESTABILIDADE_S, para
+    não processar uma cópia pela metade.
+    """
+
+    def __init__(self, input_dir: str, intervalo_s: float = 2.0, usar_inotify: bool = True):
+        self.input_dir = input_dir
+        self.intervalo_s = intervalo_s
+        self.backend = "varredura"
+        self._inotify = None
+        if usar_inotify and sys.platform.startswith("linux"):
+            try:
+                self._inotify = _Inotify(input_dir)
+                self.backend = "inotify"
+            except (OSError, AttributeError) as e:
+                print(f"Alerta: inotify indisponível ({e}). Usando varredura a cada {intervalo_s} s.")
+        self.vistos: Dict[str, Tuple[int, int]] = {} # caminho -> impressão digital já enfileirada
+
+    def fingerprint(self, pdf_path: str) -> Optional[Tuple[int, int]]:
+        try:
+            info = os.stat(pdf_path)
+        except OSError:
+            return None
+        return (info.st_size, info.st_mtime_ns)
+
+    def scan(self) -> Tuple[List[str], bool]:
+        """(PDFs alterados e estáveis, se algum ainda está sendo escrito)."""
+        prontos, aguardando = [], False
+        agora = time.time()
+        try:
+            nomes = sorted(os.listdir(self.input_dir))
+        except OSError as e:
+            print(f"Alerta: Falha ao listar '{self.input_dir}' ({e}).")
+            return [], False
+        for nome in nomes:
+            if not nome.lower().endswith(".pdf"):
+                continue
+            caminho = os.path.join(self.input_dir, nome)
+            digital = self.fingerprint(caminho)
+            if digital is None or digital == self.vistos.get(caminho):
+                continue
+            if agora - digital[1] / 1e9 < ESTABILIDADE_S:
+                aguardando = True
+                continue
+            prontos.append(caminho)
+        return prontos, aguardando
+
+    def wait(self, aguardando: bool) -> None:
+        """Bloqueia até o próximo momento de varrer a pasta."""
+        if self._inotify is None:
+            time.sleep(self.intervalo_s)
+        elif aguardando:
+            time.sleep(ESTABILIDADE_S / 2)
+        else:
+            self._inotify.wait(self.intervalo_s)
+
+    def close(self) -> None:
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+
+# --- Daemon ---
+
+class ExtractionDaemon:
+    """
+    Pool de `workers` processos aquecidos alimentado por uma fila limitada com
+    prioridades (menor número sai antes; empates por ordem de chegada).
+
+    Entradas: o FolderWatcher (PRIORIDADE_PASTA) e o socket Unix (PRIORIDADE_SOCKET
+    por padrão). Com a fila cheia, o socket responde "fila cheia" e a pasta tenta
+    de novo na próxima varredura. Cada documento concluído é gravado pelo próprio
+    worker (<arquivo>.pdf.jsonl + índice lateral) e indexado no BM25 e no SQLite
+    por uma thread do processo principal, como no notebook.
+
+    Se um worker morre (ex: OOM), o pool é recriado e o job fica com estado "erro".
+    Com `checkpoints`, as páginas concluídas ficam em <output_dir>/work
+    (src/checkpoint.py) e enviar o mesmo PDF de novo retoma de onde parou.
+    """
+
+    def __init__(self, input_dir: str, output_dir: str, workers: int = 2, socket_path: Optional[str] = None,
+                 max_fila: int = 64, intervalo_s: float = 2.0, usar_inotify: bool = True,
+                 acronyms: Optional[Dict[str, str]] = None, raw_tables_policy: str = "unparsed-only",
+                 timeout_tabelas_s: Optional[float] = 120, cache_raster_mb: Optional[float] = 1024,
+                 indent: bool = False, compressao: str = "", indexar: bool = True, checkpoints: bool = True):
+        self.input_dir = input_dir
+        self.output_dir = output_dir
+        self.n_workers = workers
+        self.socket_path = socket_path or default_socket_path(output_dir)
+        self.indexar = indexar
+        self.compressao = compressao
+        self.opcoes_worker = {
+            "output_dir": output_dir, "images_output_dir": os.path.join(output_dir, "images"),
+            "acronyms": acronyms or {}, "raw_tables_policy": raw_tables_policy,
+            "classification_cache": os.path.join(output_dir, "classificacao.json"),  # Compartilhado; gravação sob trava
+            "timeout_tabelas_s": timeout_tabelas_s, "cache_raster_mb": cache_raster_mb,
+            "indent": indent, "compressao": compressao,
+            "checkpoint_dir": os.path.join(output_dir, "work") if checkpoints else None,
+        }
+        self.watcher = FolderWatcher(input_dir, intervalo_s, usar_inotify) if input_dir else None
+
+        self._fila: "queue.PriorityQueue[Tuple[int, int, str]]" = queue.PriorityQueue(max_fila)
+        self._sequencia = itertools.count(1)
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._ativos: Dict[str, str] = {} # pdf (caminho absoluto) -> id do job na fila ou em execução
+        self._lock = threading.Lock()
+        self._vagas = threading.Semaphore(workers)
+        self._parar = threading.Event()
+        self._concluidos: "queue.Queue[Optional[Tuple[Dict[str, Any], Dict[str, Any]]]]" = queue.Queue()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._threads: List[threading.Thread] = []
+        self._servidor = None
+        self.inicio = time.time()
+        self.estatisticas = {"enfileirados": 0, "concluidos": 0, "erros": 0, "recusados": 0, "reinicios_pool": 0}
+
+    # --- Pool ---
+
+    def _novo_executor(self) -> ProcessPoolExecutor:
+        # fork: os workers herdam as bibliotecas já importadas pelo processo principal
+        contexto = multiprocessing.get_context("fork" if sys.platform.startswith("linux") else "spawn")
+        executor = ProcessPoolExecutor(self.n_workers, mp_context=contexto, initializer=_init_worker,
+                                       initargs=(self.opcoes_worker,))
+        # Sobe todos os workers agora (inicializador incluído), não no primeiro documento
+        for futuro in [executor.submit(_aquecer) for _ in range(self.n_workers)]:
+            futuro.result()
+        return executor
+
+    # --- Fila de Jobs ---
+
+    def submit(self, pdf_path: str, prioridade: int = PRIORIDADE_SOCKET, origem: str = "socket") -> Dict[str, Any]:
+        """Enfileira um PDF. Um PDF já na fila ou em execução devolve o job existente."""
+        pdf_path = os.path.abspath(pdf_path)
+        if not os.path.isfile(pdf_path):
+            return {"ok": False, "erro": f"arquivo não encontrado: {pdf_path}"}
+        with self._lock:
+            if pdf_path in self._ativos:
+                return {"ok": True, "job": dict(self._jobs[self._ativos[pdf_path]]), "duplicado": True}
+            sequencia = next(self._sequencia)
+            job = {"id": f"{sequencia:06d}", "pdf": pdf_path, "prioridade": prioridade, "origem": origem,
+                   "estado": NA_FILA, "enfileirado_em": time.time()}
+            try:
+                self._fila.put_nowait((prioridade, sequencia, job["id"]))
+            except queue.Full:
+                self.estatisticas["recusados"] += 1
+                return {"ok": False, "erro": "fila cheia"}
+            self._jobs[job["id"]] = job
+            self._ativos[pdf_path] = job["id"]
+            self.estatisticas["enfileirados"] += 1
+            self._podar_historico()
+        return {"ok": True, "job": dict(job)}
+
+    def _podar_historico(self) -> None:
+        terminados = [jid for jid, job in self._jobs.items() if job["estado"] in (CONCLUIDO, ERRO)]
+        for jid in terminados[:max(0, len(terminados) - HISTORICO_JOBS)]:
+            del self._jobs[jid]
+
+    def _despachar(self) -> None:
+        """Thread que entrega jobs ao pool, no máximo um por worker livre."""
+        while not self._parar.is_set():
+            if not self._vagas.acquire(timeout=0.5):
+                continue
+            try:
+                _, _, job_id = self._fila.get(timeout=0.5)
+            except queue.Empty:
+                self._vagas.release()
+                continue
+            with self._lock:
+                job = self._jobs[job_id]
+                job.update(estado=PROCESSANDO, iniciado_em=time.time())
+            print(f"[{job_id}] Processando {os.path.basename(job['pdf'])} (origem: {job['origem']})")
+            try:
+                self._recriar_pool_se_quebrado()
+                futuro = self._executor.submit(_process_job, job["pdf"])
+            except (BrokenProcessPool, RuntimeError) as e:
+                self._finalizar(job, None, f"{type(e).__name__}: {e}")
+                continue
+            futuro.add_done_callback(lambda f, job=job: self._ao_terminar(job, f))
+
+    def _ao_terminar(self, job: Dict[str, Any], futuro) -> None:
+        try:
+            resultado = futuro.result()
+        except BrokenProcessPool as e:
+            self._finalizar(job, None, f"worker encerrado inesperadamente ({e})")
+        except Exception as e:
+            self._finalizar(job, None, f"{type(e).__name__}: {e}")
+        else:
+            self._finalizar(job, resultado, None)
+
+    def _finalizar(self, job: Dict[str, Any], resultado: Optional[Dict[str, Any]], erro: Optional[str]) -> None:
+        with self._lock:
+            job["terminado_em"] = time.time()
+            job["duracao_s"] = round(job["terminado_em"] - job["enfileirado_em"], 2)
+            if erro is None:
+                job.update(estado=CONCLUIDO, pdf_type=resultado["pdf_type"], paginas=resultado["paginas"],
+                           processamento_s=resultado["duracao_s"])
+                self.estatisticas["concluidos"] += 1
+            else:
+                job.update(estado=ERRO, erro=erro)
+                self.estatisticas["erros"] += 1
+            self._ativos.pop(job["pdf"], None)
+        if erro is None:
+            print(f"[{job['id']}] Concluído: {os.path.basename(job['pdf'])} ({resultado['pdf_type']}, "
+                  f"{resultado['paginas']} páginas, {resultado['duracao_s']} s)")
+            if self.indexar:
+                self._concluidos.put((job, resultado["documento"]))
+        else:
+            print(f"Alerta: [{job['id']}] Falha em {os.path.basename(job['pdf'])}: {erro}")
+        self._vagas.release()
+
+    def _recriar_pool_se_quebrado(self) -> None:
+        if self._executor is not None and getattr(self._executor, "_broken", False):
+            print("Alerta: Pool de workers quebrado (worker encerrado). Recriando.")
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._novo_executor()
+            self.estatisticas["reinicios_pool"] += 1
+
+    def _indexar(self) -> None:
+        """Thread dona do índice BM25 e da conexão SQLite (conexões SQLite são por thread)."""
+        indice = BM25Index(os.path.join(self.output_dir, "bm25_index"))
+        conexao = connect_sqlite(os.path.join(self.output_dir, "documentos.sqlite"))
+        try:
+            while True:
+                item = self._concluidos.get()
+                if item is None:
+                    break
+                job, documento = item
+                try:
+                    indice.add_document(documento)
+                    upsert_document(conexao, documento)
+                except Exception as e:
+                    print(f"Alerta: [{job['id']}] Falha ao indexar {os.path.basename(job['pdf'])}: {e}")
+        finally:
+            indice.wait_for_merges()
+            conexao.close()
+
+    # --- Pasta de Entrada ---
+
+    def _ja_processado(self, pdf_path: str) -> bool:
+        """Na partida, uma saída mais nova que o PDF significa que não há nada a refazer."""
+        saida = output_path_for(self.output_dir, pdf_path, self.compressao)
+        try:
+            return os.path.getmtime(saida) >= os.path.getmtime(pdf_path)
+        except OSError:
+            return False
+
+    def _observar(self) -> None:
+        """Laço da pasta de entrada (thread principal)."""
+        if self.watcher is None:
+            self._parar.wait()
+            return
+        for nome in os.listdir(self.input_dir):
+            caminho = os.path.join(self.input_dir, nome)
+            if nome.lower().endswith(".pdf") and self._ja_processado(caminho):
+                self.watcher.vistos[caminho] = self.watcher.fingerprint(caminho)
+        while not self._parar.is_set():
+            prontos, aguardando = self.watcher.scan()
+            for caminho in prontos:
+                resposta = self.submit(caminho, PRIORIDADE_PASTA, origem="pasta")
+                if resposta["ok"] or "não encontrado" in resposta["erro"]:
+                    self.watcher.vistos[caminho] = self.watcher.fingerprint(caminho)
+                # Fila cheia: continua fora de `vistos` e entra em uma próxima varredura
+            self.watcher.wait(aguardando)
+
+    # --- Socket de Controle ---
+
+    def handle_command(self, comando: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Comandos (um JSON por linha):
+          {"cmd": "submit", "pdf": "...", "prioridade": 0}
+          {"cmd": "status"}
+          {"cmd": "job", "id": "000001"}
+          {"cmd": "shutdown"}
+        """
+        nome = comando.get("cmd")
+        if nome == "submit":
+            if not comando.get("pdf"):
+                return {"ok": False, "erro": "campo 'pdf' obrigatório"}
+            return self.submit(comando["pdf"], int(comando.get("prioridade", PRIORIDADE_SOCKET)), origem="socket")
+        if nome == "status":
+            return {"ok": True, **self.status()}
+        if nome == "job":
+            with self._lock:
+                job = self._jobs.get(str(comando.get("id")))
+                return {"ok": True, "job": dict(job)} if job else {"ok": False, "erro": "job desconhecido"}
+        if nome == "shutdown":
+            self._parar.set()
+            return {"ok": True}
+        return {"ok": False, "erro": f"comando desconhecido: {nome!r}"}
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            jobs = list(self._jobs.values())
+            return {
+                "workers": self.n_workers, "pid": os.getpid(), "ativo_ha_s": round(time.time() - self.inicio, 1),
+                "observacao": self.watcher.backend if self.watcher else None,
+                "na_fila": sum(1 for job in jobs if job["estado"] == NA_FILA),
+                "processando": [dict(job) for job in jobs if job["estado"] == PROCESSANDO],
+                "recentes": [dict(job) for job in jobs if job["estado"] in (CONCLUIDO, ERRO)][-10:],
+                **self.estatisticas,
+            }
+
+    def _iniciar_socket(self) -> None:
+        daemon = self
+
+        class _Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for linha in self.rfile:
+                    if not linha.strip():
+                        continue
+                    try:
+                        resposta = daemon.handle_command(json.loads(linha))
+                    except (ValueError, TypeError, AttributeError) as e:
+                        resposta = {"ok": False, "erro": f"pedido inválido: {e}"}
+                    self.wfile.write(json.dumps(resposta, ensure_ascii=False).encode("utf-8") + b"\n")
+
+        if os.path.exists(self.socket_path):
+            # Socket órfão de uma execução anterior; se outro daemon responde, não continua
+            try:
+                send_command(self.socket_path, {"cmd": "status"}, timeout_s=2)
+            except OSError:
+                os.remove(self.socket_path)
+            else:
+                raise RuntimeError(f"já existe um daemon ativo em {self.socket_path}")
+        servidor = socketserver.ThreadingUnixStreamServer(self.socket_path, _Handler)
+        servidor.daemon_threads = True
+        os.chmod(self.socket_path, 0o600) # Só o próprio usuário envia jobs
+        self._servidor = servidor
+        self._iniciar_thread(servidor.serve_forever, "daemon-socket")
+
+    def _iniciar_thread(self, alvo, nome: str) -> None:
+        thread = threading.Thread(target=alvo, name=nome, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    # --- Ciclo de Vida ---
+
+    def run(self) -> None:
+        """Sobe workers, socket e observação da pasta; bloqueia até shutdown, SIGTERM ou SIGINT."""
+        os.makedirs(self.opcoes_worker["images_output_dir"], exist_ok=True)
+        inicio = time.perf_counter()
+        _preload()
+        self._executor = self._novo_executor()
+        print(f"Bibliotecas e workers carregados em {time.perf_counter() - inicio:.1f} s.")
+
+        for sinal in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sinal, lambda *_: self._parar.set())
+        self._iniciar_socket()
+        indexador = threading.Thread(target=self._indexar, name="daemon-indice")
+        indexador.start()
+        self._iniciar_thread(self._despachar, "daemon-despacho")
+        print(f"Daemon ativo (pid {os.getpid()}): pasta '{self.input_dir}' "
+              f"({self.watcher.backend if self.watcher else 'desativada'}), socket '{self.socket_path}'.")
+        try:
+            self._observar()
+        finally:
+            self._encerrar(indexador)
+
+    def _encerrar(self, indexador: threading.Thread) -> None:
+        self._parar.set()
+        print("Encerrando: aguardando os documentos em processamento...")
+        if self._servidor is not None:
+            self._servidor.shutdown()
+            self._servidor.server_close()
+            try:
+                os.remove(self.socket_path)
+            except OSError:
+                pass
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._executor.shutdown(wait=True)
+        if self.watcher is not None:
+            self.watcher.close()
+        self._concluidos.put(None)
+        indexador.join()
+        restantes = self._fila.qsize()
+        if restantes:
+            # Sem saída gravada: a observação da pasta os encontra de novo na próxima partida
+            print(f"Alerta: {restantes} job(s) ainda na fila foram descartados.")
+        print(f"Daemon encerrado. {json.dumps(self.estatisticas, ensure_ascii=False)}")
+
+
+# --- Cliente ---
+
+def default_socket_path(output_dir: str) -> str:
+    return os.path.join(output_dir, "extraction_daemon.sock")
+
+def send_command(socket_path: str, comando: Dict[str, Any], timeout_s: float = 10.0) -> Dict[str, Any]:
+    """Envia um comando ao daemon e devolve a resposta (OSError se não há daemon no socket)."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conexao:
+        conexao.settimeout(timeout_s)
+        conexao.connect(socket_path)
+        conexao.sendall(json.dumps(comando, ensure_ascii=False).encode("utf-8") + b"\n")
+        with conexao.makefile("rb") as f:
+            linha = f.readline()
+    if not linha:
+        raise ConnectionError("daemon fechou a conexão sem responder")
+    return json.loads(linha)
+
+
+def _load_acronyms(path: Optional[str]) -> Dict[str, str]:
+    if not path:
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Alerta: Siglas não carregadas de '{path}' ({e}). A expansão não será realizada.")
+        return {}
+
+def main():
+    parser = argparse.ArgumentParser(description="Daemon de extração: pasta observada + socket Unix + workers aquecidos.")
+    parser.add_argument('--output-dir', default='data/output')
+    parser.add_argument('--socket', default=None, help="Padrão: <output-dir>/extraction_daemon.sock")
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    run = sub.add_parser('run', help="Inicia o daemon (primeiro plano)")
+    run.add_argument('--input-dir', default='data/input', help="Pasta observada ('' desativa)")
+    run.add_argument('--workers', type=int, default=2)
+    run.add_argument('--max-fila', type=int, default=64, help="Tamanho máximo da fila de jobs")
+    run.add_argument('--intervalo', type=float, default=2.0, help="Segundos entre varreduras sem inotify")
+    run.add_argument('--sem-inotify', action='store_true', help="Força a varredura periódica")
+    run.add_argument('--acronyms', default='data/acronyms.json')
+    run.add_argument('--raw-tables', default='unparsed-only', choices=['none', 'unparsed-only', 'all'])
+    run.add_argument('--timeout-tabelas', type=float, default=120, help="0 = Camelot no próprio worker, sem limite")
+    run.add_argument('--cache-raster-mb', type=float, default=1024, help="0 = sem cache de páginas rasterizadas")
+    run.add_argument('--sem-indice', action='store_true', help="Não atualiza o índice BM25 nem o SQLite")
+    run.add_argument('--sem-checkpoint', action='store_true', help="Não grava checkpoints por página")
+
+    enviar = sub.add_parser('submit', help="Enfileira PDFs no daemon em execução")
+    enviar.add_argument('pdfs', nargs='+')
+    enviar.add_argument('--prioridade', type=int, default=PRIORIDADE_SOCKET, help="Menor = antes")
+    consulta = sub.add_parser('status', help="Fila, jobs em execução e recentes")
+    consulta.add_argument('--job', default=None, help="Estado de um job específico")
+    sub.add_parser('stop', help="Encerra o daemon após os documentos em processamento")
+    args = parser.parse_args()
+
+    socket_path = args.socket or default_socket_path(args.output_dir)
+    if args.comando == 'run':
+        daemon = ExtractionDaemon(args.input_dir or None, args.output_dir, workers=args.workers,
+                                  socket_path=socket_path, max_fila=args.max_fila, intervalo_s=args.intervalo,
+                                  usar_inotify=not args.sem_inotify, acronyms=_load_acronyms(args.acronyms),
+                                  raw_tables_policy=args.raw_tables, timeout_tabelas_s=args.timeout_tabelas or None,
+                                  cache_raster_mb=args.cache_raster_mb or None, indexar=not args.sem_indice,
+                                  checkpoints=not args.sem_checkpoint)
+        daemon.run()
+        return
+
+    try:
+        if args.comando == 'submit':
+            respostas = [send_command(socket_path, {"cmd": "submit", "pdf": os.path.abspath(pdf),
+                                                    "prioridade": args.prioridade}) for pdf in args.pdfs]
+        elif args.comando == 'status':
+            comando = {"cmd": "job", "id": args.job} if args.job else {"cmd": "status"}
+            respostas = [send_command(socket_path, comando)]
+        else:
+            respostas = [send_command(socket_path, {"cmd": "shutdown"})]
+    except OSError as e:
+        print(f"Erro: nenhum daemon respondendo em '{socket_path}' ({e}).", file=sys.stderr)
+        sys.exit(1)
+    for resposta in respostas:
+        print(json.dumps(resposta, ensure_ascii=False, indent=2))
+    if not all(resposta.get("ok") for resposta in respostas):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+# src/horario_conflitos.py
+
+import heapq
+from typing import Dict, List, Any, Tuple
+
+try:
+    from src.horario_index import build_time_slots, format_hhmm, DIAS_SEMANA, normalize_key
+    from src.horario_parser import get_default_room
+except ImportError:
+    from .horario_index import build_time_slots, format_hhmm, DIAS_SEMANA, normalize_key
+    from .horario_parser import get_default_room
+
+# Intervalo máximo (minutos) entre duas aulas seguidas para considerá-las o mesmo bloco
+# (cobre o intervalo de 10 min entre aulas, mas não o almoço)
+INTERVALO_MAXIMO_BLOCO = 15
+
+TIPOS_CONFLITO = ("sala", "professor", "turma")
+
+
+# --- Preparação dos Eventos ---
+
+def fill_default_rooms(schedules: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Garante que aulas sem sala recebam a sala padrão de 'salas_info' (como em extract_schedule_from_page)."""
+    preenchidos = []
+    for schedule in schedules:
+        default_room = get_default_room(schedule.get("salas_info"))
+        if not default_room:
+            preenchidos.append(schedule)
+            continue
+        horario = []
+        for row in schedule.get("horario") or []:
+            new_row = {}
+            for key, value in row.items():
+                if isinstance(value, dict) and value.get("disciplina") and value.get("sala") is None:
+                    value = {**value, "sala": default_room}
+                new_row[key] = value
+            horario.append(new_row)
+        preenchidos.append({**schedule, "horario": horario})
+    return preenchidos
+
+def _mesclar_consecutivas(slots: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Une aulas seguidas da mesma disciplina/turma/sala em um único evento (1º+2º horário -> um bloco)."""
+    def identidade(s):
+        return (s["dia"], s["turma"], s["disciplina"], s["professor"], s["sala"])
+
+    eventos = []
+    ultimo_por_identidade: Dict[Tuple, Dict[str, Any]] = {}
+    for slot in sorted(slots, key=lambda s: (s["dia"], s["inicio"])):
+        chave = identidade(slot)
+        anterior = ultimo_por_identidade.get(chave)
+        if anterior is not None and 0 <= slot["inicio"] - anterior["fim"] <= INTERVALO_MAXIMO_BLOCO:
+            anterior["fim"] = max(anterior["fim"], slot["fim"])
+            continue
+        evento = dict(slot)
+        eventos.append(evento)
+        ultimo_por_identidade[chave] = evento
+    return eventos
+
+def _mesma_aula(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+    """Aula compartilhada entre turmas (mesma disciplina, professor e sala) não é conflito."""
+    return all(normalize_key(a.get(c)) == normalize_key(b.get(c)) for c in ("disciplina", "professor", "sala"))
+
+
+# --- Varredura (Sweep-Line) ---
+
+def _varrer(eventos: List[Dict[str, Any]], campo: str) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """
+    Ordena os eventos por (recurso, dia, inicio) e percorre uma única vez,
+    mantendo um heap com os eventos ainda ativos (ordenados pelo fim).
+    Custo O(n log n + k), k = número de pares em conflito.
+    """
+    chaveados = []
+    for i, evento in enumerate(eventos):
+        recurso = normalize_key(evento.get(campo))
+        if recurso:
+            chaveados.append((recurso, evento["dia"], evento["inicio"], evento["fim"], i))
+    chaveados.sort()
+
+    pares = []
+    ativos: List[Tuple[int, int]] = []  # (fim, índice do evento)
+    grupo_atual = None
+    for recurso, dia, inicio, fim, i in chaveados:
+        if (recurso, dia) != grupo_atual:
+            grupo_atual = (recurso, dia)
+            ativos = []
+        while ativos and ativos[0][0] <= inicio:
+            heapq.heappop(ativos)
+        for _, j in ativos:
+            if not _mesma_aula(eventos[i], eventos[j]):
+                pares.append((eventos[j], eventos[i]))
+        heapq.heappush(ativos, (fim, i))
+    return pares
+
+
+# --- Relatório ---
+
+def _resumir_aula(evento: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "turma": evento.get("turma"),
+        "disciplina": evento.get("disciplina"),
+        "professor": evento.get("professor"),
+        "sala": evento.get("sala"),
+        "inicio": format_hhmm(evento["inicio"]),
+        "fim": format_hhmm(evento["fim"]),
+        "pagina": evento.get("pagina"),
+    }
+
+def detect_schedule_conflicts(schedules: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Detecta conflitos de sala, professor e turma entre todos os horários de uma execução.
+
+    Args:
+        schedules: Horários processados (saída de extract_schedule_from_page ou
+                   metadata["schedules"] de um ou mais documentos).
+
+    Returns:
+        Um relatório compacto com o total de aulas analisadas, a contagem por
+        tipo e a lista de conflitos (recurso, dia, janela sobreposta e as duas aulas).
+    """
+    slots = build_time_slots(fill_default_rooms(schedules))
+    eventos = _mesclar_consecutivas(slots)
+
+    conflitos = []
+    contagem = {tipo: 0 for tipo in TIPOS_CONFLITO}
+    for tipo in TIPOS_CONFLITO:
+        for a, b in _varrer(eventos, tipo):
+            contagem[tipo] += 1
+            conflitos.append({
+                "tipo": tipo,
+                "recurso": a.get(tipo),
+                "dia": DIAS_SEMANA[a["dia"]],
+                "inicio": format_hhmm(max(a["inicio"], b["inicio"])),
+                "fim": format_hhmm(min(a["fim"], b["fim"])),
+                "aulas": [_resumir_aula(a), _resumir_aula(b)],
+            })
+
+    return {
+        "total_horarios": len(schedules),
+        "total_aulas": len(slots),
+        "total_eventos": len(eventos),
+        "conflitos_por_tipo": contagem,
+        "conflitos": conflitos,
+    }
+
+def detect_conflicts_in_documents(documentos: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Atalho para analisar vários documentos finais de uma vez (ex: todos os cursos do campus)."""
+    schedules = []
+    for documento in documentos:
+        schedules.extend(documento.get("metadata", {}).get("schedules", []))
+    return detect_schedule_conflicts(schedules)
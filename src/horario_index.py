@@ -0,0 +1,214 @@
+# src/horario_index.py
+
+import re
+from bisect import bisect_left
+from typing import Dict, Optional, List, Any, Tuple, Union
+
+try:
+    from src.text_normalization import remove_accents
+except ImportError:
+    from .text_normalization import remove_accents
+
+# Dias reconhecidos nos cabeçalhos das tabelas de horário (índice 0 = Segunda)
+DIAS_SEMANA = ["Segunda", "Terça", "Quarta", "Quinta", "Sexta", "Sábado"]
+
+# Nomes que a primeira coluna (faixa de horário) pode receber após o processamento
+COLUNAS_HORARIO = ["HorarioInfo", "Coluna_Vazia_0", "Horário"]
+
+# Ex: "1º Manhã \n07:20 – 8:10", "13:20 – \n14:10", "14h00 às 15h40"
+_faixa_pattern = re.compile(
+    r"(\d{1,2})\s*[:hH]\s*(\d{2})\s*(?:[-–—]|às|as|a)\s*(\d{1,2})\s*[:hH]\s*(\d{2})"
+)
+_hora_pattern = re.compile(r"^\s*(\d{1,2})\s*[:hH]\s*(\d{2})?\s*$")
+
+
+# --- Funções Auxiliares ---
+
+def normalize_key(value: Any) -> Optional[str]:
+    """Normaliza sala/turma/professor para comparação (caixa, espaços e traços)."""
+    if value is None:
+        return None
+    text = ' '.join(str(value).split()).casefold()
+    text = re.sub(r"\s*[-–—]\s*", "-", text)
+    return text if text else None
+
+def parse_hhmm(text: Union[str, int]) -> Optional[int]:
+    """Converte "14:00" / "14h" / "14h00" em minutos desde 00:00. Inteiros são aceitos como já convertidos."""
+    if isinstance(text, int):
+        return text
+    match = _hora_pattern.match(str(text))
+    if not match:
+        return None
+    hora, minuto = int(match.group(1)), int(match.group(2) or 0)
+    if hora > 23 or minuto > 59:
+        return None
+    return hora * 60 + minuto
+
+def format_hhmm(minutos: int) -> str:
+    """Converte minutos desde 00:00 de volta para "HH:MM"."""
+    return f"{minutos // 60:02d}:{minutos % 60:02d}"
+
+def parse_time_slot(text: Any) -> Optional[Tuple[int, int]]:
+    """Extrai (inicio, fim) em minutos de uma célula de faixa de horário. Retorna None para 'ALMOÇO' etc."""
+    if not isinstance(text, str):
+        return None
+    match = _faixa_pattern.search(text)
+    if not match:
+        return None
+    h1, m1, h2, m2 = (int(g) for g in match.groups())
+    inicio, fim = h1 * 60 + m1, h2 * 60 + m2
+    if fim <= inicio:
+        return None
+    return inicio, fim
+
+def dia_da_semana(nome: Union[str, int]) -> Optional[int]:
+    """Retorna o índice do dia (0 = Segunda) a partir do nome da coluna ("Terça", "terca-feira", ...)."""
+    if isinstance(nome, int):
+        return nome if 0 <= nome < len(DIAS_SEMANA) else None
+    texto = remove_accents(str(nome)).strip().lower()
+    for i, dia in enumerate(DIAS_SEMANA):
+        if texto.startswith(remove_accents(dia).lower()):
+            return i
+    return None
+
+
+# --- Conversão dos horários processados em intervalos ---
+
+def _faixa_da_linha(row: Dict[str, Any]) -> Optional[Tuple[int, int]]:
+    for col in COLUNAS_HORARIO:
+        if col in row:
+            return parse_time_slot(row[col])
+    # Fallback: primeira célula textual da linha (a coluna de horário é sempre a primeira)
+    for value in row.values():
+        if isinstance(value, str):
+            return parse_time_slot(value)
+    return None
+
+def build_time_slots(schedules: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Converte horários processados (saída de extract_schedule_from_page ou
+    metadata["schedules"] do documento final) em intervalos tipados.
+
+    Cada intervalo contém: dia (0 = Segunda), inicio e fim em minutos, turma,
+    disciplina, professor, sala e a página de origem.
+    """
+    slots = []
+    for schedule in schedules:
+        turma = schedule.get("turma")
+        pagina = schedule.get("pagina_origem", schedule.get("pagina"))
+        for row in schedule.get("horario") or []:
+            faixa = _faixa_da_linha(row)
+            if faixa is None:
+                continue
+            for col, aula in row.items():
+                if not isinstance(aula, dict) or not aula.get("disciplina"):
+                    continue
+                dia = dia_da_semana(col)
+                if dia is None:
+                    continue
+                slots.append({
+                    "dia": dia,
+                    "inicio": faixa[0],
+                    "fim": faixa[1],
+                    "turma": turma,
+                    "disciplina": aula.get("disciplina"),
+                    "professor": aula.get("professor"),
+                    "sala": aula.get("sala"),
+                    "pagina": pagina,
+                })
+    return slots
+
+
+# --- Índice de Intervalos ---
+
+class ScheduleIndex:
+    """
+    Índice de intervalos sobre os horários de todas as turmas.
+
+    Para cada dia (e para cada sala, turma e professor dentro do dia) mantém
+    os intervalos ordenados pelo início. Como a duração máxima de uma aula é
+    conhecida, uma consulta de sobreposição com [inicio, fim) só precisa
+    examinar os intervalos que começam em [inicio - duracao_max, fim), que são
+    localizados com bisect: O(log n + k).
+    """
+
+    CAMPOS = ("sala", "turma", "professor")
+
+    def __init__(self, slots: List[Dict[str, Any]]):
+        self.slots = sorted(slots, key=lambda s: (s["dia"], s["inicio"], s["fim"]))
+        # (campo, valor normalizado, dia) -> (inícios ordenados, intervalos, duração máxima)
+        self._grupos: Dict[Tuple[Optional[str], Optional[str], int], Tuple[List[int], List[Dict[str, Any]], int]] = {}
+        self._valores: Dict[str, Dict[str, str]] = {campo: {} for campo in self.CAMPOS}
+
+        for slot in self.slots:
+            chaves = [(None, None)]
+            for campo in self.CAMPOS:
+                valor = normalize_key(slot.get(campo))
+                if valor:
+                    self._valores[campo].setdefault(valor, ' '.join(str(slot[campo]).split()))
+                    chaves.append((campo, valor))
+            for campo, valor in chaves:
+                inicios, grupo, duracao = self._grupos.get((campo, valor, slot["dia"]), ([], [], 0))
+                inicios.append(slot["inicio"])
+                grupo.append(slot)
+                self._grupos[(campo, valor, slot["dia"])] = (inicios, grupo, max(duracao, slot["fim"] - slot["inicio"]))
+
+    @classmethod
+    def from_document(cls, documento: Dict[str, Any]) -> "ScheduleIndex":
+        """Constrói o índice a partir do documento final (usa metadata["schedules"])."""
+        schedules = documento.get("metadata", {}).get("schedules", [])
+        return cls(build_time_slots(schedules))
+
+    def salas(self) -> List[str]:
+        return sorted(self._valores["sala"].values())
+
+    def turmas(self) -> List[str]:
+        return sorted(self._valores["turma"].values())
+
+    def professores(self) -> List[str]:
+        return sorted(self._valores["professor"].values())
+
+    def ocupacoes(self, dia: Union[str, int], inicio: Union[str, int], fim: Union[str, int],
+                  sala: Optional[str] = None, turma: Optional[str] = None,
+                  professor: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Retorna as aulas que se sobrepõem a [inicio, fim) no dia, opcionalmente filtradas por sala/turma/professor."""
+        dia_idx = dia_da_semana(dia)
+        inicio_min, fim_min = parse_hhmm(inicio), parse_hhmm(fim)
+        if dia_idx is None or inicio_min is None or fim_min is None:
+            raise ValueError(f"Consulta inválida: dia={dia!r}, inicio={inicio!r}, fim={fim!r}")
+
+        # Usa o grupo mais seletivo disponível; os demais filtros são aplicados sobre o resultado
+        filtros = {campo: normalize_key(v) for campo, v in
+                   (("sala", sala), ("turma", turma), ("professor", professor)) if v}
+        campo, valor = next(iter(filtros.items()), (None, None))
+        grupo = self._grupos.get((campo, valor, dia_idx))
+        if grupo is None:
+            return []
+
+        inicios, intervalos, duracao = grupo
+        lo = bisect_left(inicios, inicio_min - duracao + 1)
+        hi = bisect_left(inicios, fim_min)
+        resultado = []
+        for slot in intervalos[lo:hi]:
+            if slot["fim"] <= inicio_min:
+                continue
+            if all(normalize_key(slot.get(c)) == v for c, v in filtros.items()):
+                resultado.append(slot)
+        return resultado
+
+    def em_andamento(self, dia: Union[str, int], momento: Union[str, int], **filtros) -> List[Dict[str, Any]]:
+        """Aulas acontecendo no instante `momento` (ex: "14:30")."""
+        minuto = parse_hhmm(momento)
+        if minuto is None:
+            raise ValueError(f"Horário inválido: {momento!r}")
+        return self.ocupacoes(dia, minuto, minuto + 1, **filtros)
+
+    def salas_livres(self, dia: Union[str, int], inicio: Union[str, int], fim: Union[str, int]) -> List[str]:
+        """Salas conhecidas (presentes em algum horário) sem aula em [inicio, fim) no dia."""
+        ocupadas = {normalize_key(s.get("sala")) for s in self.ocupacoes(dia, inicio, fim)}
+        return sorted(nome for chave, nome in self._valores["sala"].items() if chave not in ocupadas)
+
+    def aula_da_turma(self, turma: str, dia: Union[str, int], momento: Union[str, int]) -> Optional[Dict[str, Any]]:
+        """Aula da turma no instante informado, ou None se estiver livre."""
+        aulas = self.em_andamento(dia, momento, turma=turma)
+        return aulas[0] if aulas else None
@@ -1,12 +1,24 @@
 # src/horario_parser.py
 
-import fitz  # PyMuPDF
+from __future__ import annotations
+
 import re
 from typing import Dict, Optional, List, Any
-import pandas as pd
-import camelot
 import os # Importado para basename em get_raw_tables_from_page
 
+try:
+    from src.instrumentation import timed
+    from src.table_extractor import active_isolated_extractor, read_pdf_page
+    from src.lazy import lazy_module
+except ImportError:
+    from .instrumentation import timed
+    from .table_extractor import active_isolated_extractor, read_pdf_page
+    from .lazy import lazy_module
+
+# Dependências pesadas carregadas só no primeiro uso (ver src/lazy.py)
+fitz = lazy_module("fitz")  # PyMuPDF
+pd = lazy_module("pandas")
+
 
 # NOVO: Função para extrair a sala padrão de 'salas_info'
 def get_default_room(salas_info_text: Optional[str]) -> Optional[str]:
@@ -61,14 +73,19 @@ def extract_horario_metadata(page: fitz.Page) -> Dict[str, Optional[str]]:
              break
     return metadata
 
+@timed()
 def get_raw_tables_from_page(pdf_path: str, page_num: int) -> List[pd.DataFrame]:
     """Extrai todas as tabelas brutas de uma página usando Camelot (lattice)."""
+    extrator = active_isolated_extractor()
+    if extrator is not None:
+        # Extração isolada: limite de tempo por página e cadeia de fallback (src/table_worker.py)
+        return extrator.extract(pdf_path, page_num, flavor='lattice', line_scale=40)
     tables_found = []
     try:
         # line_scale ajuda a detectar linhas finas. edge_tol ajusta a tolerância das bordas.
-        tables = camelot.read_pdf(
+        tables = read_pdf_page(
             pdf_path,
-            pages=str(page_num),
+            page_num,
             flavor='lattice',
             line_scale=40, # Pode precisar ajustar
             # edge_tol=500 # Descomente e ajuste se colunas estiverem sendo mescladas
@@ -163,6 +180,7 @@ def parse_cell_content(cell_text: str) -> Dict[str, Optional[str]]:
 # O resto do arquivo (get_default_room, process_horario_df, etc.) permanece igual
 # ...
 
+@timed()
 def process_horario_df(raw_df: pd.DataFrame) -> Optional[pd.DataFrame]:
     """Limpa, estrutura e parseia um DataFrame bruto de horário."""
     if raw_df.empty:
@@ -233,6 +251,7 @@ def process_horario_df(raw_df: pd.DataFrame) -> Optional[pd.DataFrame]:
     return df.reset_index(drop=True)
 
 
+@timed()
 def extract_schedule_from_page(pdf_path: str, page_num: int) -> Optional[Dict[str, Any]]:
     """Função principal: Orquestra a extração e preenche salas vazias."""
     print(f"\n--- Processando Página {page_num} ---")
@@ -1,7 +1,18 @@
-import fitz # PyMuPDF
+from __future__ import annotations
+
 import os
 from typing import List, Dict, Any
 
+try:
+    from src.instrumentation import timed
+    from src.lazy import lazy_module
+except ImportError:
+    from .instrumentation import timed
+    from .lazy import lazy_module
+
+fitz = lazy_module("fitz")  # PyMuPDF, carregado só no primeiro uso
+
+@timed()
 def extract_images_from_pdf(pdf_path: str, page_number_1_indexed: int, output_dir: str) -> List[Dict]:
     """
     Extrai imagens de uma página específica de um PDF e as salva em um diretório.
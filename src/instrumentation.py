@@ -0,0 +1,229 @@
+# src/instrumentation.py
+
+import contextlib
+import functools
+import json
+import time
+import tracemalloc
+from typing import Dict, Any, Optional, List, Callable, Tuple
+
+# Contexto reutilizado quando a instrumentação está desligada (nenhuma alocação por chamada)
+_NULO = contextlib.nullcontext()
+
+
+def _funcoes_memoria() -> Tuple[Callable[[], float], Callable[[], float]]:
+    """(rss_mb, peak_rss_mb) de src/memory, importado só quando a medição de memória é ligada."""
+    try:
+        from src.memory import rss_mb, peak_rss_mb
+    except ImportError:
+        from .memory import rss_mb, peak_rss_mb
+    return rss_mb, peak_rss_mb
+
+def _percentil(valores: List[float], p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+def _resumo(duracoes: List[float]) -> Dict[str, Any]:
+    """Estatísticas de uma etapa (durações em segundos -> ms no relatório)."""
+    return {
+        "chamadas": len(duracoes),
+        "total_s": round(sum(duracoes), 4),
+        "p50_ms": round(_percentil(duracoes, 50) * 1000, 3),
+        "p95_ms": round(_percentil(duracoes, 95) * 1000, 3),
+        "max_ms": round(max(duracoes) * 1000, 3),
+    }
+
+
+def _mb(n_bytes: float) -> float:
+    return round(n_bytes / 2**20, 2)
+
+
+class _Cronometro:
+    __slots__ = ("profiler", "nome", "inicio", "alocado")
+
+    def __init__(self, profiler: "Profiler", nome: str):
+        self.profiler = profiler
+        self.nome = nome
+
+    def __enter__(self):
+        if self.profiler.memoria:
+            self.alocado = tracemalloc.get_traced_memory()[0]
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.nome, time.perf_counter() - self.inicio)
+        if self.profiler.memoria:
+            self.profiler.record_memory(self.nome, tracemalloc.get_traced_memory()[0] - self.alocado)
+        return False
+
+
+class Profiler:
+    """
+    Cronômetros por etapa do pipeline, agregados por execução, documento e página.
+
+    Desligado, stage() devolve um nullcontext compartilhado e as funções
+    decoradas com @timed fazem só um teste de atributo antes de chamar a
+    função original. As durações são inclusivas: parse_ppc_page inclui o
+    tempo de get_raw_tables_from_page chamado dentro dela.
+
+    Com enable_memory(), também registra (via tracemalloc e RSS) o saldo de
+    alocações de cada etapa, o pico de alocações e o RSS de cada página e
+    as linhas que mais alocaram em cada documento. O tracemalloc deixa o
+    Python bem mais lento, então é opcional.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.memoria = False
+        self._rss_mb = self._peak_rss_mb = None
+        self.reset()
+
+    def enable_memory(self, frames: int = 1) -> None:
+        self.enabled = self.memoria = True
+        if self._rss_mb is None:
+            self._rss_mb, self._peak_rss_mb = _funcoes_memoria()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def disable_memory(self) -> None:
+        self.memoria = False
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def reset(self) -> None:
+        self._duracoes: Dict[str, List[float]] = {}
+        self._documentos: Dict[str, Dict[str, Any]] = {}
+        self._paginas: Dict[str, List[Dict[str, Any]]] = {}
+        self._alocacoes: Dict[str, List[float]] = {}
+        self._documento: Optional[str] = None
+        self._pagina: Optional[Dict[str, Any]] = None
+        self._inicio = time.time()
+
+    # --- Coleta ---
+
+    def record(self, nome: str, segundos: float) -> None:
+        self._duracoes.setdefault(nome, []).append(segundos)
+        if self._documento is not None:
+            etapas = self._documentos[self._documento]["etapas"]
+            etapas[nome] = etapas.get(nome, 0.0) + segundos
+        if self._pagina is not None:
+            etapas = self._pagina["etapas"]
+            etapas[nome] = etapas.get(nome, 0.0) + segundos
+
+    def record_memory(self, nome: str, saldo_bytes: float) -> None:
+        self._alocacoes.setdefault(nome, []).append(saldo_bytes)
+
+    def stage(self, nome: str):
+        """Context manager que cronometra um trecho: `with profiler.stage("normalize_text"): ...`"""
+        if not self.enabled:
+            return _NULO
+        return _Cronometro(self, nome)
+
+    @contextlib.contextmanager
+    def document(self, doc_id: str):
+        """Agrupa as etapas seguintes no documento `doc_id`."""
+        if not self.enabled:
+            yield
+            return
+        self._documento = doc_id
+        self._documentos[doc_id] = {"paginas": 0, "etapas": {}}
+        self._paginas[doc_id] = []
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._documentos[doc_id]["duracao_s"] = time.perf_counter() - inicio
+            if self.memoria:
+                estatisticas = tracemalloc.take_snapshot().statistics('lineno')[:10]
+                self._documentos[doc_id]["maiores_alocacoes"] = [
+                    {"local": str(e.traceback), "mb": _mb(e.size), "blocos": e.count} for e in estatisticas]
+            self.record("documento", self._documentos[doc_id]["duracao_s"])
+            self._documento = None
+
+    @contextlib.contextmanager
+    def page(self, page_num: int):
+        """Agrupa as etapas seguintes na página `page_num` do documento atual."""
+        if not self.enabled:
+            yield
+            return
+        self._pagina = {"pagina": page_num, "etapas": {}}
+        if self.memoria:
+            tracemalloc.reset_peak()
+            rss_inicio = self._rss_mb()
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            pagina, self._pagina = self._pagina, None
+            pagina["duracao_s"] = time.perf_counter() - inicio
+            if self.memoria:
+                rss_fim = self._rss_mb()
+                pagina["memoria"] = {"pico_tracemalloc_mb": _mb(tracemalloc.get_traced_memory()[1]),
+                                     "rss_mb": round(rss_fim, 1), "delta_rss_mb": round(rss_fim - rss_inicio, 1)}
+            self.record("pagina", pagina["duracao_s"])
+            if self._documento is not None:
+                self._paginas[self._documento].append(pagina)
+                self._documentos[self._documento]["paginas"] += 1
+
+    # --- Relatório ---
+
+    def report(self) -> Dict[str, Any]:
+        documentos = {}
+        for doc_id, info in self._documentos.items():
+            duracao = info.get("duracao_s", 0.0)
+            documentos[doc_id] = {
+                "duracao_s": round(duracao, 4),
+                "paginas": info["paginas"],
+                "paginas_por_s": round(info["paginas"] / duracao, 3) if duracao else None,
+                "etapas_s": {nome: round(s, 4) for nome, s in sorted(info["etapas"].items(), key=lambda x: -x[1])},
+                "por_pagina": [{"pagina": p["pagina"], "duracao_ms": round(p["duracao_s"] * 1000, 2),
+                                "etapas_ms": {nome: round(s * 1000, 2) for nome, s in p["etapas"].items()},
+                                **({"memoria": p["memoria"]} if "memoria" in p else {})}
+                               for p in self._paginas.get(doc_id, [])],
+            }
+            if "maiores_alocacoes" in info:
+                documentos[doc_id]["maiores_alocacoes"] = info["maiores_alocacoes"]
+        relatorio = {
+            "inicio": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self._inicio)),
+            "duracao_total_s": round(time.time() - self._inicio, 3),
+            "etapas": {nome: _resumo(d) for nome, d in sorted(self._duracoes.items(), key=lambda x: -sum(x[1]))},
+            "documentos": documentos,
+        }
+        if self._alocacoes:
+            relatorio["memoria"] = {
+                "pico_rss_mb": round(self._peak_rss_mb(), 1),
+                "pico_tracemalloc_mb": _mb(tracemalloc.get_traced_memory()[1]) if tracemalloc.is_tracing() else None,
+                # Saldo de alocações (alocado - liberado) ao fim de cada chamada da etapa
+                "saldo_por_etapa_mb": {nome: {"p50": _mb(_percentil(v, 50)), "p95": _mb(_percentil(v, 95)),
+                                              "max": _mb(max(v))} for nome, v in self._alocacoes.items()},
+            }
+        return relatorio
+
+    def write_report(self, path: str, extras: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Grava o relatório em JSON. `extras` são seções adicionais (ex: eventos do orçamento de memória)."""
+        relatorio = {**self.report(), **(extras or {})}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(relatorio, f, ensure_ascii=False, indent=2)
+        return relatorio
+
+
+# Instância global usada pelos decoradores dos módulos do pipeline
+PROFILER = Profiler()
+
+def stage(nome: str):
+    return PROFILER.stage(nome)
+
+def timed(nome: Optional[str] = None) -> Callable:
+    """Decorador: registra a duração de cada chamada em PROFILER sob `nome` (padrão: nome da função)."""
+    def decorador(func: Callable) -> Callable:
+        etapa = nome or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return func(*args, **kwargs)
+            with _Cronometro(PROFILER, etapa):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorador
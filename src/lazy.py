@@ -0,0 +1,46 @@
+# src/lazy.py
+
+import importlib
+from typing import Any
+
+
+class LazyModule:
+    """
+    Módulo importado só no primeiro acesso a um atributo.
+
+    `pd = lazy_module("pandas")` no topo de um arquivo mantém o código usando
+    `pd.DataFrame`, `camelot.read_pdf`, `fitz.open` etc., mas a importação
+    (segundos, no caso do Camelot com OpenCV e matplotlib) só acontece quando
+    uma função que precisa dela é chamada. Atributos já lidos ficam em cache
+    na instância, então o custo depois do primeiro acesso é o de um atributo
+    comum. Os módulos que usam isto importam `annotations` de __future__ para
+    que as anotações de tipo (pd.DataFrame, fitz.Page) não forcem a importação.
+
+    O estado interno usa nomes que nenhum módulo exporta e a classe não tem
+    métodos públicos: qualquer atributo (inclusive np.load, json.load) é o do
+    módulo real. Para forçar a importação, use load_module(proxy).
+    """
+
+    def __init__(self, nome: str):
+        self.__dict__["_lazy_nome"] = nome
+        self.__dict__["_lazy_modulo"] = None
+
+    def __getattr__(self, atributo: str) -> Any:
+        valor = getattr(load_module(self), atributo)
+        self.__dict__[atributo] = valor
+        return valor
+
+    def __repr__(self) -> str:
+        estado = "carregado" if self.__dict__["_lazy_modulo"] is not None else "não carregado"
+        return f"<LazyModule '{self.__dict__['_lazy_nome']}' ({estado})>"
+
+
+def lazy_module(nome: str) -> LazyModule:
+    return LazyModule(nome)
+
+def load_module(proxy: LazyModule):
+    """Importa o módulo do proxy (se ainda não importado) e o devolve."""
+    estado = proxy.__dict__
+    if estado["_lazy_modulo"] is None:
+        estado["_lazy_modulo"] = importlib.import_module(estado["_lazy_nome"])
+    return estado["_lazy_modulo"]
@@ -0,0 +1,117 @@
+# src/memory.py
+
+import ctypes
+import gc
+import os
+import sys
+import time
+from typing import Dict, Any, Optional, List, Callable, Tuple
+
+try:
+    import resource  # Só existe em Unix; no Windows os contadores vêm da psapi
+except ImportError:
+    resource = None
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+# --- Medição ---
+
+def _working_set_windows() -> Tuple[float, float]:
+    """(working set atual, pico do working set) do processo em MB, via GetProcessMemoryInfo."""
+    from ctypes import wintypes
+
+    class _ContadoresMemoria(ctypes.Structure):  # PROCESS_MEMORY_COUNTERS
+        _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+    kernel32, psapi = ctypes.WinDLL("kernel32"), ctypes.WinDLL("psapi")
+    kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+    psapi.GetProcessMemoryInfo.argtypes = [wintypes.HANDLE, ctypes.POINTER(_ContadoresMemoria), wintypes.DWORD]
+    contadores = _ContadoresMemoria()
+    contadores.cb = ctypes.sizeof(contadores)
+    if not psapi.GetProcessMemoryInfo(kernel32.GetCurrentProcess(), ctypes.byref(contadores), contadores.cb):
+        return 0.0, 0.0
+    return contadores.WorkingSetSize / 2**20, contadores.PeakWorkingSetSize / 2**20
+
+def rss_mb() -> float:
+    """
+    Memória residente atual do processo (MB). Usa /proc no Linux, o working
+    set no Windows e, nos demais sistemas, o pico (ru_maxrss).
+    """
+    if sys.platform == "win32":
+        return _working_set_windows()[0]
+    try:
+        with open("/proc/self/statm", 'rb') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE / 2**20
+    except (OSError, IndexError, ValueError):
+        return peak_rss_mb()
+
+def peak_rss_mb() -> float:
+    """Pico de memória residente do processo desde o início (MB; 0.0 se o sistema não informa)."""
+    if sys.platform == "win32":
+        return _working_set_windows()[1]
+    if resource is None:
+        return 0.0
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / 2**20 if sys.platform == "darwin" else pico / 1024 # bytes no macOS, KB no Linux
+
+def release_memory() -> None:
+    """Coleta ciclos e devolve ao sistema as páginas livres do heap (malloc_trim, só na glibc do Linux)."""
+    gc.collect()
+    if not sys.platform.startswith("linux"):
+        return
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass  # Linux sem glibc (ex: musl)
+
+
+# --- Orçamento de Memória ---
+
+class MemoryBudget:
+    """
+    Orçamento de memória de um processo (worker ou o próprio pipeline).
+
+    check() compara o RSS atual com o limite. Se passar, executa as rotinas
+    de limpeza registradas (caches, estado intermediário) e release_memory();
+    se ainda assim continuar acima, devolve "excedido" e o chamador deve
+    reciclar o worker (terminar o processo e iniciar outro).
+    """
+
+    OK, LIBERADO, EXCEDIDO = "ok", "liberado", "excedido"
+
+    def __init__(self, limite_mb: float):
+        self.limite_mb = limite_mb
+        self._limpezas: Dict[str, Callable[[], Any]] = {}
+        self.eventos: List[Dict[str, Any]] = []
+
+    def register_cleanup(self, nome: str, funcao: Callable[[], Any]) -> None:
+        """Registra uma rotina que descarta estado em cache (ex: cache de páginas rasterizadas)."""
+        self._limpezas[nome] = funcao
+
+    def check(self, contexto: Optional[str] = None) -> str:
+        antes = rss_mb()
+        if antes <= self.limite_mb:
+            return self.OK
+
+        for nome, funcao in self._limpezas.items():
+            try:
+                funcao()
+            except Exception as e:
+                print(f"Alerta MEMORIA: Falha na limpeza '{nome}': {e}")
+        release_memory()
+        depois = rss_mb()
+
+        resultado = self.LIBERADO if depois <= self.limite_mb else self.EXCEDIDO
+        self.eventos.append({"momento": round(time.time(), 3), "contexto": contexto, "resultado": resultado,
+                             "rss_antes_mb": round(antes, 1), "rss_depois_mb": round(depois, 1)})
+        print(f"Alerta MEMORIA: RSS {antes:.0f} MB acima do orçamento de {self.limite_mb:.0f} MB "
+              f"({contexto or 'sem contexto'}); após limpeza: {depois:.0f} MB ({resultado}).")
+        return resultado
+
+    def report(self) -> Dict[str, Any]:
+        return {"limite_mb": self.limite_mb, "pico_rss_mb": round(peak_rss_mb(), 1), "eventos": self.eventos}
@@ -1,5 +1,11 @@
 from typing import List, Dict
 
+try:
+    from src.instrumentation import timed
+except ImportError:
+    from .instrumentation import timed
+
+@timed()
 def enrich_with_metadata(chunks: List[Dict], metadata: Dict) -> List[Dict]:
     """
     Adiciona um conjunto de metadados a cada bloco de texto em uma lista.
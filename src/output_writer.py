@@ -0,0 +1,172 @@
+# src/output_writer.py
+
+import json
+import os
+from typing import Dict, Any, Optional, List, Tuple
+
+try:
+    from src.serializer import JsonSerializer, get_serializer, open_output, compression_of, COMPRESSOES
+    from src.instrumentation import timed
+except ImportError:
+    from .serializer import JsonSerializer, get_serializer, open_output, compression_of, COMPRESSOES
+    from .instrumentation import timed
+
+# Extensão do índice lateral gravado ao lado de cada <nome>.pdf.jsonl
+SIDECAR_EXT = ".idx.json"
+
+# Listas do documento final indexadas elemento a elemento (tipo do registro, campo usado
+# como id; None = posição). As demais chaves, listas inclusive (ex: raw_string_table),
+# viram um único registro.
+_CHAVES_LISTA = {"page_specific_data": ("page", "page"), "content_chunks": ("chunk", None)}
+
+
+def sidecar_path(output_path: str) -> str:
+    return output_path + SIDECAR_EXT
+
+def _remove_stale_outputs(output_path: str) -> None:
+    """
+    Apaga as saídas do mesmo documento com outra compressão (ex: o .jsonl
+    antigo depois de passar a gravar .jsonl.gz) e os índices laterais que não
+    correspondem mais à saída atual, para nenhum leitor abrir dados velhos.
+    """
+    compressao = compression_of(output_path)
+    base = output_path[:-len(compressao)] if compressao else output_path
+    obsoletos = [base + ext for ext in COMPRESSOES if base + ext != output_path]
+    obsoletos += [sidecar_path(p) for p in obsoletos]
+    if compressao:
+        obsoletos.append(sidecar_path(output_path))
+    for path in obsoletos:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+# --- Escrita ---
+
+def _indentar(dados: bytes, nivel: int) -> bytes:
+    # O JSON escapa quebras de linha dentro de strings, então toda "\n" é estrutural
+    return dados.replace(b"\n", b"\n" + b"  " * nivel)
+
+@timed()
+def write_document(output_path: str, documento: Dict[str, Any], indent: bool = False,
+                   serializer: Optional[JsonSerializer] = None) -> Optional[Dict[str, Any]]:
+    """
+    Grava o documento final em partes (sem montar o JSON inteiro em memória)
+    e, ao mesmo tempo, o índice lateral <output_path>.idx.json com
+    offset/tamanho em bytes de cada registro: metadata, cada página de
+    page_specific_data (por número da página) e cada chunk de content_chunks
+    (por posição).
+
+    Args:
+        indent: True reproduz o layout de json.dumps(indent=2); False grava
+                compacto (uma linha, ~3x menor).
+        serializer: Ver src/serializer.py (padrão: o mais rápido instalado).
+
+    Saídas .gz/.zst são comprimidas conforme a extensão; nesse caso não há
+    índice lateral (offsets não permitem seek em stream comprimido) e o
+    retorno é None. Saídas do mesmo documento com outra compressão, e seus
+    índices laterais, são apagadas depois da gravação.
+
+    Cada registro indexado é um JSON válido por si só, então o leitor só
+    precisa de seek + read + loads.
+    """
+    serializer = serializer or get_serializer()
+    nova_linha, separador = (b"\n", b": ") if indent else (b"", b":")
+    registros: List[Dict[str, Any]] = []
+    offset = 0
+    with open_output(output_path) as f:
+        def escrever(dados: bytes) -> Tuple[int, int]:
+            nonlocal offset
+            f.write(dados)
+            inicio = offset
+            offset += len(dados)
+            return inicio, len(dados)
+
+        def valor(obj: Any, nivel: int) -> bytes:
+            dados = serializer.dumps(obj, indent)
+            return _indentar(dados, nivel) if indent else dados
+
+        escrever(b"{")
+        for i, (chave, conteudo) in enumerate(documento.items()):
+            escrever((b"," if i else b"") + nova_linha + (b"  " if indent else b"") + serializer.dumps(chave) + separador)
+            if chave in _CHAVES_LISTA and isinstance(conteudo, list) and conteudo:
+                tipo, campo = _CHAVES_LISTA[chave]
+                escrever(b"[")
+                for j, item in enumerate(conteudo):
+                    escrever((b"," if j else b"") + nova_linha + (b"    " if indent else b""))
+                    inicio, tamanho = escrever(valor(item, 2))
+                    id_registro = item.get(campo) if campo and isinstance(item, dict) else j
+                    registros.append({"tipo": tipo, "id": id_registro, "offset": inicio, "length": tamanho})
+                escrever(nova_linha + (b"  ]" if indent else b"]"))
+            else:
+                inicio, tamanho = escrever(valor(conteudo, 1))
+                registros.append({"tipo": chave, "id": None, "offset": inicio, "length": tamanho})
+        escrever((nova_linha if documento else b"") + b"}")
+
+    _remove_stale_outputs(output_path)
+    if compression_of(output_path):
+        return None
+    indice = {"arquivo": os.path.basename(output_path), "tamanho": offset, "registros": registros}
+    with open(sidecar_path(output_path), 'w', encoding='utf-8') as f:
+        json.dump(indice, f, ensure_ascii=False)
+    return indice
+
+
+# --- Leitura ---
+
+class OutputReader:
+    """
+    Acesso direto a registros de um arquivo de saída via índice lateral:
+    reader.page(57) faz um seek e lê só os bytes da página.
+    Se o índice não existir ou estiver desatualizado (tamanho diferente do
+    arquivo), levanta ValueError; reescreva a saída com write_document.
+    """
+
+    def __init__(self, output_path: str):
+        self.output_path = output_path
+        with open(sidecar_path(output_path), 'r', encoding='utf-8') as f:
+            indice = json.load(f)
+        if indice["tamanho"] != os.path.getsize(output_path):
+            raise ValueError(f"Índice lateral desatualizado para '{output_path}'.")
+        self._registros: Dict[Tuple[str, Any], Tuple[int, int]] = {}
+        for registro in indice["registros"]:
+            # Em páginas repetidas, vale a primeira ocorrência
+            self._registros.setdefault((registro["tipo"], registro["id"]), (registro["offset"], registro["length"]))
+        self._arquivo = open(output_path, 'rb')
+        self._serializer = get_serializer()
+
+    def close(self) -> None:
+        self._arquivo.close()
+
+    def __enter__(self) -> "OutputReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def ids(self, tipo: str) -> List[Any]:
+        return [i for t, i in self._registros if t == tipo]
+
+    def read_raw(self, tipo: str, id_registro: Any = None) -> Optional[bytes]:
+        posicao = self._registros.get((tipo, id_registro))
+        if posicao is None:
+            return None
+        self._arquivo.seek(posicao[0])
+        return self._arquivo.read(posicao[1])
+
+    def read(self, tipo: str, id_registro: Any = None) -> Optional[Any]:
+        dados = self.read_raw(tipo, id_registro)
+        return None if dados is None else self._serializer.loads(dados)
+
+    def metadata(self) -> Optional[Dict[str, Any]]:
+        return self.read("metadata")
+
+    def page(self, page_num: int) -> Optional[Dict[str, Any]]:
+        return self.read("page", page_num)
+
+    def chunk(self, chunk_idx: int) -> Optional[Dict[str, Any]]:
+        return self.read("chunk", chunk_idx)
+
+def read_page(output_path: str, page_num: int) -> Optional[Dict[str, Any]]:
+    """Atalho: page_specific_data de uma página sem carregar o arquivo inteiro."""
+    with OutputReader(output_path) as reader:
+        return reader.page(page_num)
@@ -0,0 +1,105 @@
+# src/page_router.py
+
+from typing import Dict, Any, Optional, List
+
+try:
+    from src.document_classifier import MIN_LINHAS_GRADE
+except ImportError:
+    from .document_classifier import MIN_LINHAS_GRADE
+
+# Uma célula do Camelot lattice precisa de 4 lados: abaixo disso a página não tem tabela a extrair
+MIN_LINHAS_TABELA = 4
+# Imagem a partir da qual a página pode ser uma tabela escaneada (ex: 1831x1244 na
+# pág. 32 do PPCBCC2019); logotipos de cabeçalho ficam bem abaixo (402x231)
+MIN_PIXELS_IMAGEM_TABELA = 500_000
+
+# Rota usada quando nenhuma regra casa: página com linhas desenhadas, processada
+# pelo caminho padrão do tipo do documento
+ROTA_PADRAO = "tabela_generica"
+
+
+# --- Registro de Rotas por Página ---
+# Cada rota declara regras alternativas sobre page_features (src/document_classifier)
+# (basta uma casar), no mesmo formato do registro de parsers de tabela do PPC:
+#   "todas":   todas estas palavras no texto da página (minúsculas)
+#   "alguma":  ao menos uma destas palavras
+#   "nenhuma": nenhuma destas palavras
+#   "min_linhas_regua" / "max_linhas_regua": limites de linhas de régua desenhadas
+#   "max_pixels_imagem": limite de pixels da maior imagem da página
+# e o processamento que a página recebe no pipeline:
+#   "texto":    nenhuma extração de tabelas (o texto já vai para os content_chunks)
+#   "schedule": horario_parser.extract_schedule_from_page
+#   "ppc":      ppc_parser.parse_ppc_page
+#   None:       o processamento do tipo do documento
+# Rotas "ppc" podem restringir os tipos de tabela (registro de ppc_parser) que as
+# tabelas da página podem receber: classify_table só testa esses parsers.
+# A ordem de registro define a prioridade: a primeira rota que casar vence.
+
+_PAGE_ROUTES: List[Dict[str, Any]] = []
+
+def register_page_route(nome: str, regras: List[Dict[str, Any]], processamento: Optional[str],
+                        tipos_tabela: Optional[List[str]] = None) -> None:
+    """Registra uma rota de página (ver comentário acima). `tipos_tabela` None = todos os tipos."""
+    _PAGE_ROUTES.append({"nome": nome, "regras": regras, "processamento": processamento,
+                         "tipos_tabela": tipos_tabela})
+
+def page_routes() -> List[str]:
+    return [rota["nome"] for rota in _PAGE_ROUTES] + [ROTA_PADRAO]
+
+def route_processing(nome: str) -> Optional[str]:
+    """Processamento da rota `nome` (None = o do tipo do documento)."""
+    for rota in _PAGE_ROUTES:
+        if rota["nome"] == nome:
+            return rota["processamento"]
+    return None
+
+def route_table_types(nome: str) -> Optional[List[str]]:
+    """Tipos de tabela de PPC aceitos na rota `nome` (None = todos os registrados)."""
+    for rota in _PAGE_ROUTES:
+        if rota["nome"] == nome:
+            return rota["tipos_tabela"]
+    return None
+
+def _regra_casa(regra: Dict[str, Any], features: Dict[str, Any]) -> bool:
+    texto = features["texto"]
+    linhas = features["linhas_regua"]
+    if linhas < regra.get("min_linhas_regua", 0):
+        return False
+    if "max_linhas_regua" in regra and linhas > regra["max_linhas_regua"]:
+        return False
+    if "max_pixels_imagem" in regra and features.get("maior_imagem_px", 0) > regra["max_pixels_imagem"]:
+        return False
+    if not all(kw in texto for kw in regra.get("todas", ())):
+        return False
+    if regra.get("alguma") and not any(kw in texto for kw in regra["alguma"]):
+        return False
+    return not any(kw in texto for kw in regra.get("nenhuma", ()))
+
+def route_page(features: Dict[str, Any]) -> str:
+    """Nome da rota da página a partir de page_features (sem Camelot; microssegundos)."""
+    for rota in _PAGE_ROUTES:
+        if any(_regra_casa(regra, features) for regra in rota["regras"]):
+            return rota["nome"]
+    return ROTA_PADRAO
+
+
+# Sem linhas desenhadas nem imagem grande: páginas escaneadas seguem para a rota padrão
+register_page_route("texto", [
+    {"max_linhas_regua": MIN_LINHAS_TABELA - 1, "max_pixels_imagem": MIN_PIXELS_IMAGEM_TABELA - 1},
+], "texto")
+
+register_page_route("horario", [
+    {"todas": ["segunda", "terça", "quarta", "quinta", "sexta"], "min_linhas_regua": MIN_LINHAS_GRADE},
+], "schedule")
+
+register_page_route("ppc_ementario", [
+    {"todas": ["ementa:", "bibliografia"]},
+], "ppc", tipos_tabela=["ppc_ementario"])
+
+register_page_route("ppc_matriz_curricular", [
+    {"todas": ["disciplina", "ch semanal"]},
+], "ppc", tipos_tabela=["ppc_matriz_curricular", "ppc_optativas"])  # optativas usam o mesmo cabeçalho
+
+register_page_route("ppc_docentes", [
+    {"alguma": ["nome do professor", "regime de trabalho"]},
+], "ppc", tipos_tabela=["ppc_docentes"])
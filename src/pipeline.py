@@ -0,0 +1,372 @@
+# src/pipeline.py
+
+from __future__ import annotations
+
+import os
+import time
+from typing import Dict, Any, Optional, List, Tuple
+
+try:
+    from src.image_extractor import extract_images_from_pdf
+    from src.table_extractor import extract_raw_dataframe, active_isolated_extractor, isolated_extraction, cached_rasterization
+    from src.table_enhancer import enhance_table
+    from src.horario_parser import extract_schedule_from_page
+    from src.ppc_parser import parse_ppc_page, RawStringTable
+    from src.text_normalization import normalize_text
+    from src.structure_detector import detect_structure
+    from src.deduplicator import deduplicate_chunks
+    from src.metadata_enricher import enrich_with_metadata
+    from src.instrumentation import PROFILER, stage
+    from src.memory import MemoryBudget
+    from src.table_worker import IsolatedTableExtractor
+    from src.raster_cache import RasterPageCache
+    from src.checkpoint import PageCheckpoint, OK, FALHA
+    from src.lazy import lazy_module
+    from src.document_classifier import classify_document, page_features
+    from src.page_router import route_page, route_processing, route_table_types
+except ImportError:
+    from .image_extractor import extract_images_from_pdf
+    from .table_extractor import extract_raw_dataframe, active_isolated_extractor, isolated_extraction, cached_rasterization
+    from .table_enhancer import enhance_table
+    from .horario_parser import extract_schedule_from_page
+    from .ppc_parser import parse_ppc_page, RawStringTable
+    from .text_normalization import normalize_text
+    from .structure_detector import detect_structure
+    from .deduplicator import deduplicate_chunks
+    from .metadata_enricher import enrich_with_metadata
+    from .instrumentation import PROFILER, stage
+    from .memory import MemoryBudget
+    from .table_worker import IsolatedTableExtractor
+    from .raster_cache import RasterPageCache
+    from .checkpoint import PageCheckpoint, OK, FALHA
+    from .lazy import lazy_module
+    from .document_classifier import classify_document, page_features
+    from .page_router import route_page, route_processing, route_table_types
+
+fitz = lazy_module("fitz")  # PyMuPDF, carregado só no primeiro uso
+
+# --- Detecção Automática de Tipo de PDF por Conteúdo ---
+
+def detect_pdf_type(pdf_path: str, cache_path: Optional[str] = None) -> str:
+    """Classifica o PDF como "ppc", "schedule" ou "generic" (src/document_classifier.classify_document)."""
+    file_name = os.path.basename(pdf_path)
+    try:
+        classificacao = classify_document(pdf_path, cache_path=cache_path)
+    except Exception as e:
+        print(f"Alerta: Não foi possível analisar conteúdo de '{file_name}': {e}. Tratando como 'generic'.")
+        return "generic"
+    pdf_type = classificacao["pdf_type"]
+    origem = ", cache" if classificacao["cache"] else ""
+    print(f"--> Detectado como tipo '{pdf_type}' (confiança {classificacao['confianca']}, "
+          f"páginas amostradas {classificacao['paginas_amostradas']}{origem}).")
+    return pdf_type
+
+
+# --- Processamento por Página ---
+
+def process_page(pdf_path: str, page_1_indexed: int, pdf_type: str, images_output_dir: str,
+                 raw_tables_policy: str = "unparsed-only",
+                 raw_strings: Optional[RawStringTable] = None, route: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Extrai imagens e tabelas de uma página conforme o tipo do documento. Retorna a entrada de page_specific_data.
+
+    Com `route` (src/page_router.route_page), a página recebe o processamento
+    da rota em vez do do documento: páginas só de texto não passam pelo
+    Camelot, e páginas de horário/PPC em documentos mistos vão para o parser
+    certo; nas rotas de PPC, as tabelas só são testadas contra os tipos da
+    rota. A rota fica em "rota" na entrada.
+
+    Com um extrator isolado ativo (isolated_extraction), a entrada recebe
+    "extracao_tabelas" com o caminho da cadeia de fallback usado na página.
+    """
+    extrator = active_isolated_extractor()
+    if extrator is not None:
+        extrator.last_info = None
+    processamento = pdf_type if route is None else (route_processing(route) or pdf_type)
+    tipos_tabela = route_table_types(route) if route is not None else None
+    page_data_entry = _process_page(pdf_path, page_1_indexed, processamento, images_output_dir, raw_tables_policy,
+                                    raw_strings, tipos_tabela)
+    if route is not None:
+        page_data_entry["rota"] = route
+    if extrator is not None and extrator.last_info is not None:
+        page_data_entry["extracao_tabelas"] = extrator.last_info
+    return page_data_entry
+
+def _process_page(pdf_path: str, page_1_indexed: int, pdf_type: str, images_output_dir: str,
+                  raw_tables_policy: str, raw_strings: Optional[RawStringTable],
+                  tipos_tabela: Optional[List[str]] = None) -> Dict[str, Any]:
+    # Extração de Imagens (comum a todos)
+    image_info = extract_images_from_pdf(pdf_path, page_1_indexed, images_output_dir)
+
+    if pdf_type == "texto":
+        # --- PÁGINA SÓ DE TEXTO (sem linhas de tabela; o texto vai para os content_chunks) ---
+        return {"page": page_1_indexed, "page_type": "texto", "images": image_info,
+                "summary": "Página sem linhas de tabela: extração de tabelas não executada."}
+
+    if pdf_type == "schedule":
+        # --- LÓGICA PARA HORÁRIO (Chama horario_parser.py) ---
+        schedule_page_data = extract_schedule_from_page(pdf_path, page_1_indexed)
+        page_data_entry = {"page": page_1_indexed, "page_type": "schedule", "images": image_info}
+        if schedule_page_data:
+            schedule_page_data.pop("pagina", None)
+            page_data_entry.update(schedule_page_data)
+        else:
+            page_data_entry["error"] = "Falha na extração/processamento do horário nesta página."
+        return page_data_entry
+
+    if pdf_type == "ppc":
+        # --- LÓGICA PARA PPC (Chama ppc_parser.py) ---
+        ppc_page_data = parse_ppc_page(pdf_path, page_1_indexed, raw_tables_policy, raw_strings, tipos_tabela)
+        page_data_entry = {"page": page_1_indexed, "images": image_info}
+        page_data_entry.update(ppc_page_data) # Adiciona 'page_type', 'tables', etc. do parser
+        return page_data_entry
+
+    # --- LÓGICA GENÉRICA (ANTIGA / table_enhancer.py) ---
+    raw_df = extract_raw_dataframe(pdf_path, page=page_1_indexed)
+    enhanced_table_info = {}
+    if not raw_df.empty:
+        try:
+            enhanced_table_info = enhance_table(raw_df)
+        except Exception as table_enhance_error:
+             print(f"\nAlerta: Erro ao aprimorar tabela genérica na pág {page_1_indexed}: {table_enhance_error}")
+             enhanced_table_info = {"error": str(table_enhance_error)}
+
+    return {
+        "page": page_1_indexed,
+        "page_type": "generic",
+        "tables": [enhanced_table_info.get("cleaned_table", [])] if "error" not in enhanced_table_info else [{"error": enhanced_table_info.get("error")}],
+        "table_legends": [enhanced_table_info.get("legend", "")] if "error" not in enhanced_table_info else [],
+        "table_summaries": [enhanced_table_info.get("summary", "")] if "error" not in enhanced_table_info else [],
+        "images": image_info
+    }
+
+
+# --- Montagem do Documento Final ---
+
+def _remap_raw_strings(page_data_entry: Dict[str, Any], page_strings: Optional[List[str]],
+                       raw_strings: RawStringTable) -> None:
+    """
+    Traduz os índices de "raw_table_compact" de uma tabela de strings da
+    página (usada nos checkpoints) para a tabela do documento. Como a
+    tradução segue a ordem das páginas e das células, os índices e a tabela
+    final saem iguais aos de uma execução sem checkpoints.
+    """
+    if not page_strings:
+        return
+    for tabela in page_data_entry.get("raw_table_compact", []):
+        tabela["colunas"] = [[raw_strings.intern(page_strings[i]) if i >= 0 else -1 for i in ids]
+                             for ids in tabela["colunas"]]
+
+def build_document(file_name: str, page_level_data: List[Dict[str, Any]], all_raw_text: str,
+                   acronyms: Optional[Dict[str, str]] = None,
+                   raw_strings: Optional[RawStringTable] = None) -> Dict[str, Any]:
+    """Processa o texto completo (chunks), move os horários para metadata e monta o documento final."""
+    metadata = {
+        "doc_id": file_name.replace('.pdf', ''),
+        "nome_doc": file_name,
+    }
+
+    # --- ETAPAS DE PROCESSAMENTO (TEXTO COMPLETO DO DOCUMENTO) ---
+    if all_raw_text:
+        try:
+            with stage("normalize_text"):
+                normalized_text = normalize_text(all_raw_text, acronyms=acronyms)
+            structured_chunks = detect_structure(normalized_text) # (Ainda não otimizado para PPC)
+            unique_chunks = deduplicate_chunks(structured_chunks)
+        except Exception as text_processing_error:
+             print(f"Alerta: Erro no processamento de texto completo para '{file_name}': {text_processing_error}")
+             unique_chunks = [{"error": "Falha no processamento do texto completo", "details": str(text_processing_error)}]
+    else:
+        print(f"Alerta: Nenhum texto bruto extraído de '{file_name}'.")
+        unique_chunks = [{"error": "Nenhum texto bruto extraído do PDF"}]
+
+    # --- AJUSTE PARA MOVER HORÁRIOS PARA METADATA ---
+    schedules_found = []
+    final_page_specific_data = []
+
+    for page_data in page_level_data:
+        if page_data.get("page_type") == "schedule" and "horario" in page_data and page_data.get("horario") is not None and "error" not in page_data:
+            schedule_info = {
+                "pagina_origem": page_data.get("page"),
+                "semestre": page_data.get("semestre"),
+                "turma": page_data.get("turma"),
+                "salas_info": page_data.get("salas_info"),
+                "horario": page_data.get("horario")
+            }
+            schedules_found.append(schedule_info)
+            processed_entry = {
+                "page": page_data.get("page"),
+                "page_type": "schedule_processed",
+                "images": page_data.get("images", [])
+            }
+            for chave in ("rota", "extracao_tabelas"): # Campos do pipeline, quando presentes
+                if chave in page_data:
+                    processed_entry[chave] = page_data[chave]
+            final_page_specific_data.append(processed_entry)
+        else:
+            final_page_specific_data.append(page_data) # Mantém PPC, Genérico, ou erros de horário
+
+    if schedules_found:
+      metadata["schedules"] = schedules_found
+
+    # Enriquece os chunks de texto DEPOIS de finalizar metadata
+    if unique_chunks and isinstance(unique_chunks[0], dict) and "error" not in unique_chunks[0]:
+         try:
+             final_chunks = enrich_with_metadata(unique_chunks, metadata)
+         except Exception as enrich_error:
+              print(f"Alerta: Erro ao enriquecer chunks de texto: {enrich_error}")
+              final_chunks = [{"error": "Falha ao enriquecer chunks de texto", "details": str(enrich_error)}]
+    elif not unique_chunks:
+         final_chunks = []
+    else: # Caso unique_chunks já contenha um erro
+         final_chunks = unique_chunks
+
+    # --- MONTAGEM DO JSONL FINAL ---
+    documento_final = {
+        "metadata": metadata,
+        "page_specific_data": final_page_specific_data,
+        "content_chunks": final_chunks
+    }
+    if raw_strings is not None and raw_strings.strings:
+        documento_final["raw_string_table"] = raw_strings.strings
+    return documento_final
+
+
+def process_document(pdf_path: str, images_output_dir: str, acronyms: Optional[Dict[str, str]] = None,
+                     raw_tables_policy: str = "unparsed-only", memory_budget: Optional[MemoryBudget] = None,
+                     pdf_type: Optional[str] = None,
+                     table_extractor: Optional[IsolatedTableExtractor] = None,
+                     classification_cache: Optional[str] = None,
+                     route_pages: bool = True,
+                     raster_cache: Optional[RasterPageCache] = None,
+                     checkpoint: Optional[PageCheckpoint] = None,
+                     retry_failed_only: bool = False) -> Tuple[Optional[Dict[str, Any]], str]:
+    """
+    Executa o pipeline completo sobre um PDF.
+
+    Sem `pdf_type`, o tipo vem de detect_pdf_type; `classification_cache` é o
+    JSON onde as classificações ficam guardadas pelo hash do conteúdo.
+
+    Com `route_pages`, cada página é roteada (src/page_router) pelo texto e
+    pelas linhas desenhadas; sem, todas recebem o processamento do tipo do documento.
+
+    Com `raster_cache`, as chamadas lattice do Camelot (aqui ou no worker
+    isolado) reaproveitam as páginas já rasterizadas; a limpeza do cache é
+    registrada no `memory_budget`.
+
+    Com `table_extractor`, a extração de tabelas de cada página roda no
+    worker isolado (limite de tempo e cadeia de fallback).
+
+    Com `checkpoint` (src/checkpoint.PageCheckpoint), cada página é gravada
+    ao terminar e as páginas já gravadas de uma execução anterior não são
+    refeitas. Uma exceção em uma página é registrada como falha e as demais
+    seguem; o documento só é montado quando todas estiverem "ok". Com
+    `retry_failed_only`, só as páginas com falha registrada são processadas
+    (documentos sem falhas registradas são pulados).
+
+    Com `memory_budget`, o RSS é verificado após cada página; se continuar
+    acima do orçamento mesmo após a limpeza, levanta MemoryError e o
+    chamador deve encerrar o processo e reexecutar (com `checkpoint`, a
+    execução seguinte retoma da página onde parou).
+
+    Returns:
+        (documento_final, pdf_type). documento_final é None se houve erro
+        crítico na extração das páginas, ou páginas com falha/faltando no
+        checkpoint (o chamador deve pular o arquivo).
+    """
+    file_name = os.path.basename(pdf_path)
+    if pdf_type is None:
+        pdf_type = detect_pdf_type(pdf_path, classification_cache)
+    if memory_budget is not None and raster_cache is not None:
+        memory_budget.register_cleanup("cache_raster", raster_cache.clear)
+
+    # --- ETAPA DE EXTRAÇÃO (NÍVEL DO DOCUMENTO) ---
+    all_raw_text = ""
+    page_level_data = [] # Lista temporária para dados de página
+    raw_strings = RawStringTable() # Tabela de strings das tabelas brutas (modo "all")
+    doc_key, salvas, pendentes = None, {}, []
+
+    try:
+        # Abre o PDF principal para processamento completo
+        with fitz.open(pdf_path) as doc, isolated_extraction(table_extractor), cached_rasterization(raster_cache):
+            if checkpoint is not None:
+                doc_key = checkpoint.open_document(pdf_path, doc.page_count, {
+                    "pdf_type": pdf_type, "raw_tables_policy": raw_tables_policy, "route_pages": route_pages})
+                salvas = checkpoint.page_states(doc_key)
+                falhas = sorted(p for p, info in salvas.items() if info["estado"] == FALHA)
+                concluidas = sum(1 for info in salvas.values() if info["estado"] == OK)
+                if retry_failed_only and not falhas:
+                    print(f"--> '{file_name}': nenhuma página com falha registrada. Pulando.")
+                    return None, pdf_type
+                if salvas:
+                    print(f"--> Checkpoint de '{file_name}': {concluidas} página(s) concluída(s), "
+                          f"{len(falhas)} com falha {falhas[:10]}.")
+
+            for page_num in range(doc.page_count):
+                page_1_indexed = page_num + 1
+                salva = salvas.get(page_1_indexed)
+                if salva is not None and salva["estado"] == OK:
+                    # --- Página concluída em uma execução anterior ---
+                    page_data_entry, page_text, page_strings = checkpoint.load_page(doc_key, page_1_indexed)
+                    _remap_raw_strings(page_data_entry, page_strings, raw_strings)
+                    if page_text:
+                        all_raw_text += page_text + "\n\n"
+                    page_level_data.append(page_data_entry)
+                    continue
+                if retry_failed_only and salva is None:
+                    pendentes.append(page_1_indexed) # Nunca processada: fica para uma execução normal
+                    continue
+
+                with PROFILER.page(page_1_indexed):
+                    # Extração de texto bruto (para content_chunks)
+                    with stage("texto_pagina"):
+                        page = doc.load_page(page_num)
+                        page_text = page.get_text("text")
+                    if page_text:
+                         all_raw_text += page_text + "\n\n"
+
+                    route = None
+                    if route_pages:
+                        with stage("roteamento_pagina"):
+                            route = route_page(page_features(page, page_text))
+
+                    if checkpoint is None:
+                        page_level_data.append(process_page(pdf_path, page_1_indexed, pdf_type, images_output_dir,
+                                                            raw_tables_policy, raw_strings, route))
+                    else:
+                        # Tabela de strings própria da página, para o checkpoint não depender das anteriores
+                        page_strings = RawStringTable()
+                        inicio = time.perf_counter()
+                        try:
+                            page_data_entry = process_page(pdf_path, page_1_indexed, pdf_type, images_output_dir,
+                                                           raw_tables_policy, page_strings, route)
+                        except Exception as e:
+                            erro = f"{type(e).__name__}: {e}"
+                            print(f"\nAlerta: Falha na página {page_1_indexed} de '{file_name}' (registrada no checkpoint): {erro}")
+                            checkpoint.save_failure(doc_key, page_1_indexed, page_text, erro,
+                                                    round(time.perf_counter() - inicio, 3))
+                            pendentes.append(page_1_indexed)
+                        else:
+                            checkpoint.save_page(doc_key, page_1_indexed, page_data_entry, page_text,
+                                                 page_strings.strings, round(time.perf_counter() - inicio, 3))
+                            _remap_raw_strings(page_data_entry, page_strings.strings, raw_strings)
+                            page_level_data.append(page_data_entry)
+
+                if memory_budget is not None:
+                    contexto = f"{file_name}, página {page_1_indexed}"
+                    if memory_budget.check(contexto) == MemoryBudget.EXCEDIDO:
+                        raise MemoryError(f"Orçamento de memória de {memory_budget.limite_mb:.0f} MB excedido "
+                                          f"mesmo após a limpeza ({contexto}).")
+
+    except MemoryError:
+        raise # O chamador recicla o processo; com checkpoint, as páginas concluídas ficam salvas
+    except Exception as e:
+        print(f"\nERRO CRÍTICO ao processar páginas de '{file_name}'. Pulando para próximo arquivo. Detalhes: {e}")
+        return None, pdf_type
+
+    if pendentes:
+        print(f"Alerta: '{file_name}' tem {len(pendentes)} página(s) sem resultado {pendentes[:10]}. "
+              f"As concluídas estão no checkpoint; o documento será montado em uma próxima execução.")
+        return None, pdf_type
+
+    return build_document(file_name, page_level_data, all_raw_text, acronyms, raw_strings), pdf_type
@@ -0,0 +1,212 @@
+# src/ppc_catalog.py
+
+import re
+from typing import Dict, Any, Optional, List, Tuple
+
+try:
+    from src.text_normalization import remove_accents
+except ImportError:
+    from .text_normalization import remove_accents
+
+# Valores da coluna Pre_Requisitos que significam "sem pré-requisito"
+_SEM_REQUISITO = {"", "-", "–", "—", "nenhum", "nenhuma", "nao ha", "nao possui"}
+
+
+# --- Normalização de Nomes ---
+
+def normalize_discipline_name(name: Any) -> Optional[str]:
+    """
+    Chave canônica de uma disciplina: minúsculas, sem acentos, sem hifenização
+    de quebra de linha ("Analí- tica" -> "analitica") e com espaços colapsados.
+    """
+    if name is None:
+        return None
+    text = str(name)
+    text = re.sub(r"(\w)-\s+(\w)", r"\1\2", text) # Hifenização herdada da quebra de linha do PDF
+    text = remove_accents(text)
+    text = ' '.join(text.casefold().split()).strip(' .:-')
+    return text if text else None
+
+def _display_name(name: Any) -> str:
+    """Nome para exibição: só desfaz a hifenização e colapsa espaços."""
+    return ' '.join(re.sub(r"(\w)-\s+(\w)", r"\1\2", str(name)).split())
+
+def _split_requisitos(text: Any) -> List[str]:
+    """Separa o texto livre de Pre_Requisitos em nomes ("Cálculo I, Algoritmos e Programação")."""
+    if text is None:
+        return []
+    nomes = []
+    for parte in re.split(r"[,;/]", str(text)):
+        parte = ' '.join(parte.split())
+        if normalize_discipline_name(parte) not in _SEM_REQUISITO and normalize_discipline_name(parte):
+            nomes.append(parte)
+    return nomes
+
+
+# --- Catálogo ---
+
+class CourseCatalog:
+    """
+    Catálogo das disciplinas do PPC com o grafo de pré-requisitos pré-computado.
+
+    Cada disciplina recebe um índice; os pré-requisitos diretos e o fecho
+    transitivo (nos dois sentidos) são guardados como bitsets (int do Python),
+    calculados uma única vez em ordem topológica. As consultas não reprocessam
+    texto: só resolvem o nome e devolvem listas já materializadas.
+    """
+
+    def __init__(self, disciplinas: Dict[str, Dict[str, Any]], requisitos: Dict[str, List[str]]):
+        self.disciplinas = disciplinas
+        self.nomes: List[str] = list(disciplinas.keys())
+        self._ids: Dict[str, int] = {chave: i for i, chave in enumerate(self.nomes)}
+
+        n = len(self.nomes)
+        self._diretos = [0] * n
+        for chave, reqs in requisitos.items():
+            for req in reqs:
+                self._diretos[self._ids[chave]] |= 1 << self._ids[req]
+
+        self._fecho_pre, self.ciclos = self._fecho_transitivo(self._diretos)
+        self._fecho_pos = [0] * n
+        diretos_pos = [0] * n
+        for v in range(n):
+            for u in self._bits(self._fecho_pre[v]):
+                self._fecho_pos[u] |= 1 << v
+            for u in self._bits(self._diretos[v]):
+                diretos_pos[u] |= 1 << v
+
+        # Listas materializadas para consultas O(1)
+        self._listas = {
+            ("pre", False): [self._nomes_de(b) for b in self._diretos],
+            ("pre", True): [self._nomes_de(b) for b in self._fecho_pre],
+            ("pos", False): [self._nomes_de(b) for b in diretos_pos],
+            ("pos", True): [self._nomes_de(b) for b in self._fecho_pos],
+        }
+
+    @staticmethod
+    def _bits(bitset: int) -> List[int]:
+        indices = []
+        while bitset:
+            low = bitset & -bitset
+            indices.append(low.bit_length() - 1)
+            bitset ^= low
+        return indices
+
+    def _nomes_de(self, bitset: int) -> Tuple[str, ...]:
+        return tuple(sorted(self.disciplinas[self.nomes[i]]["nome"] for i in self._bits(bitset)))
+
+    def _fecho_transitivo(self, diretos: List[int]) -> Tuple[List[int], List[str]]:
+        """Fecho transitivo por ordem topológica (Kahn). Nós em ciclo ficam com o fecho parcial."""
+        n = len(diretos)
+        pendentes = [len(self._bits(b)) for b in diretos]
+        dependentes: List[List[int]] = [[] for _ in range(n)]
+        for v in range(n):
+            for u in self._bits(diretos[v]):
+                dependentes[u].append(v)
+
+        fecho = list(diretos)
+        fila = [v for v in range(n) if pendentes[v] == 0]
+        processados = 0
+        while fila:
+            u = fila.pop()
+            processados += 1
+            for v in dependentes[u]:
+                fecho[v] |= fecho[u]
+                pendentes[v] -= 1
+                if pendentes[v] == 0:
+                    fila.append(v)
+
+        ciclos = []
+        if processados < n:
+            ciclos = [self.disciplinas[self.nomes[v]]["nome"] for v in range(n) if pendentes[v] > 0]
+            print(f"Alerta PPC_CATALOG: Ciclo nos pré-requisitos envolvendo {ciclos}.")
+        return fecho, ciclos
+
+    def _id(self, nome: str) -> int:
+        chave = normalize_discipline_name(nome)
+        if chave not in self._ids:
+            raise KeyError(f"Disciplina não encontrada no catálogo: '{nome}'")
+        return self._ids[chave]
+
+    def get(self, nome: str) -> Optional[Dict[str, Any]]:
+        """Registro da disciplina (nome, período, carga horária, ementa...) ou None."""
+        return self.disciplinas.get(normalize_discipline_name(nome))
+
+    def pre_requisitos(self, nome: str, transitivo: bool = True) -> List[str]:
+        """O que é preciso cursar antes de `nome` (ex: "Compiladores")."""
+        return list(self._listas[("pre", transitivo)][self._id(nome)])
+
+    def libera(self, nome: str, transitivo: bool = True) -> List[str]:
+        """Disciplinas que dependem de `nome` (ex: o que "Algoritmos e Programação" destrava)."""
+        return list(self._listas[("pos", transitivo)][self._id(nome)])
+
+    def requer(self, nome: str, requisito: str) -> bool:
+        """True se `requisito` é pré-requisito (direto ou indireto) de `nome`."""
+        return bool(self._fecho_pre[self._id(nome)] >> self._id(requisito) & 1)
+
+    def nao_resolvidos(self) -> List[str]:
+        """Pré-requisitos citados que não aparecem em nenhuma tabela de disciplinas."""
+        return sorted(d["nome"] for d in self.disciplinas.values() if d["origem"] == "pre_requisito")
+
+
+# --- Construção a partir da saída do pipeline ---
+
+def _iter_parsed_tables(documento: Dict[str, Any]):
+    for page in documento.get("page_specific_data", []):
+        for parsed in page.get("parsed_data_list") or []:
+            yield page.get("page"), parsed
+
+def build_catalog(documento: Dict[str, Any]) -> CourseCatalog:
+    """
+    Monta o catálogo a partir do documento final de um PPC (saída do pipeline).
+
+    Usa as tabelas de matriz curricular e optativas (nome, período, cargas e
+    Pre_Requisitos) e anexa os dados do ementário quando a disciplina tiver um.
+    """
+    disciplinas: Dict[str, Dict[str, Any]] = {}
+    requisitos_texto: Dict[str, List[str]] = {}
+
+    def registrar(nome: str, origem: str, **dados) -> Optional[str]:
+        chave = normalize_discipline_name(nome)
+        if not chave:
+            return None
+        registro = disciplinas.setdefault(chave, {"nome": _display_name(nome), "origem": origem,
+                                                  "periodo": None, "optativa": False, "pagina": None,
+                                                  "ementa": None})
+        if registro["origem"] == "pre_requisito" and origem != "pre_requisito":
+            registro["nome"] = _display_name(nome)
+            registro["origem"] = origem
+        for campo, valor in dados.items():
+            if valor is not None and registro.get(campo) in (None, False):
+                registro[campo] = valor
+        return chave
+
+    for pagina, parsed in _iter_parsed_tables(documento):
+        linhas, optativa = None, False
+        if "disciplinas" in parsed:
+            linhas = parsed["disciplinas"]
+        elif "disciplinas_optativas" in parsed:
+            linhas, optativa = parsed["disciplinas_optativas"], True
+        elif "ementa" in parsed and parsed.get("disciplina"):
+            chave = registrar(parsed["disciplina"], "ementario", pagina=pagina)
+            if chave:
+                disciplinas[chave]["ementa"] = parsed
+            continue
+
+        for linha in linhas or []:
+            chave = registrar(linha.get("DISCIPLINA"), "matriz", periodo=parsed.get("periodo"), optativa=optativa,
+                              pagina=pagina, carga_horaria=linha.get("CH_Semestral_Horas"))
+            if chave:
+                requisitos_texto.setdefault(chave, []).extend(_split_requisitos(linha.get("Pre_Requisitos")))
+
+    # Resolve os nomes citados em Pre_Requisitos (cria nós para os que não existirem)
+    requisitos: Dict[str, List[str]] = {}
+    for chave, nomes in requisitos_texto.items():
+        resolvidos = []
+        for nome in nomes:
+            req = registrar(nome, "pre_requisito")
+            if req and req != chave and req not in resolvidos:
+                resolvidos.append(req)
+        requisitos[chave] = resolvidos
+
+    return CourseCatalog(disciplinas, requisitos)
@@ -1,7 +1,8 @@
 # src/ppc_parser.py
 
-import pandas as pd
-from typing import Dict, Any, Optional, List
+from __future__ import annotations
+
+from typing import Dict, Any, Optional, List, Tuple, Set, FrozenSet, Iterable, Callable
 import re
 import os
 
@@ -13,6 +14,16 @@ try:
     from src.table_extractor import extract_raw_dataframe
 except ImportError:
     from .table_extractor import extract_raw_dataframe
+try:
+    from src.instrumentation import timed
+    from src.lazy import lazy_module
+except ImportError:
+    from .instrumentation import timed
+    from .lazy import lazy_module
+
+# Dependências pesadas carregadas só no primeiro uso (ver src/lazy.py)
+np = lazy_module("numpy")
+pd = lazy_module("pandas")
 
 
 # --- Funções Auxiliares de Limpeza ---
@@ -24,11 +35,57 @@ def _clean_string(text: Any) -> Optional[str]:
     cleaned = ' '.join(cleaned.split()) # Remove espaços duplicados
     return cleaned if cleaned else None
 
-def _get_raw_table_text(raw_df: pd.DataFrame) -> str:
-    if raw_df is None or raw_df.empty:
-        return ""
-    # Concatena todas as células em uma única string
-    return raw_df.to_string(header=False, index=False).lower()
+
+# --- Camada Vetorizada de Limpeza (usada pelos parsers de matriz, optativas e docentes) ---
+
+def _clean_series(series: pd.Series) -> pd.Series:
+    """Equivalente vetorizado de `series.apply(_clean_string)`: colapsa espaços/quebras e troca vazios por None."""
+    text = series.astype(object).where(series.notna(), '').astype(str).str.split().str.join(' ')
+    values = text.to_numpy(dtype=object, copy=True)
+    values[values == ''] = None
+    return pd.Series(values, index=series.index, dtype=object)
+
+def _clean_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Aplica _clean_series em todas as células de uma vez (uma única passada de operações .str)."""
+    cells = pd.Series(df.to_numpy(dtype=object).ravel())
+    values = _clean_series(cells).to_numpy(dtype=object).reshape(df.shape)
+    return pd.DataFrame(values, index=df.index, columns=df.columns, dtype=object)
+
+def _find_row(mask: pd.Series) -> int:
+    """Posição da primeira linha True da máscara, ou -1."""
+    hits = mask.to_numpy(dtype=bool)
+    return int(hits.argmax()) if hits.any() else -1
+
+def _first_column_contains(df: pd.DataFrame, text: str) -> pd.Series:
+    """Máscara das linhas cuja primeira célula (em maiúsculas) contém `text` (uma palavra)."""
+    return df.iloc[:, 0].astype(str).str.upper().str.contains(text, regex=False).astype(bool)
+
+def _row_text(df: pd.DataFrame) -> pd.Series:
+    """Texto de cada linha em minúsculas: as células não nulas unidas por espaço ("" se a linha não tem células)."""
+    values = df.to_numpy(dtype=object).ravel()
+    rows = np.repeat(np.arange(len(df)), df.shape[1])
+    notna = pd.notna(values)
+    joined = pd.Series(values[notna], dtype=object).astype(str).groupby(rows[notna]).agg(' '.join)
+    return pd.Series(joined.reindex(range(len(df)), fill_value='').to_numpy(dtype=object),
+                     index=df.index, dtype=object).str.lower()
+
+def _row_contains_all(df: pd.DataFrame, texts: List[str]) -> pd.Series:
+    """
+    Máscara das linhas cujo texto (_row_text) contém todos os `texts`. Como no
+    laço original, um texto pode atravessar células ("nome do" | "professor").
+    """
+    row_text = _row_text(df)
+    mask = np.ones(len(df), dtype=bool)
+    for text in texts:
+        mask &= row_text.str.contains(text, regex=False).to_numpy(dtype=bool)
+    return pd.Series(mask, index=df.index)
+
+def _join_text_by(df: pd.DataFrame, by: str, col: str, unique: bool = False) -> pd.Series:
+    """Concatena os textos não nulos de `col` por grupo de `by` (grupos sem texto ficam de fora; use reindex)."""
+    values = df[[by, col]].dropna()
+    if unique:
+        values = values.drop_duplicates()
+    return values.groupby(by)[col].agg(' '.join)
 
 
 # --- Parsers Específicos para cada TIPO de Tabela ---
@@ -39,19 +96,12 @@ def _parse_matriz_curricular(raw_df: pd.DataFrame) -> Optional[Dict[str, Any]]:
     
     # 1. Encontrar o Título do Período (ex: "1° PERÍODO")
     periodo_title = None
-    for i, row in df.iterrows():
-        cell_value = _clean_string(row.iloc[0])
-        if cell_value and "PERÍODO" in cell_value.upper():
-            periodo_title = cell_value
-            break
+    periodo_row = _find_row(_first_column_contains(df, "PERÍODO"))
+    if periodo_row != -1:
+        periodo_title = _clean_string(df.iloc[periodo_row, 0])
             
     # 2. Encontrar a Linha de Cabeçalho ("DISCIPLINA")
-    header_row_index = -1
-    for i, row in df.iterrows():
-        cell_value_0 = _clean_string(row.iloc[0])
-        if cell_value_0 and "DISCIPLINA" in cell_value_0.upper():
-            header_row_index = i
-            break
+    header_row_index = _find_row(_first_column_contains(df, "DISCIPLINA"))
             
     if header_row_index == -1:
         print("Alerta PPC_PARSER: _parse_matriz_curricular não encontrou 'DISCIPLINA'.")
@@ -86,8 +136,7 @@ def _parse_matriz_curricular(raw_df: pd.DataFrame) -> Optional[Dict[str, Any]]:
     # 5. Limpar os Dados
     data_df = data_df[data_df['DISCIPLINA'].astype(str).str.contains('TOTAL', case=False, na=False) == False]
     
-    for col in data_df.columns:
-        data_df[col] = data_df[col].apply(_clean_string)
+    data_df = _clean_frame(data_df)
         
     data_df.dropna(how='all', inplace=True)
 
@@ -109,12 +158,7 @@ def _parse_optativas(raw_df: pd.DataFrame) -> Optional[Dict[str, Any]]:
     df = raw_df.copy()
 
     # 1. Tentar Encontrar a Linha de Cabeçalho ("DISCIPLINA")
-    header_row_index = -1
-    for i, row in df.iterrows():
-        cell_value = _clean_string(row.iloc[0])
-        if cell_value and "DISCIPLINA" in cell_value.upper():
-            header_row_index = i
-            break
+    header_row_index = _find_row(_first_column_contains(df, "DISCIPLINA"))
             
     # 2. Definir o Início dos Dados
     data_start_index = 0
@@ -149,8 +193,7 @@ def _parse_optativas(raw_df: pd.DataFrame) -> Optional[Dict[str, Any]]:
     # 4. Limpar os Dados
     data_df['DISCIPLINA'] = data_df['DISCIPLINA'].ffill()
 
-    for col in data_df.columns:
-        data_df[col] = data_df[col].apply(_clean_string)
+    data_df = _clean_frame(data_df)
         
     data_df.dropna(how='all', inplace=True)
     data_df.dropna(subset=['CH_Semanal_Total'], inplace=True)
@@ -158,19 +201,11 @@ def _parse_optativas(raw_df: pd.DataFrame) -> Optional[Dict[str, Any]]:
     if data_df.empty:
         return None
 
-    def aggregate_text(rows):
-        return ' '.join(rows.dropna().unique())
-
-    grouped = data_df.groupby('DISCIPLINA')
-    
-    aggregated_df = pd.DataFrame({
-        'CH_Semanal_Teorica': grouped['CH_Semanal_Teorica'].first(),
-        'CH_Semanal_Pratica': grouped['CH_Semanal_Pratica'].first(),
-        'CH_Semanal_Total': grouped['CH_Semanal_Total'].first(),
-        'CH_Semestral_Hora_Aula': grouped['CH_Semestral_Hora_Aula'].first(),
-        'CH_Semestral_Horas': grouped['CH_Semestral_Horas'].first(),
-        'Pre_Requisitos': grouped['Pre_Requisitos'].apply(aggregate_text)
-    }).reset_index()
+    ch_columns = ['CH_Semanal_Teorica', 'CH_Semanal_Pratica', 'CH_Semanal_Total',
+                  'CH_Semestral_Hora_Aula', 'CH_Semestral_Horas']
+    aggregated_df = data_df.groupby('DISCIPLINA')[ch_columns].agg('first')
+    aggregated_df['Pre_Requisitos'] = _join_text_by(data_df, 'DISCIPLINA', 'Pre_Requisitos', unique=True).reindex(aggregated_df.index, fill_value='')
+    aggregated_df = aggregated_df.reset_index()
 
     table_dict_list = aggregated_df.where(pd.notna(aggregated_df), None).to_dict(orient='records')
     
@@ -182,12 +217,7 @@ def _parse_docentes(raw_df: pd.DataFrame) -> Optional[Dict[str, Any]]:
 
     df = raw_df.copy()
     
-    header_row_index = -1
-    for i, row in df.iterrows():
-        row_str = ' '.join(row.dropna().astype(str)).lower()
-        if "nome do professor" in row_str and "regime de trabalho" in row_str:
-            header_row_index = i
-            break
+    header_row_index = _find_row(_row_contains_all(df, ["nome do professor", "regime de trabalho"]))
             
     if header_row_index != -1:
         df = df.iloc[header_row_index + 1:].reset_index(drop=True)
@@ -208,8 +238,7 @@ def _parse_docentes(raw_df: pd.DataFrame) -> Optional[Dict[str, Any]]:
         df = df.iloc[:, :4]
         df.columns = expected_columns
     
-    for col in df.columns:
-        df[col] = df[col].apply(_clean_string)
+    df = _clean_frame(df)
         
     df.dropna(how='all', inplace=True)
 
@@ -222,17 +251,12 @@ def _parse_docentes(raw_df: pd.DataFrame) -> Optional[Dict[str, Any]]:
     if df.empty:
         return None
 
-    def aggregate_formation(rows):
-        full_formation = ' '.join(rows.dropna())
-        return full_formation
-
-    grouped = df.groupby('Nome do Professor')
-    
-    aggregated_df = pd.DataFrame({
-        'Item': grouped['Item'].first(), # Pega o primeiro item
-        'Formacao': grouped['Formacao'].apply(aggregate_formation),
-        'Regime de Trabalho': grouped['Regime de Trabalho'].last()
-    }).reset_index() 
+    aggregated_df = df.groupby('Nome do Professor').agg({
+        'Item': 'first', # Pega o primeiro item
+        'Regime de Trabalho': 'last'
+    })
+    aggregated_df['Formacao'] = _join_text_by(df, 'Nome do Professor', 'Formacao').reindex(aggregated_df.index, fill_value='')
+    aggregated_df = aggregated_df.reset_index()
 
     # Reordena colunas
     final_cols = ['Item', 'Nome do Professor', 'Formacao', 'Regime de Trabalho']
@@ -295,17 +319,224 @@ def _parse_ementario(raw_df: pd.DataFrame) -> Optional[Dict[str, Any]]:
     return ementa_dict if "ementa" in ementa_dict else None
 
 
-def parse_ppc_page(pdf_path: str, page_num: int) -> Dict[str, Any]:
+# --- Registro de Parsers por Tipo de Tabela ---
+# Cada tipo declara sua assinatura de palavras-chave como uma lista de regras
+# alternativas (basta uma casar). Cada regra pode exigir:
+#   "todas":   todas estas palavras presentes
+#   "alguma":  ao menos uma destas palavras presente
+#   "nenhuma": nenhuma destas palavras presente
+#   "paginas": a página estar neste intervalo (para tabelas de continuação)
+# A ordem de registro define a prioridade: o primeiro tipo que casar vence.
+
+TIPO_DESCONHECIDO = "ppc_tabela_desconhecida"
+
+_TABLE_PARSERS: List[Dict[str, Any]] = []
+# Uma regex combinada por conjunto de tipos consultado (None = todos os registrados)
+_keyword_scanners: Dict[Optional[FrozenSet[str]], Tuple[Any, Dict[str, Set[str]]]] = {}
+
+def register_table_parser(table_type: str, parser: Optional[Callable[[pd.DataFrame], Optional[Dict[str, Any]]]],
+                          regras: List[Dict[str, Any]], alerta_se_falhar: bool = True) -> None:
+    """
+    Registra um parser de tabela de PPC e sua assinatura de palavras-chave.
+
+    Args:
+        table_type: Nome do tipo (ex: "ppc_docentes"), usado no sumário da página.
+        parser: Função que recebe o DataFrame bruto e devolve os dados parseados
+                (ou None para tipos ainda sem parser).
+        regras: Lista de regras alternativas (ver comentário acima). Palavras
+                são comparadas em minúsculas, dentro de cada célula.
+        alerta_se_falhar: Se True, imprime um alerta quando o tipo é detectado
+                          mas o parser não retorna dados.
+    """
+    _TABLE_PARSERS.append({
+        "table_type": table_type,
+        "parser": parser,
+        "regras": regras,
+        "alerta_se_falhar": alerta_se_falhar,
+    })
+    _keyword_scanners.clear() # Força a reconstrução das regex combinadas
+
+def _table_entries(table_types: Optional[FrozenSet[str]]) -> List[Dict[str, Any]]:
+    """Entradas do registro dos tipos `table_types` (todas se None), na ordem de registro."""
+    if table_types is None:
+        return _TABLE_PARSERS
+    return [entry for entry in _TABLE_PARSERS if entry["table_type"] in table_types]
+
+def _get_keyword_scanner(table_types: Optional[FrozenSet[str]] = None) -> Tuple[Any, Dict[str, Set[str]]]:
+    """
+    Monta (uma vez por conjunto de tipos) uma única regex com as palavras-chave
+    registradas para `table_types` (todos os tipos se None).
+
+    A alternativa fica dentro de um lookahead, então o texto da tabela é
+    percorrido uma única vez, em vez de uma busca por palavra-chave. O `re` não
+    monta uma trie: em cada posição as alternativas são testadas em sequência,
+    então o custo ainda cresce com o número de palavras-chave registradas (o
+    ganho é não repetir a varredura e a conversão do texto). Como numa mesma
+    posição só a palavra mais longa é reportada, cada palavra também
+    "implica" as palavras registradas que são substrings dela (ex: "disciplina:"
+    implica "disciplina").
+    """
+    scanner = _keyword_scanners.get(table_types)
+    if scanner is None:
+        keywords = set()
+        for entry in _table_entries(table_types):
+            for regra in entry["regras"]:
+                for campo in ("todas", "alguma", "nenhuma"):
+                    keywords.update(kw.lower() for kw in regra.get(campo, ()))
+        ordered = sorted(keywords, key=len, reverse=True)
+        pattern = re.compile("(?=(" + "|".join(re.escape(kw) for kw in ordered) + "))") if ordered else None
+        implied = {kw: {other for other in keywords if other in kw} for kw in keywords}
+        scanner = _keyword_scanners[table_types] = (pattern, implied)
+    return scanner
+
+def _get_table_keywords(raw_df: pd.DataFrame, table_types: Optional[FrozenSet[str]] = None) -> Set[str]:
+    """Retorna as palavras-chave de `table_types` presentes nas células da tabela (uma única varredura)."""
+    if raw_df is None or raw_df.empty:
+        return set()
+    pattern, implied = _get_keyword_scanner(table_types)
+    if pattern is None:
+        return set()
+    # Células separadas por '\n' (nenhuma palavra-chave contém quebra de linha, então não há match entre células)
+    text = "\n".join(str(cell) for cell in raw_df.to_numpy().ravel() if cell is not None).lower()
+    found = set()
+    for match in pattern.finditer(text):
+        kw = match.group(1)
+        if kw not in found:
+            found |= implied[kw]
+    return found
+
+def _regra_casa(regra: Dict[str, Any], keywords: Set[str], page_num: int) -> bool:
+    paginas = regra.get("paginas")
+    if paginas is not None and page_num not in paginas:
+        return False
+    if not all(kw in keywords for kw in regra.get("todas", ())):
+        return False
+    if regra.get("alguma") and not any(kw in keywords for kw in regra["alguma"]):
+        return False
+    return not any(kw in keywords for kw in regra.get("nenhuma", ()))
+
+@timed()
+def classify_table(raw_df: pd.DataFrame, page_num: int,
+                   table_types: Optional[Iterable[str]] = None) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    Classifica uma tabela bruta. Retorna (tipo, entrada do registro) ou (TIPO_DESCONHECIDO, None).
+    Com `table_types` (ex: os tipos da rota da página), só esses parsers são testados.
+    """
+    table_types = frozenset(table_types) if table_types is not None else None
+    keywords = _get_table_keywords(raw_df, table_types)
+    for entry in _table_entries(table_types):
+        if any(_regra_casa(regra, keywords, page_num) for regra in entry["regras"]):
+            return entry["table_type"], entry
+    return TIPO_DESCONHECIDO, None
+
+
+_REQUISITOS = ["pré – requisitos", "pré- requisitos"]
+
+register_table_parser("ppc_ementario", _parse_ementario, [
+    {"todas": ["disciplina:", "ementa:", "bibliografia básica:"]},
+], alerta_se_falhar=False)
+
+register_table_parser("ppc_matriz_curricular", _parse_matriz_curricular, [
+    {"todas": ["disciplina", "ch semanal"], "alguma": _REQUISITOS, "nenhuma": ["disciplinas optativas"]},
+])
+
+register_table_parser("ppc_optativas", _parse_optativas, [
+    {"todas": ["disciplina", "ch semanal", "disciplinas optativas"], "alguma": _REQUISITOS},
+    # Continuação da tabela de optativas (sem cabeçalho) nas páginas 25-28
+    {"alguma": ["tópicos especiais", "algoritmos geométricos"], "paginas": range(25, 29)},
+])
+
+register_table_parser("ppc_docentes", _parse_docentes, [
+    {"todas": ["nome do professor"]},
+    {"todas": ["formação", "regime de trabalho"]},
+    # Continuação da tabela de docentes (sem cabeçalho) nas páginas 97-98
+    {"todas": ["mestrado em"], "paginas": range(97, 99)},
+])
+
+# Tabela de equivalência entre as matrizes 2015 e 2019 (pág. 29): sem parser. O Camelot
+# entrega células mescladas (código, nome e CH na mesma célula; duas disciplinas por
+# linha separadas por quebra), sem estrutura confiável para extrair pares. O tipo fica
+# registrado para o sumário da página nomear a tabela e, com "unparsed-only", a tabela
+# bruta ser mantida na saída para leitura.
+register_table_parser("ppc_equivalencia", None, [
+    {"todas": ["componentes curriculares", "matriz 2015"]},
+], alerta_se_falhar=False)
+
+
+# --- Retenção de Tabelas Brutas ---
+# Política de quais tabelas brutas do Camelot são guardadas na saída:
+#   "none":          nenhuma
+#   "unparsed-only": só as tabelas que não foram parseadas (tipo desconhecido ou
+#                    falha no parser), no formato de registros legível para depuração
+#   "all":           todas, na codificação compacta (colunas de índices para uma
+#                    tabela de strings compartilhada pelo documento inteiro)
+
+RAW_TABLE_POLICIES = ("none", "unparsed-only", "all")
+
+class RawStringTable:
+    """Tabela de strings por documento: cada texto de célula é guardado uma única vez."""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+    def intern(self, value: Any) -> int:
+        """Retorna o índice da string (-1 para células nulas)."""
+        if value is None or (not isinstance(value, str) and pd.isna(value)):
+            return -1
+        text = str(value)
+        string_id = self._ids.get(text)
+        if string_id is None:
+            string_id = len(self.strings)
+            self._ids[text] = string_id
+            self.strings.append(text)
+        return string_id
+
+def encode_raw_table(raw_df: pd.DataFrame, string_table: RawStringTable) -> Dict[str, Any]:
+    """Codifica a tabela como {"linhas": n, "colunas": [[ids da coluna 0], [ids da coluna 1], ...]}."""
+    return {
+        "linhas": len(raw_df),
+        "colunas": [[string_table.intern(v) for v in raw_df[col].tolist()] for col in raw_df.columns],
+    }
+
+def decode_raw_table(encoded: Dict[str, Any], strings: List[str]) -> List[Dict[str, Optional[str]]]:
+    """Reconstrói a tabela no formato de registros ({"0": ..., "1": ...} por linha) a partir da codificação compacta."""
+    colunas = [[strings[i] if i >= 0 else None for i in ids] for ids in encoded["colunas"]]
+    return [{str(c): colunas[c][r] for c in range(len(colunas))} for r in range(encoded["linhas"])]
+
+
+@timed()
+def parse_ppc_page(pdf_path: str, page_num: int, raw_tables_policy: str = "unparsed-only",
+                   string_table: Optional[RawStringTable] = None,
+                   table_types: Optional[List[str]] = None) -> Dict[str, Any]:
     """
     Função principal do parser de PPC. (Versão 6 - Modular, Multi-Tabela)
     Extrai TODAS as tabelas e roteia CADA UMA para o parser correto.
+
+    `raw_tables_policy` controla quais tabelas brutas vão para a saída (ver
+    RAW_TABLE_POLICIES). No modo "all" as tabelas vão em "raw_table_compact",
+    indexando `string_table`, que deve ser a mesma para o documento inteiro e
+    salva junto com ele (se omitida, uma tabela da própria página é incluída).
+
+    `table_types` restringe os parsers testados em cada tabela (ex: os tipos da
+    rota da página, src/page_router); None testa o registro inteiro.
     """
+    if raw_tables_policy not in RAW_TABLE_POLICIES:
+        raise ValueError(f"Política de tabelas brutas inválida: '{raw_tables_policy}'. Use uma de {RAW_TABLE_POLICIES}.")
+    if table_types is not None:
+        registrados = {entry["table_type"] for entry in _TABLE_PARSERS}
+        desconhecidos = [tipo for tipo in table_types if tipo not in registrados]
+        if desconhecidos:
+            raise ValueError(f"Tipos de tabela não registrados: {desconhecidos}. Use algum de {sorted(registrados)}.")
+    page_string_table = None
+    if raw_tables_policy == "all" and string_table is None:
+        string_table = page_string_table = RawStringTable()
     
     # 1. Extrai TODAS as tabelas brutas da página
     raw_tables = get_raw_tables_from_page(pdf_path, page_num)
     
     parsed_data_list = [] # Lista para guardar os dados de todas as tabelas processadas
-    raw_table_list = []   # Lista para guardar todas as tabelas brutas
+    raw_table_list = []   # Lista para guardar as tabelas brutas (conforme a política de retenção)
     table_types_found = [] # Lista para guardar os tipos de tabela
 
     if not raw_tables:
@@ -317,61 +548,35 @@ def parse_ppc_page(pdf_path: str, page_num: int) -> Dict[str, Any]:
             if raw_df.empty:
                 continue
                 
-            raw_table_list.append(raw_df.where(pd.notna(raw_df), None).to_dict(orient='records'))
-            table_text = _get_raw_table_text(raw_df)
-            
-            parsed_data = None
-            table_type = "ppc_tabela_desconhecida" # Padrão para esta tabela
-
-            if ("disciplina:" in table_text and 
-                "ementa:" in table_text and 
-                "bibliografia básica:" in table_text):
-                
-                table_type = "ppc_ementario"
-                parsed_data = _parse_ementario(raw_df) 
-
-            elif ("disciplina" in table_text and 
-                  "ch semanal" in table_text and 
-                  ("pré – requisitos" in table_text or "pré- requisitos" in table_text)):
-                
-                if "disciplinas optativas" not in table_text:
-                    table_type = "ppc_matriz_curricular"
-                    parsed_data = _parse_matriz_curricular(raw_df)
-                else:
-                    table_type = "ppc_optativas"
-                    parsed_data = _parse_optativas(raw_df)
-            
-            elif (page_num >= 25 and page_num <= 28 and ("tópicos especiais" in table_text or "algoritmos geométricos" in table_text)):
-                table_type = "ppc_optativas"
-                parsed_data = _parse_optativas(raw_df) 
-
-            elif ("nome do professor" in table_text or 
-                  ("formação" in table_text and "regime de trabalho" in table_text) or
-                  (page_num in [97, 98] and "mestrado em" in table_text)):
-                
-                table_type = "ppc_docentes"
-                parsed_data = _parse_docentes(raw_df)
-            
-            elif ("componentes curriculares" in table_text and "matriz 2015" in table_text):
-                 table_type = "ppc_equivalencia"
-                 parsed_data = None # TODO
-                 
+            table_type, entry = classify_table(raw_df, page_num, table_types)
+            parsed_data = entry["parser"](raw_df) if entry and entry["parser"] else None
 
             # --- Fim do roteamento para esta tabela ---
+            if raw_tables_policy == "all":
+                raw_table_list.append(encode_raw_table(raw_df, string_table))
+            elif raw_tables_policy == "unparsed-only" and not parsed_data:
+                raw_table_list.append(raw_df.where(pd.notna(raw_df), None).to_dict(orient='records'))
+
             table_types_found.append(table_type)
             if parsed_data:
                 parsed_data_list.append(parsed_data)
             else:
-                if table_type not in ["ppc_tabela_desconhecida", "ppc_equivalencia", "ppc_ementario"]: # Ignora placeholders
+                if entry and entry["alerta_se_falhar"]: # Ignora placeholders
                      print(f"Alerta PPC_PARSER: Detectou tipo '{table_type}' na pág {page_num}, mas falhou ao processar os dados.")
 
         # Atualiza o sumário com os tipos de tabelas processadas
         if table_types_found:
              summary = f"Processadas {len(raw_tables)} tabelas. Tipos detectados: {', '.join(table_types_found)}"
 
-    return {
+    result = {
         "page_type": "ppc", # Tipo geral da página
         "parsed_data_list": parsed_data_list, # Lista de todos os dados de tabelas parseados
-        "raw_table_list": raw_table_list, # Lista de todas as tabelas brutas
-        "summary": summary
-    }
\ No newline at end of file
+    }
+    if raw_tables_policy == "all":
+        result["raw_table_compact"] = raw_table_list
+        if page_string_table is not None:
+            result["raw_string_table"] = page_string_table.strings
+    else:
+        result["raw_table_list"] = raw_table_list # Vazia no modo "none"
+    result["summary"] = summary
+    return result
\ No newline at end of file
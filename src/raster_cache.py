@@ -0,0 +1,187 @@
+# src/raster_cache.py
+
+from __future__ import annotations
+
+import glob
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple, Callable
+
+try:
+    from src.document_classifier import content_hash
+    from src.lazy import lazy_module
+except ImportError:
+    from .document_classifier import content_hash
+    from .lazy import lazy_module
+
+np = lazy_module("numpy")
+
+
+class RasterPageCache:
+    """
+    Cache em disco das páginas rasterizadas pelo Camelot lattice, chaveado por
+    (conteúdo do documento, página, resolução).
+
+    O lattice renderiza a página inteira (300 dpi, ~25 MB em BGR) antes de
+    procurar as linhas, e a renderização é a maior parte do tempo da chamada.
+    Com o cache ativo (table_extractor.cached_rasterization), toda chamada
+    lattice da execução usa `backend()` como backend de conversão do Camelot:
+    a mesma página com outros parâmetros (line_scale, retentativas, outro
+    extrator) é lida do disco em milissegundos em vez de renderizada de novo.
+
+    As imagens ficam como .npy (sem compressão: PNG custaria ~100 ms para
+    decodificar) em `cache_dir`, com descarte LRU acima de `max_mb`. Sem
+    `cache_dir`, usa um diretório temporário removido em close(). O índice é
+    reconstruído a partir do diretório, então outro processo (o worker de
+    tabelas) pode usar o mesmo cache_dir, um de cada vez.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_mb: float = 1024.0):
+        self._temporario = cache_dir is None
+        self.cache_dir = cache_dir or tempfile.mkdtemp(prefix="raster_cache_")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.max_mb = max_mb
+        self._entradas: "OrderedDict[str, int]" = OrderedDict() # arquivo -> bytes, do menos ao mais recente
+        self._hashes: Dict[Tuple[str, int, int], str] = {}
+        self.estatisticas = {"acertos": 0, "faltas": 0, "descartes": 0}
+        self._carregar_indice()
+
+    def _carregar_indice(self) -> None:
+        self._entradas.clear()
+        arquivos = glob.glob(os.path.join(self.cache_dir, "*.npy"))
+        for caminho in sorted(arquivos, key=os.path.getmtime):
+            self._entradas[os.path.basename(caminho)] = os.path.getsize(caminho)
+        self._tamanho = sum(self._entradas.values())
+        self._descartar()
+
+    def spec(self) -> Dict[str, Any]:
+        """Argumentos para abrir o mesmo cache em outro processo."""
+        return {"cache_dir": self.cache_dir, "max_mb": self.max_mb}
+
+    # --- Chaves e Descarte ---
+
+    def _documento(self, pdf_path: str) -> str:
+        """Hash do conteúdo do PDF, recalculado só quando tamanho/mtime mudam."""
+        info = os.stat(pdf_path)
+        chave = (os.path.abspath(pdf_path), info.st_size, info.st_mtime_ns)
+        if chave not in self._hashes:
+            self._hashes[chave] = content_hash(pdf_path)[:20]
+        return self._hashes[chave]
+
+    def _remover(self, nome: str) -> None:
+        self._tamanho -= self._entradas.pop(nome, 0)
+        try:
+            os.remove(os.path.join(self.cache_dir, nome))
+        except OSError:
+            pass
+
+    def _descartar(self) -> None:
+        limite = self.max_mb * 2**20
+        while self._tamanho > limite and len(self._entradas) > 1:
+            self._remover(next(iter(self._entradas)))
+            self.estatisticas["descartes"] += 1
+
+    # --- Consulta ---
+
+    def get_array(self, pdf_path: str, page: int, resolution: int, render: Callable[[], Any]):
+        """Imagem BGR da página (1-indexada): do cache, ou `render()` e guarda."""
+        nome = f"{self._documento(pdf_path)}_p{page}_r{resolution}.npy"
+        caminho = os.path.join(self.cache_dir, nome)
+        if nome in self._entradas:
+            try:
+                imagem = np.load(caminho)
+            except (OSError, ValueError):
+                self._remover(nome) # Apagado ou truncado por fora: renderiza de novo
+            else:
+                self._entradas.move_to_end(nome)
+                os.utime(caminho) # Mantém a ordem LRU para quem reconstruir o índice
+                self.estatisticas["acertos"] += 1
+                return imagem
+
+        self.estatisticas["faltas"] += 1
+        imagem = render()
+        tmp_path = caminho + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            np.save(f, imagem)
+        os.replace(tmp_path, caminho)
+        self._tamanho -= self._entradas.pop(nome, 0)
+        self._entradas[nome] = os.path.getsize(caminho)
+        self._tamanho += self._entradas[nome]
+        self._descartar()
+        return imagem
+
+    def backend(self, resolution: int = 300) -> "CachedRasterBackend":
+        """Backend de conversão para `camelot.read_pdf(..., backend=...)` que passa por este cache."""
+        return CachedRasterBackend(self, resolution)
+
+    # --- Manutenção ---
+
+    def add_stats(self, delta: Dict[str, int]) -> None:
+        """Soma estatísticas de outro processo que usou o mesmo cache_dir (o worker de tabelas)."""
+        for chave, valor in delta.items():
+            self.estatisticas[chave] = self.estatisticas.get(chave, 0) + valor
+
+    def clear(self) -> None:
+        """Apaga todas as imagens (rotina de limpeza para o MemoryBudget: /tmp pode ser tmpfs)."""
+        for nome in list(self._entradas):
+            self._remover(nome)
+        for caminho in glob.glob(os.path.join(self.cache_dir, "*.npy")):
+            try:
+                os.remove(caminho)
+            except OSError:
+                pass
+        self._tamanho = 0
+
+    def report(self) -> Dict[str, Any]:
+        self._carregar_indice() # Inclui o que o worker gravou
+        return {"cache_dir": self.cache_dir, "max_mb": self.max_mb, "paginas": len(self._entradas),
+                "tamanho_mb": round(self._tamanho / 2**20, 1), **self.estatisticas}
+
+    def close(self) -> None:
+        if self._temporario:
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+class RasterBackend:
+    """
+    Backend de conversão do Camelot (mesma interface do PdfiumBackend) que
+    renderiza com o pdfium na resolução pedida. O Camelot 2 não repassa o
+    `resolution` do lattice ao backend (sempre 300 dpi); aqui a resolução vem
+    do próprio backend e passa a valer.
+    """
+
+    def __init__(self, resolution: int = 300):
+        self.resolution = resolution
+
+    @staticmethod
+    def _pdfium():
+        from camelot.backends.pdfium_backend import PdfiumBackend
+        return PdfiumBackend()
+
+    def installed(self) -> bool:
+        return self._pdfium().installed()
+
+    def convert(self, pdf_path: str, png_path: str, page: int = 1) -> None:
+        self._pdfium().convert(pdf_path, png_path, resolution=self.resolution, page=page)
+
+    def to_array(self, pdf_path: str, page: int = 1):
+        return self._pdfium().to_array(pdf_path, resolution=self.resolution, page=page)
+
+class CachedRasterBackend(RasterBackend):
+    """RasterBackend que guarda as páginas renderizadas no RasterPageCache."""
+
+    def __init__(self, cache: RasterPageCache, resolution: int = 300):
+        super().__init__(resolution)
+        self.cache = cache
+
+    def to_array(self, pdf_path: str, page: int = 1):
+        return self.cache.get_array(pdf_path, page, self.resolution, lambda: super(CachedRasterBackend, self).to_array(pdf_path, page))
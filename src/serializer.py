@@ -0,0 +1,147 @@
+# src/serializer.py
+
+import glob
+import gzip
+import io
+import json
+import os
+from typing import Any, Optional, BinaryIO, Dict, List
+
+# Dependências opcionais: usadas quando instaladas, com fallback para a stdlib
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# --- Serializadores JSON ---
+
+class JsonSerializer:
+    """json da stdlib; no modo compacto usa separadores sem espaço."""
+
+    nome = "json"
+
+    def dumps(self, obj: Any, indent: bool = False) -> bytes:
+        if indent:
+            return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonSerializer(JsonSerializer):
+    nome = "orjson"
+
+    def dumps(self, obj: Any, indent: bool = False) -> bytes:
+        opcoes = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=opcoes)
+
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+class MsgspecSerializer(JsonSerializer):
+    nome = "msgspec"
+
+    def __init__(self):
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj: Any, indent: bool = False) -> bytes:
+        data = self._encoder.encode(obj)
+        return msgspec.json.format(data, indent=2) if indent else data
+
+    def loads(self, data: bytes) -> Any:
+        return self._decoder.decode(data)
+
+
+def available_serializers() -> Dict[str, JsonSerializer]:
+    serializers: Dict[str, JsonSerializer] = {}
+    if orjson is not None:
+        serializers["orjson"] = OrjsonSerializer()
+    if msgspec is not None:
+        serializers["msgspec"] = MsgspecSerializer()
+    serializers["json"] = JsonSerializer()
+    return serializers
+
+def get_serializer(nome: Optional[str] = None) -> JsonSerializer:
+    """Serializador pelo nome, ou o mais rápido instalado (orjson > msgspec > json)."""
+    serializers = available_serializers()
+    if nome is None:
+        return next(iter(serializers.values()))
+    if nome not in serializers:
+        raise ValueError(f"Serializador '{nome}' indisponível. Instalados: {list(serializers)}")
+    return serializers[nome]
+
+
+# --- Compressão ---
+
+COMPRESSOES = ("", ".gz", ".zst")
+
+_MAGIC_GZIP = b"\x1f\x8b"
+_MAGIC_ZSTD = b"\x28\xb5\x2f\xfd"
+
+def compression_of(path: str) -> str:
+    """Compressão indicada pela extensão ("" para .jsonl sem compressão)."""
+    for ext in COMPRESSOES[1:]:
+        if path.endswith(ext):
+            return ext
+    return ""
+
+def output_paths(output_dir: str) -> List[str]:
+    """Arquivos de saída em `output_dir` (<arquivo>.jsonl, .jsonl.gz e .jsonl.zst), em ordem de nome."""
+    return sorted(path for ext in COMPRESSOES for path in glob.glob(os.path.join(output_dir, f"*.jsonl{ext}")))
+
+def _exigir_zstd():
+    if zstandard is None:
+        raise RuntimeError("Compressão .zst requer o pacote 'zstandard' (pip install zstandard).")
+
+def open_output(path: str, nivel: Optional[int] = None) -> BinaryIO:
+    """Abre para escrita binária, comprimindo conforme a extensão (.gz / .zst)."""
+    compressao = compression_of(path)
+    if compressao == ".gz":
+        return gzip.open(path, 'wb', compresslevel=6 if nivel is None else nivel)
+    if compressao == ".zst":
+        _exigir_zstd()
+        return zstandard.ZstdCompressor(level=3 if nivel is None else nivel).stream_writer(open(path, 'wb'), closefd=True)
+    return open(path, 'wb')
+
+def open_input(path: str) -> BinaryIO:
+    """Abre para leitura binária detectando a compressão pelos bytes iniciais (não pela extensão)."""
+    arquivo = open(path, 'rb')
+    magic = arquivo.read(4)
+    arquivo.seek(0)
+    if magic.startswith(_MAGIC_GZIP):
+        arquivo.close()
+        return gzip.open(path, 'rb')
+    if magic.startswith(_MAGIC_ZSTD):
+        _exigir_zstd()
+        return zstandard.ZstdDecompressor().stream_reader(arquivo, closefd=True)
+    return arquivo
+
+
+# --- Leitura de documentos ---
+
+def load_document(path: str, serializer: Optional[JsonSerializer] = None) -> Any:
+    """Carrega um arquivo de saída (.jsonl, .jsonl.gz ou .jsonl.zst; compactado ou indentado)."""
+    serializer = serializer or get_serializer()
+    with open_input(path) as f:
+        if isinstance(f, io.BufferedReader):
+            return serializer.loads(f.read())
+        # Streams descomprimidos: lê em blocos para não depender de read() sem tamanho
+        partes = []
+        while True:
+            bloco = f.read(1 << 20)
+            if not bloco:
+                break
+            partes.append(bloco)
+        return serializer.loads(b"".join(partes))
@@ -0,0 +1,260 @@
+# src/sqlite_export.py
+
+import json
+import sqlite3
+from typing import Dict, Any, Optional, List, Iterable, Union
+
+try:
+    from src.horario_index import build_time_slots, format_hhmm, DIAS_SEMANA
+    from src.horario_conflitos import fill_default_rooms
+    from src.ppc_catalog import normalize_discipline_name
+    from src.serializer import load_document
+except ImportError:
+    from .horario_index import build_time_slots, format_hhmm, DIAS_SEMANA
+    from .horario_conflitos import fill_default_rooms
+    from .ppc_catalog import normalize_discipline_name
+    from .serializer import load_document
+
+# Tabelas com uma linha por registro de documento (todas têm a coluna doc_id)
+TABELAS_DOCUMENTO = ("chunks", "horarios", "disciplinas", "docentes", "ementas", "documentos")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documentos (
+    doc_id TEXT PRIMARY KEY,
+    nome_doc TEXT,
+    metadata TEXT
+);
+
+-- Texto completo dos chunks. A tabela comum (indexada por doc_id) guarda o
+-- conteúdo; chunks_fts é um índice FTS5 de conteúdo externo sobre ela, mantido
+-- pelos gatilhos abaixo. Assim o upsert apaga os chunks de um documento pelo
+-- índice e remove do FTS só as linhas apagadas (por rowid), sem varrer o corpus.
+-- Acentos são ignorados na busca ("ementario" casa "ementário").
+CREATE TABLE IF NOT EXISTS chunks (
+    id INTEGER PRIMARY KEY,
+    doc_id TEXT NOT NULL,
+    chunk INTEGER,
+    secao TEXT,
+    texto TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_chunks_doc ON chunks (doc_id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(
+    secao,
+    texto,
+    content = 'chunks',
+    content_rowid = 'id',
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS chunks_ai AFTER INSERT ON chunks BEGIN
+    INSERT INTO chunks_fts (rowid, secao, texto) VALUES (new.id, new.secao, new.texto);
+END;
+CREATE TRIGGER IF NOT EXISTS chunks_ad AFTER DELETE ON chunks BEGIN
+    INSERT INTO chunks_fts (chunks_fts, rowid, secao, texto) VALUES ('delete', old.id, old.secao, old.texto);
+END;
+
+CREATE TABLE IF NOT EXISTS horarios (
+    id INTEGER PRIMARY KEY,
+    doc_id TEXT NOT NULL,
+    pagina INTEGER,
+    semestre TEXT,
+    turma TEXT,
+    dia INTEGER NOT NULL,       -- 0 = Segunda
+    dia_nome TEXT,
+    inicio INTEGER NOT NULL,    -- minutos desde 00:00
+    fim INTEGER NOT NULL,
+    inicio_hhmm TEXT,
+    fim_hhmm TEXT,
+    disciplina TEXT,
+    professor TEXT,
+    sala TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_horarios_doc ON horarios (doc_id);
+CREATE INDEX IF NOT EXISTS idx_horarios_dia ON horarios (dia, inicio, fim);
+CREATE INDEX IF NOT EXISTS idx_horarios_sala ON horarios (sala, dia, inicio);
+CREATE INDEX IF NOT EXISTS idx_horarios_professor ON horarios (professor, dia, inicio);
+CREATE INDEX IF NOT EXISTS idx_horarios_turma ON horarios (turma, dia, inicio);
+
+CREATE TABLE IF NOT EXISTS disciplinas (
+    id INTEGER PRIMARY KEY,
+    doc_id TEXT NOT NULL,
+    pagina INTEGER,
+    periodo TEXT,
+    optativa INTEGER NOT NULL DEFAULT 0,
+    nome TEXT,
+    nome_normalizado TEXT,
+    ch_semanal_teorica TEXT,
+    ch_semanal_pratica TEXT,
+    ch_semanal_total TEXT,
+    ch_semestral_hora_aula TEXT,
+    ch_semestral_horas TEXT,
+    pre_requisitos TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_disciplinas_doc ON disciplinas (doc_id);
+CREATE INDEX IF NOT EXISTS idx_disciplinas_nome ON disciplinas (nome_normalizado);
+CREATE INDEX IF NOT EXISTS idx_disciplinas_periodo ON disciplinas (doc_id, periodo);
+
+CREATE TABLE IF NOT EXISTS docentes (
+    id INTEGER PRIMARY KEY,
+    doc_id TEXT NOT NULL,
+    pagina INTEGER,
+    item TEXT,
+    nome TEXT,
+    formacao TEXT,
+    regime_trabalho TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_docentes_doc ON docentes (doc_id);
+CREATE INDEX IF NOT EXISTS idx_docentes_nome ON docentes (nome);
+
+CREATE TABLE IF NOT EXISTS ementas (
+    id INTEGER PRIMARY KEY,
+    doc_id TEXT NOT NULL,
+    pagina INTEGER,
+    disciplina TEXT,
+    nome_normalizado TEXT,
+    carga_horaria TEXT,
+    aulas_semanais TEXT,
+    ementa TEXT,
+    dados TEXT                  -- dicionário completo do ementário (JSON)
+);
+CREATE INDEX IF NOT EXISTS idx_ementas_doc ON ementas (doc_id);
+CREATE INDEX IF NOT EXISTS idx_ementas_nome ON ementas (nome_normalizado);
+"""
+
+
+# --- Conexão ---
+
+def connect(db_path: str) -> sqlite3.Connection:
+    """Abre (ou cria) o banco e garante o schema. WAL permite leituras durante uma exportação."""
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+# --- Conversão do documento final em linhas ---
+
+def _iter_parsed_tables(documento: Dict[str, Any]):
+    for page in documento.get("page_specific_data", []):
+        for parsed in page.get("parsed_data_list") or []:
+            if isinstance(parsed, dict):
+                yield page.get("page"), parsed
+
+def _linhas_horarios(doc_id: str, documento: Dict[str, Any]) -> List[tuple]:
+    linhas = []
+    for schedule in fill_default_rooms(documento.get("metadata", {}).get("schedules", [])):
+        for slot in build_time_slots([schedule]):
+            linhas.append((doc_id, slot["pagina"], schedule.get("semestre"), slot["turma"], slot["dia"],
+                           DIAS_SEMANA[slot["dia"]], slot["inicio"], slot["fim"], format_hhmm(slot["inicio"]),
+                           format_hhmm(slot["fim"]), slot["disciplina"], slot["professor"], slot["sala"]))
+    return linhas
+
+def _linhas_ppc(doc_id: str, documento: Dict[str, Any]) -> Dict[str, List[tuple]]:
+    linhas = {"disciplinas": [], "docentes": [], "ementas": []}
+    for pagina, parsed in _iter_parsed_tables(documento):
+        if "disciplinas" in parsed or "disciplinas_optativas" in parsed:
+            optativa = "disciplinas_optativas" in parsed
+            for d in parsed.get("disciplinas_optativas" if optativa else "disciplinas") or []:
+                linhas["disciplinas"].append((
+                    doc_id, pagina, parsed.get("periodo"), int(optativa), d.get("DISCIPLINA"),
+                    normalize_discipline_name(d.get("DISCIPLINA")), d.get("CH_Semanal_Teorica"),
+                    d.get("CH_Semanal_Pratica"), d.get("CH_Semanal_Total"), d.get("CH_Semestral_Hora_Aula"),
+                    d.get("CH_Semestral_Horas"), d.get("Pre_Requisitos")))
+        elif "docentes" in parsed:
+            for d in parsed["docentes"] or []:
+                linhas["docentes"].append((doc_id, pagina, d.get("Item"), d.get("Nome do Professor"),
+                                           d.get("Formacao"), d.get("Regime de Trabalho")))
+        elif "ementa" in parsed:
+            linhas["ementas"].append((doc_id, pagina, parsed.get("disciplina"),
+                                      normalize_discipline_name(parsed.get("disciplina")),
+                                      parsed.get("carga_horaria"), parsed.get("aulas_semanais"),
+                                      parsed.get("ementa"), json.dumps(parsed, ensure_ascii=False)))
+    return linhas
+
+
+# --- Exportação ---
+
+def _inserir_documento(conn: sqlite3.Connection, documento: Dict[str, Any]) -> Dict[str, int]:
+    metadata = documento.get("metadata", {})
+    doc_id = metadata.get("doc_id")
+    if not doc_id:
+        raise ValueError("Documento sem metadata['doc_id'] não pode ser exportado.")
+
+    # Upsert: apaga a versão anterior do documento em todas as tabelas (todas indexadas por doc_id;
+    # o gatilho chunks_ad tira do chunks_fts só as linhas apagadas)
+    for tabela in TABELAS_DOCUMENTO:
+        conn.execute(f"DELETE FROM {tabela} WHERE doc_id = ?", (doc_id,))
+
+    metadata_sem_horarios = {k: v for k, v in metadata.items() if k != "schedules"}
+    conn.execute("INSERT INTO documentos (doc_id, nome_doc, metadata) VALUES (?, ?, ?)",
+                 (doc_id, metadata.get("nome_doc"), json.dumps(metadata_sem_horarios, ensure_ascii=False)))
+
+    chunks = [(doc_id, i, c.get("secao"), c["texto"]) for i, c in enumerate(documento.get("content_chunks", []))
+              if isinstance(c, dict) and c.get("texto")]
+    conn.executemany("INSERT INTO chunks (doc_id, chunk, secao, texto) VALUES (?, ?, ?, ?)", chunks)
+
+    horarios = _linhas_horarios(doc_id, documento)
+    conn.executemany("""INSERT INTO horarios (doc_id, pagina, semestre, turma, dia, dia_nome, inicio, fim,
+                        inicio_hhmm, fim_hhmm, disciplina, professor, sala)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""", horarios)
+
+    ppc = _linhas_ppc(doc_id, documento)
+    conn.executemany("""INSERT INTO disciplinas (doc_id, pagina, periodo, optativa, nome, nome_normalizado,
+                        ch_semanal_teorica, ch_semanal_pratica, ch_semanal_total, ch_semestral_hora_aula,
+                        ch_semestral_horas, pre_requisitos)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""", ppc["disciplinas"])
+    conn.executemany("""INSERT INTO docentes (doc_id, pagina, item, nome, formacao, regime_trabalho)
+                        VALUES (?, ?, ?, ?, ?, ?)""", ppc["docentes"])
+    conn.executemany("""INSERT INTO ementas (doc_id, pagina, disciplina, nome_normalizado, carga_horaria,
+                        aulas_semanais, ementa, dados)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)""", ppc["ementas"])
+
+    return {"chunks": len(chunks), "horarios": len(horarios), **{k: len(v) for k, v in ppc.items()}}
+
+def upsert_document(conn: sqlite3.Connection, documento: Dict[str, Any]) -> Dict[str, int]:
+    """Substitui (ou insere) um único documento, em uma transação, sem reconstruir o banco."""
+    with conn:
+        return _inserir_documento(conn, documento)
+
+def export_documents(db_path: str, documentos: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Carga em lote: exporta vários documentos finais do pipeline em uma única
+    transação (executemany por tabela). Retorna o total de linhas por tabela.
+    """
+    totais: Dict[str, int] = {}
+    conn = connect(db_path)
+    try:
+        with conn:
+            for documento in documentos:
+                for tabela, n in _inserir_documento(conn, documento).items():
+                    totais[tabela] = totais.get(tabela, 0) + n
+        conn.execute("INSERT INTO chunks_fts (chunks_fts) VALUES ('optimize')")
+        conn.commit()
+    finally:
+        conn.close()
+    return totais
+
+def export_jsonl_files(db_path: str, paths: List[str]) -> Dict[str, int]:
+    """Exporta os arquivos de data/output (um documento final por arquivo; .jsonl, .jsonl.gz ou .jsonl.zst)."""
+    def carregar():
+        for path in paths:
+            yield load_document(path)
+    return export_documents(db_path, carregar())
+
+
+# --- Consulta ---
+
+def search_chunks(conn: sqlite3.Connection, query: str, limit: int = 10,
+                  doc_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Busca FTS5 (sintaxe MATCH) nos chunks, ordenada por bm25, com um trecho destacado."""
+    sql = """SELECT c.doc_id, c.chunk, c.secao, snippet(chunks_fts, 1, '[', ']', '...', 24), bm25(chunks_fts)
+             FROM chunks_fts JOIN chunks c ON c.id = chunks_fts.rowid WHERE chunks_fts MATCH ?"""
+    params: List[Union[str, int]] = [query]
+    if doc_id:
+        sql += " AND c.doc_id = ?"
+        params.append(doc_id)
+    sql += " ORDER BY bm25(chunks_fts) LIMIT ?"
+    params.append(limit)
+    return [{"doc_id": r[0], "chunk": r[1], "secao": r[2], "trecho": r[3], "score": -r[4]}
+            for r in conn.execute(sql, params)]
@@ -1,6 +1,12 @@
 import re
 from typing import List, Dict
 
+try:
+    from src.instrumentation import timed
+except ImportError:
+    from .instrumentation import timed
+
+@timed()
 def detect_structure(text: str) -> List[Dict]:
     """
     Detecta elementos estruturais (capítulos, seções, artigos) em um texto
@@ -1,6 +1,17 @@
-import pandas as pd
+from __future__ import annotations
+
 from typing import Dict, Any
 
+try:
+    from src.instrumentation import timed
+    from src.lazy import lazy_module
+except ImportError:
+    from .instrumentation import timed
+    from .lazy import lazy_module
+
+pd = lazy_module("pandas")  # carregado só no primeiro uso
+
+@timed()
 def enhance_table(raw_df: pd.DataFrame) -> Dict[str, Any]:
     """
     Recebe um DataFrame bruto e realiza um processo completo de limpeza,
@@ -1,18 +1,139 @@
-import camelot
-import pandas as pd
+from __future__ import annotations
 
+import contextlib
+from typing import Dict, Any, List, Callable, Optional
+
+try:
+    from src.instrumentation import timed
+    from src.lazy import lazy_module
+    from src.raster_cache import RasterBackend
+except ImportError:
+    from .instrumentation import timed
+    from .lazy import lazy_module
+    from .raster_cache import RasterBackend
+
+# Dependências pesadas carregadas só no primeiro uso (ver src/lazy.py)
+camelot = lazy_module("camelot")
+pd = lazy_module("pandas")
+fitz = lazy_module("fitz")  # PyMuPDF
+
+@timed()
 def extract_raw_dataframe(pdf_path: str, page: int) -> pd.DataFrame:
     """
     Extrai a primeira tabela de uma página de um PDF e a retorna
     como um DataFrame bruto do Pandas, sem nenhum processamento.
     """
+    extrator = active_isolated_extractor()
+    if extrator is not None:
+        # Extração isolada: limite de tempo por página e cadeia de fallback (src/table_worker.py)
+        tables = extrator.extract(pdf_path, page, flavor='lattice')
+        return tables[0] if tables else pd.DataFrame()
     try:
-        tables = camelot.read_pdf(pdf_path, pages=str(page), flavor='lattice')
+        tables = read_pdf_page(pdf_path, page, flavor='lattice')
         if tables:
             # Retorna o DataFrame bruto diretamente
             return tables[0].df
     except Exception as e:
         print(f"Erro no Camelot ao processar pág {page} de {pdf_path}: {e}")
-    
+
     # Se nenhuma tabela for encontrada ou ocorrer um erro, retorna um DataFrame vazio
-    return pd.DataFrame()
\ No newline at end of file
+    return pd.DataFrame()
+
+
+# --- Extrator Isolado Ativo ---
+# Quando definido (ver isolated_extraction), get_raw_tables_from_page e
+# extract_raw_dataframe delegam a extração a ele em vez de chamar o Camelot
+# no próprio processo.
+
+_EXTRATOR_ISOLADO = None
+
+def active_isolated_extractor():
+    return _EXTRATOR_ISOLADO
+
+@contextlib.contextmanager
+def isolated_extraction(extrator: Optional[Any]):
+    """Ativa `extrator` (um IsolatedTableExtractor, ou None para extração direta) dentro do bloco."""
+    global _EXTRATOR_ISOLADO
+    anterior, _EXTRATOR_ISOLADO = _EXTRATOR_ISOLADO, extrator
+    try:
+        yield extrator
+    finally:
+        _EXTRATOR_ISOLADO = anterior
+
+
+# --- Cache de Páginas Rasterizadas Ativo ---
+# Quando definido (ver cached_rasterization), toda chamada lattice do Camelot
+# feita por read_pdf_page renderiza a página através do cache
+# (src/raster_cache.RasterPageCache) em vez de rasterizá-la de novo.
+
+_CACHE_RASTER = None
+
+def active_raster_cache():
+    return _CACHE_RASTER
+
+@contextlib.contextmanager
+def cached_rasterization(cache: Optional[Any]):
+    """Ativa `cache` (um RasterPageCache, ou None para renderizar sempre) dentro do bloco."""
+    global _CACHE_RASTER
+    anterior, _CACHE_RASTER = _CACHE_RASTER, cache
+    try:
+        yield cache
+    finally:
+        _CACHE_RASTER = anterior
+
+# Resolução em que o Camelot lattice renderiza a página (o `resolution` pedido é ignorado por ele)
+RESOLUCAO_LATTICE_PADRAO = 300
+
+def read_pdf_page(pdf_path: str, page: int, flavor: str = "lattice", **parametros: Any):
+    """
+    camelot.read_pdf de uma página (1-indexada). No lattice, usa o cache de
+    páginas rasterizadas ativo; sem cache, um `resolution` diferente do padrão
+    ganha um RasterBackend para a página ser de fato renderizada nessa resolução.
+    """
+    if flavor == "lattice" and "backend" not in parametros:
+        resolucao = parametros.get("resolution", RESOLUCAO_LATTICE_PADRAO)
+        if _CACHE_RASTER is not None:
+            parametros["backend"] = _CACHE_RASTER.backend(resolucao)
+        elif resolucao != RESOLUCAO_LATTICE_PADRAO:
+            parametros["backend"] = RasterBackend(resolucao)
+    return camelot.read_pdf(pdf_path, pages=str(page), flavor=flavor, **parametros)
+
+
+# --- Registro de Backends de Extração de Tabelas ---
+# Cada backend recebe (pdf_path, page, **parametros) e devolve a lista de
+# tabelas brutas da página no formato do Camelot: DataFrames com colunas
+# 0..n-1 e células str ("" para vazias). Erros são propagados para o
+# chamador decidir (fallback, registro de falha etc.).
+
+_TABLE_BACKENDS: Dict[str, Callable[..., List[pd.DataFrame]]] = {}
+
+def register_table_backend(nome: str, funcao: Callable[..., List[pd.DataFrame]]) -> None:
+    """Registra um backend de extração; `funcao(pdf_path, page, **parametros)` -> List[pd.DataFrame]."""
+    _TABLE_BACKENDS[nome] = funcao
+
+def table_backends() -> List[str]:
+    return list(_TABLE_BACKENDS)
+
+def extract_tables(pdf_path: str, page: int, backend: str = "camelot", **parametros: Any) -> List[pd.DataFrame]:
+    """Extrai as tabelas brutas de uma página (1-indexada) com o backend e os parâmetros indicados."""
+    if backend not in _TABLE_BACKENDS:
+        raise ValueError(f"Backend de tabelas desconhecido: '{backend}'. Use um de {table_backends()}.")
+    return _TABLE_BACKENDS[backend](pdf_path, page, **parametros)
+
+
+def _camelot_tables(pdf_path: str, page: int, flavor: str = "lattice", **parametros: Any) -> List[pd.DataFrame]:
+    return [tbl.df for tbl in read_pdf_page(pdf_path, page, flavor, **parametros)]
+
+def _pymupdf_tables(pdf_path: str, page: int, **parametros: Any) -> List[pd.DataFrame]:
+    """Tabelas via Page.find_tables() do PyMuPDF (sem Ghostscript/OpenCV; aceita strategy, snap_tolerance etc.)."""
+    with fitz.open(pdf_path) as doc:
+        encontradas = doc.load_page(page - 1).find_tables(**parametros)
+        tabelas = []
+        for tabela in encontradas.tables:
+            linhas = [["" if cell is None else cell for cell in linha] for linha in tabela.extract()]
+            if linhas:
+                tabelas.append(pd.DataFrame(linhas))
+    return tabelas
+
+register_table_backend("camelot", _camelot_tables)
+register_table_backend("pymupdf", _pymupdf_tables)
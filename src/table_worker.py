@@ -0,0 +1,252 @@
+# src/table_worker.py
+
+from __future__ import annotations
+
+import ctypes
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from typing import Dict, Any, Optional, List, Tuple, TYPE_CHECKING
+
+try:
+    from src.table_extractor import extract_tables, camelot, active_raster_cache, cached_rasterization
+    from src.memory import MemoryBudget
+    from src.raster_cache import RasterPageCache
+    from src.lazy import load_module
+except ImportError:
+    from .table_extractor import extract_tables, camelot, active_raster_cache, cached_rasterization
+    from .memory import MemoryBudget
+    from .raster_cache import RasterPageCache
+    from .lazy import load_module
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Cadeia de fallback padrão, tentada em ordem quando a extração principal estoura o
+# tempo ou falha. Parâmetros sem "flavor" são aplicados sobre os da extração principal;
+# com "flavor", substituem. None = só texto (nenhuma tabela; o texto da página já vai
+# para os content_chunks). O "resolution" do lattice vale com ou sem cache de páginas
+# rasterizadas: table_extractor.read_pdf_page troca o backend do Camelot por um que
+# renderiza na resolução pedida.
+FALLBACK_CHAIN: List[Tuple[str, Optional[Dict[str, Any]]]] = [
+    ("lattice_baixa_resolucao", {"resolution": 150}),
+    ("stream", {"flavor": "stream"}),
+    ("texto", None),
+]
+
+
+_PR_SET_PDEATHSIG = 1
+
+def _die_with_parent(pid_pai: int) -> None:
+    """
+    No Linux, pede ao kernel SIGKILL para o worker quando o pai morrer. Sem
+    isso, um pai encerrado à força (ex: worker do daemon de extração morto por
+    OOM) deixa este processo órfão segurando os pipes herdados do pai, e quem
+    espera pelo fim do pai nunca recebe EOF.
+    """
+    if not sys.platform.startswith("linux"):
+        return
+    try:
+        ctypes.CDLL(None, use_errno=True).prctl(_PR_SET_PDEATHSIG, signal.SIGKILL)
+    except (OSError, AttributeError):
+        return
+    if os.getppid() != pid_pai: # O pai morreu antes do prctl
+        os._exit(1)
+
+def _worker_main(conexao, memory_limit_mb: Optional[float], pid_pai: Optional[int] = None) -> None:
+    """
+    Laço do processo worker: recebe (pdf_path, page, backend, parametros, cache_raster)
+    e devolve as tabelas. `cache_raster` é o spec() do RasterPageCache ativo no
+    processo pai (ou None); o worker abre o mesmo diretório e devolve as
+    estatísticas de acerto da chamada junto com a resposta.
+    """
+    if pid_pai is not None:
+        _die_with_parent(pid_pai)
+    orcamento = MemoryBudget(memory_limit_mb) if memory_limit_mb else None
+    caches: Dict[str, RasterPageCache] = {}
+    while True:
+        try:
+            pedido = conexao.recv()
+        except (EOFError, OSError):
+            return
+        if pedido is None:
+            return
+        pdf_path, page, backend, parametros, cache_raster = pedido
+        cache = None
+        if cache_raster is not None:
+            cache = caches.get(cache_raster["cache_dir"])
+            if cache is None:
+                cache = caches[cache_raster["cache_dir"]] = RasterPageCache(**cache_raster)
+                if orcamento is not None:
+                    orcamento.register_cleanup(f"cache_raster:{cache.cache_dir}", cache.clear)
+        antes = dict(cache.estatisticas) if cache is not None else None
+        try:
+            with cached_rasterization(cache):
+                resposta = ("ok", extract_tables(pdf_path, page, backend, **parametros))
+        except Exception as e:
+            resposta = ("erro", f"{type(e).__name__}: {e}")
+        delta = {k: v - antes[k] for k, v in cache.estatisticas.items()} if cache is not None else None
+        # Acima do orçamento mesmo após a limpeza: responde e encerra para ser substituído
+        reciclar = orcamento is not None and orcamento.check(f"worker de tabelas, pág {page}") == MemoryBudget.EXCEDIDO
+        conexao.send((resposta[0], resposta[1], reciclar, delta))
+        if reciclar:
+            return
+
+
+class IsolatedTableExtractor:
+    """
+    Extração de tabelas por página em um processo worker separado, com limite
+    de tempo por tentativa e cadeia de fallback.
+
+    Um Camelot travado (página malformada) é encerrado ao estourar `timeout_s`
+    e a página segue pela cadeia (`fallbacks`) até algum passo responder; o
+    último passo padrão ("texto") não extrai tabelas e sempre responde. Assim a
+    latência de uma página fica limitada a timeout_s + fallback_timeout_s por
+    passo de fallback com extração.
+
+    O worker é reaproveitado entre páginas e reiniciado após timeout, queda ou
+    quando o seu MemoryBudget (`memory_limit_mb`) devolve "excedido".
+
+    O caminho usado na última página fica em `last_info`:
+    {"caminho": "stream", "tentativas": [{"caminho": "lattice", "status": "timeout", ...}, ...]}
+    """
+
+    def __init__(self, timeout_s: float = 120.0, fallbacks: Optional[List[Tuple[str, Optional[Dict[str, Any]]]]] = None,
+                 fallback_timeout_s: Optional[float] = None, memory_limit_mb: Optional[float] = None,
+                 start_method: Optional[str] = None):
+        self.timeout_s = timeout_s
+        self.fallbacks = FALLBACK_CHAIN if fallbacks is None else fallbacks
+        self.fallback_timeout_s = fallback_timeout_s or timeout_s
+        self.memory_limit_mb = memory_limit_mb
+        if start_method is None:
+            # fork reaproveita os módulos já importados (camelot, pandas): o worker sobe em milissegundos
+            start_method = "fork" if sys.platform.startswith("linux") else "spawn"
+        self._contexto = multiprocessing.get_context(start_method)
+        self._processo = None
+        self._conexao = None
+        self.last_info: Optional[Dict[str, Any]] = None
+        self.estatisticas = {"paginas": 0, "timeouts": 0, "erros": 0, "reinicios": 0, "reciclagens": 0, "caminhos": {}}
+
+    # --- Processo Worker ---
+
+    def _iniciar(self) -> None:
+        if self._contexto.get_start_method() == "fork":
+            # Importa o Camelot (preguiçoso em src/table_extractor) antes do fork, uma
+            # única vez no pai, para que cada worker novo não pague a importação
+            load_module(camelot)
+        conexao_pai, conexao_filho = self._contexto.Pipe()
+        self._processo = self._contexto.Process(target=_worker_main,
+                                                args=(conexao_filho, self.memory_limit_mb, os.getpid()),
+                                                name="table-worker", daemon=True)
+        self._processo.start()
+        conexao_filho.close()
+        self._conexao = conexao_pai
+
+    def _encerrar(self, forcar: bool = False) -> None:
+        if self._processo is None:
+            return
+        if forcar:
+            self._processo.kill()
+        else:
+            try:
+                self._conexao.send(None)
+            except (OSError, BrokenPipeError):
+                pass
+        self._processo.join(timeout=5)
+        if self._processo.is_alive():
+            self._processo.kill()
+            self._processo.join()
+        self._conexao.close()
+        self._processo = self._conexao = None
+
+    def _executar(self, pdf_path: str, page: int, backend: str, parametros: Dict[str, Any],
+                  timeout_s: float) -> Tuple[str, Any]:
+        """Uma tentativa no worker. Retorna ("ok", tabelas), ("erro", mensagem) ou ("timeout", None)."""
+        if self._processo is None or not self._processo.is_alive():
+            if self._processo is not None:
+                self._encerrar()
+            self._iniciar()
+        cache = active_raster_cache()
+        try:
+            self._conexao.send((pdf_path, page, backend, parametros, cache.spec() if cache is not None else None))
+            if not self._conexao.poll(timeout_s):
+                self._encerrar(forcar=True)
+                self.estatisticas["timeouts"] += 1
+                self.estatisticas["reinicios"] += 1
+                return "timeout", None
+            status, resultado, reciclar, estatisticas_cache = self._conexao.recv()
+        except (EOFError, OSError, BrokenPipeError) as e:
+            # Worker caiu (ex: segfault no backend de renderização)
+            self._encerrar(forcar=True)
+            self.estatisticas["reinicios"] += 1
+            return "erro", f"worker encerrado inesperadamente ({type(e).__name__})"
+        if estatisticas_cache and cache is not None:
+            cache.add_stats(estatisticas_cache)
+        if reciclar:
+            self._encerrar()
+            self.estatisticas["reciclagens"] += 1
+        return status, resultado
+
+    # --- Extração ---
+
+    def _cadeia(self, primario: Dict[str, Any]):
+        yield primario.get("flavor", "lattice"), primario, self.timeout_s
+        for nome, parametros in self.fallbacks:
+            if parametros is None:
+                yield nome, None, None
+            elif "flavor" in parametros:
+                yield nome, {"backend": primario.get("backend", "camelot"), **parametros}, self.fallback_timeout_s
+            else:
+                yield nome, {**primario, **parametros}, self.fallback_timeout_s
+
+    def extract(self, pdf_path: str, page: int, **primario: Any) -> List[pd.DataFrame]:
+        """
+        Extrai as tabelas da página (1-indexada). `primario` são os parâmetros da
+        extração principal (backend="camelot" por padrão, flavor, line_scale, ...).
+        """
+        primario = {"backend": "camelot", **primario}
+        tentativas = []
+        tabelas: List[pd.DataFrame] = []
+        caminho = None
+        for nome, parametros, timeout_s in self._cadeia(primario):
+            if parametros is None:
+                caminho = nome
+                break
+            parametros = dict(parametros)
+            backend = parametros.pop("backend")
+            inicio = time.perf_counter()
+            status, resultado = self._executar(pdf_path, page, backend, parametros, timeout_s)
+            tentativa = {"caminho": nome, "status": status, "duracao_s": round(time.perf_counter() - inicio, 3)}
+            if status == "ok":
+                tentativas.append(tentativa)
+                tabelas, caminho = resultado, nome
+                break
+            if status == "erro":
+                self.estatisticas["erros"] += 1
+                tentativa["erro"] = resultado
+            tentativas.append(tentativa)
+            print(f"Alerta: Extração de tabelas '{nome}' na pág {page} falhou ({status}). Tentando o próximo passo.")
+
+        self.estatisticas["paginas"] += 1
+        caminhos = self.estatisticas["caminhos"]
+        caminhos[caminho] = caminhos.get(caminho, 0) + 1
+        self.last_info = {"caminho": caminho}
+        if len(tentativas) != 1 or tentativas[0]["status"] != "ok":
+            self.last_info["tentativas"] = tentativas
+        return tabelas
+
+    def report(self) -> Dict[str, Any]:
+        return {"timeout_s": self.timeout_s, "fallback_timeout_s": self.fallback_timeout_s,
+                "memory_limit_mb": self.memory_limit_mb, **self.estatisticas}
+
+    def close(self) -> None:
+        self._encerrar()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
@@ -1,4 +1,5 @@
 import re
+import unicodedata
 from typing import Dict
 
 def normalize_text(text: str, acronyms: Dict[str, str] = None) -> str:
@@ -32,3 +33,8 @@ def normalize_text(text: str, acronyms: Dict[str, str] = None) -> str:
     text = re.sub(r'\s+', ' ', text).strip()
 
     return text
+
+
+def remove_accents(text: str) -> str:
+    """Remove acentos/diacríticos ("ementário" -> "ementario"), usado na indexação e busca."""
+    return ''.join(c for c in unicodedata.normalize('NFD', text) if unicodedata.category(c) != 'Mn')
@@ -0,0 +1,263 @@
+# src/vector_store.py
+
+import json
+import os
+import re
+import zlib
+from abc import ABC, abstractmethod
+from typing import Dict, Any, Optional, List, Tuple
+
+import numpy as np
+
+try:
+    from src.text_normalization import normalize_text, remove_accents
+    from src.bm25_index import split_passages
+except ImportError:
+    from .text_normalization import normalize_text, remove_accents
+    from .bm25_index import split_passages
+
+
+# --- Encoders ---
+
+class Encoder(ABC):
+    """
+    Interface dos encoders de texto. Implementações devem definir `encoder_id`
+    (identifica modelo + versão; usado para não misturar vetores incompatíveis),
+    `dim` e `encode`, que devolve uma matriz float32 (len(texts) x dim).
+    """
+
+    encoder_id: str = "base"
+    dim: int = 0
+
+    @abstractmethod
+    def encode(self, texts: List[str]) -> np.ndarray:
+        ...
+
+
+class HashingNgramEncoder(Encoder):
+    """
+    Encoder embutido, sem download de modelo: n-gramas de caracteres do texto
+    normalizado (sem acentos) projetados em `dim` posições via hash estável
+    (crc32) com sinal. Não é semântico de verdade, mas aproxima grafias e
+    flexões parecidas e permite testar todo o fluxo offline.
+    """
+
+    def __init__(self, dim: int = 512, ngram_min: int = 3, ngram_max: int = 5):
+        self.dim = dim
+        self.ngram_min, self.ngram_max = ngram_min, ngram_max
+        self.encoder_id = f"hash-ngram-v1-d{dim}-n{ngram_min}_{ngram_max}"
+
+    def _features(self, text: str) -> Dict[int, float]:
+        text = remove_accents(normalize_text(text))
+        text = re.sub(r"[^\w ]+", " ", text)
+        features: Dict[int, float] = {}
+        for palavra in text.split():
+            palavra = f" {palavra} "
+            for n in range(self.ngram_min, self.ngram_max + 1):
+                for i in range(len(palavra) - n + 1):
+                    h = zlib.crc32(palavra[i:i + n].encode('utf-8'))
+                    idx = h % self.dim
+                    features[idx] = features.get(idx, 0.0) + (1.0 if h & 0x80000000 else -1.0)
+        return features
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        matriz = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for idx, valor in self._features(text).items():
+                matriz[row, idx] = valor
+        return matriz
+
+
+def _normalize_rows(matriz: np.ndarray) -> np.ndarray:
+    normas = np.linalg.norm(matriz, axis=1, keepdims=True)
+    normas[normas == 0] = 1.0
+    return (matriz / normas).astype(np.float32, copy=False)
+
+
+# --- Vector Store ---
+
+class VectorStore:
+    """
+    Armazena embeddings dos chunks em uma matriz float32 contígua, normalizada
+    uma única vez na inserção (o produto escalar vira similaridade de cosseno).
+
+    A busca exata faz produtos de matrizes em blocos de linhas e seleciona o
+    top-k de cada bloco com argpartition. Opcionalmente, build_ivf() cria um
+    índice de arquivo invertido (k-means como quantizador grosso): a busca só
+    examina as `nprobe` listas mais próximas da consulta, mais os vetores
+    inseridos depois da construção do IVF.
+    """
+
+    def __init__(self, encoder: Encoder, bloco: int = 65536):
+        self.encoder = encoder
+        self.dim = encoder.dim
+        self.bloco = bloco
+        self.itens: List[Dict[str, Any]] = []
+        self._buffer = np.empty((0, self.dim), dtype=np.float32)
+        self._n = 0
+        # IVF: centróides, ids ordenados por lista e offsets de cada lista
+        self._ivf_centroides: Optional[np.ndarray] = None
+        self._ivf_ids: Optional[np.ndarray] = None
+        self._ivf_offsets: Optional[np.ndarray] = None
+        self._ivf_n = 0 # Vetores cobertos pelo IVF (os demais são varridos de forma exata)
+
+    @property
+    def vectors(self) -> np.ndarray:
+        return self._buffer[:self._n]
+
+    def __len__(self) -> int:
+        return self._n
+
+    # --- Inserção ---
+
+    def add_vectors(self, vetores: np.ndarray, itens: List[Dict[str, Any]]) -> None:
+        """Insere vetores já calculados (normaliza as linhas)."""
+        vetores = _normalize_rows(np.asarray(vetores, dtype=np.float32).reshape(-1, self.dim))
+        if len(vetores) != len(itens):
+            raise ValueError(f"{len(vetores)} vetores para {len(itens)} itens.")
+        necessario = self._n + len(vetores)
+        if necessario > len(self._buffer):
+            # Crescimento geométrico para inserções incrementais baratas
+            novo = np.empty((max(necessario, 2 * len(self._buffer), 1024), self.dim), dtype=np.float32)
+            novo[:self._n] = self._buffer[:self._n]
+            self._buffer = novo
+        self._buffer[self._n:necessario] = vetores
+        self._n = necessario
+        self.itens.extend(itens)
+
+    def add_texts(self, textos: List[str], itens: List[Dict[str, Any]], lote: int = 256) -> None:
+        for i in range(0, len(textos), lote):
+            self.add_vectors(self.encoder.encode(textos[i:i + lote]), itens[i:i + lote])
+
+    def add_document(self, documento: Dict[str, Any], palavras_por_passagem: int = 200) -> int:
+        """Indexa os content_chunks de um documento final do pipeline (em passagens). Retorna o nº de passagens."""
+        doc_id = documento.get("metadata", {}).get("doc_id")
+        textos, itens = [], []
+        for chunk_idx, chunk in enumerate(documento.get("content_chunks", [])):
+            texto = chunk.get("texto") if isinstance(chunk, dict) else None
+            if not texto:
+                continue
+            for inicio, fim in split_passages(texto, palavras_por_passagem):
+                textos.append(texto[inicio:fim])
+                itens.append({"doc_id": doc_id, "chunk": chunk_idx, "inicio": inicio, "fim": fim,
+                              "texto": texto[inicio:fim]})
+        self.add_texts(textos, itens)
+        return len(itens)
+
+    # --- Busca ---
+
+    def _top_k(self, consultas: np.ndarray, ids: Optional[np.ndarray], k: int) -> List[List[Tuple[float, int]]]:
+        """Top-k exato de cada consulta sobre `ids` (ou sobre todos os vetores), em blocos."""
+        total = self._n if ids is None else len(ids)
+        melhores_scores = np.full((len(consultas), 0), -np.inf, dtype=np.float32)
+        melhores_ids = np.empty((len(consultas), 0), dtype=np.int64)
+        for ini in range(0, total, self.bloco):
+            fim = min(ini + self.bloco, total)
+            bloco_ids = np.arange(ini, fim) if ids is None else ids[ini:fim]
+            matriz = self._buffer[ini:fim] if ids is None else self._buffer[bloco_ids]
+            scores = consultas @ matriz.T
+            kk = min(k, scores.shape[1])
+            parcial = np.argpartition(-scores, kk - 1, axis=1)[:, :kk]
+            melhores_scores = np.concatenate([melhores_scores, np.take_along_axis(scores, parcial, axis=1)], axis=1)
+            melhores_ids = np.concatenate([melhores_ids, bloco_ids[parcial]], axis=1)
+            if melhores_scores.shape[1] > k:
+                corte = np.argpartition(-melhores_scores, k - 1, axis=1)[:, :k]
+                melhores_scores = np.take_along_axis(melhores_scores, corte, axis=1)
+                melhores_ids = np.take_along_axis(melhores_ids, corte, axis=1)
+
+        resultado = []
+        for scores, idx in zip(melhores_scores, melhores_ids):
+            ordem = np.argsort(-scores)
+            resultado.append([(float(scores[o]), int(idx[o])) for o in ordem])
+        return resultado
+
+    def search_batch(self, consultas: List[str], k: int = 10, nprobe: Optional[int] = None) -> List[List[Dict[str, Any]]]:
+        """Busca várias consultas de uma vez. Com IVF construído, usa `nprobe` listas (padrão: 8)."""
+        if self._n == 0 or not consultas:
+            return [[] for _ in consultas]
+        q = _normalize_rows(self.encoder.encode(consultas))
+
+        if self._ivf_centroides is None:
+            brutos = self._top_k(q, None, k)
+        else:
+            nprobe = min(nprobe or 8, len(self._ivf_centroides))
+            listas = np.argpartition(-(q @ self._ivf_centroides.T), nprobe - 1, axis=1)[:, :nprobe]
+            cauda = np.arange(self._ivf_n, self._n) # Inseridos depois do IVF
+            brutos = []
+            for i, escolhidas in enumerate(listas):
+                ids = np.concatenate([self._ivf_ids[self._ivf_offsets[l]:self._ivf_offsets[l + 1]] for l in escolhidas] + [cauda])
+                brutos.extend(self._top_k(q[i:i + 1], ids, k) if len(ids) else [[]])
+
+        return [[{**self.itens[idx], "score": score} for score, idx in linha] for linha in brutos]
+
+    def search(self, consulta: str, k: int = 10, nprobe: Optional[int] = None) -> List[Dict[str, Any]]:
+        return self.search_batch([consulta], k, nprobe)[0]
+
+    # --- IVF (k-means) ---
+
+    def build_ivf(self, n_listas: Optional[int] = None, iteracoes: int = 10, seed: int = 0) -> None:
+        """Treina o quantizador grosso (k-means esférico) sobre os vetores atuais e monta as listas invertidas."""
+        if self._n == 0:
+            return
+        n_listas = min(n_listas or max(1, int(np.sqrt(self._n))), self._n)
+        rng = np.random.default_rng(seed)
+        dados = self.vectors
+        # Como no faiss, o treino usa uma amostra (até 64 pontos por lista); a atribuição final usa todos
+        amostra = dados if self._n <= 64 * n_listas else dados[np.sort(rng.choice(self._n, 64 * n_listas, replace=False))]
+        centroides = amostra[rng.choice(len(amostra), n_listas, replace=False)].copy()
+
+        for _ in range(iteracoes):
+            atribuicao = self._atribuir(amostra, centroides)
+            ordem = np.argsort(atribuicao, kind='stable')
+            contagem = np.bincount(atribuicao, minlength=n_listas)
+            somas = amostra[rng.choice(len(amostra), n_listas)].copy() # Listas vazias são re-semeadas
+            cheias = np.flatnonzero(contagem)
+            inicios = np.concatenate([[0], np.cumsum(contagem[cheias])[:-1]])
+            somas[cheias] = np.add.reduceat(amostra[ordem], inicios, axis=0)
+            centroides = _normalize_rows(somas)
+
+        atribuicao = self._atribuir(dados, centroides)
+        ordem = np.argsort(atribuicao, kind='stable')
+        self._ivf_centroides = centroides
+        self._ivf_ids = ordem.astype(np.int64)
+        self._ivf_offsets = np.concatenate([[0], np.cumsum(np.bincount(atribuicao, minlength=n_listas))]).astype(np.int64)
+        self._ivf_n = self._n
+
+    def _atribuir(self, dados: np.ndarray, centroides: np.ndarray) -> np.ndarray:
+        atribuicao = np.empty(len(dados), dtype=np.int64)
+        for ini in range(0, len(dados), self.bloco):
+            atribuicao[ini:ini + self.bloco] = np.argmax(dados[ini:ini + self.bloco] @ centroides.T, axis=1)
+        return atribuicao
+
+    # --- Persistência ---
+
+    def save(self, path: str) -> None:
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, "vectors.npy"), self.vectors)
+        meta = {"encoder_id": self.encoder.encoder_id, "dim": self.dim, "ivf_n": self._ivf_n}
+        with open(os.path.join(path, "meta.json"), 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        with open(os.path.join(path, "itens.json"), 'w', encoding='utf-8') as f:
+            json.dump(self.itens, f, ensure_ascii=False)
+        if self._ivf_centroides is not None:
+            np.save(os.path.join(path, "ivf_centroides.npy"), self._ivf_centroides)
+            np.save(os.path.join(path, "ivf_ids.npy"), self._ivf_ids)
+            np.save(os.path.join(path, "ivf_offsets.npy"), self._ivf_offsets)
+
+    @classmethod
+    def load(cls, path: str, encoder: Encoder) -> "VectorStore":
+        with open(os.path.join(path, "meta.json"), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta["encoder_id"] != encoder.encoder_id:
+            raise ValueError(f"Vetores gerados por '{meta['encoder_id']}', mas o encoder informado é '{encoder.encoder_id}'.")
+        store = cls(encoder)
+        store._buffer = np.load(os.path.join(path, "vectors.npy"))
+        store._n = len(store._buffer)
+        with open(os.path.join(path, "itens.json"), 'r', encoding='utf-8') as f:
+            store.itens = json.load(f)
+        if os.path.exists(os.path.join(path, "ivf_centroides.npy")):
+            store._ivf_centroides = np.load(os.path.join(path, "ivf_centroides.npy"))
+            store._ivf_ids = np.load(os.path.join(path, "ivf_ids.npy"))
+            store._ivf_offsets = np.load(os.path.join(path, "ivf_offsets.npy"))
+            store._ivf_n = meta["ivf_n"]
+        return store